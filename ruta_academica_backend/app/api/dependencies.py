@@ -1,5 +1,17 @@
-from typing import Generator
-from app.db.session import SessionLocal
+from datetime import datetime
+from email.utils import format_datetime, parsedate_to_datetime
+from typing import AsyncGenerator, Generator, NamedTuple, Optional
+
+from fastapi import Depends, HTTPException, Request, Response, status
+from fastapi.concurrency import run_in_threadpool
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.db.session import AsyncSessionLocal, SessionLocal, get_async_engine
+from app.models.pensum import Pensum
+from app.services.version_service import VersionService
 
 
 def get_db() -> Generator:
@@ -16,3 +28,178 @@ def get_db() -> Generator:
         yield db
     finally:
         db.close()
+
+
+async def get_async_db() -> AsyncGenerator:
+    """
+    Dependencia que provee la sesión de las rutas de solo lectura que hacen
+    consultas simples (listados y detalles), sin construir grafos.
+
+    Con RUTAS_ASINCRONAS es una sesión asíncrona de SQLAlchemy; si no, una
+    sesión síncrona que ejecuta cada consulta en el threadpool, con la misma
+    interfaz (get, scalars, execute), para servir esas rutas como las demás
+    cuando el driver asíncrono no compensa.
+
+    Yields:
+        AsyncSession: Sesión cerrada al terminar la petición.
+    """
+    if not settings.RUTAS_ASINCRONAS:
+        db = SessionLocal()
+        try:
+            yield SesionEnThreadpool(db)
+        finally:
+            await run_in_threadpool(db.close)
+        return
+
+    async with AsyncSessionLocal(bind=get_async_engine()) as db:
+        yield db
+
+
+class SesionEnThreadpool:
+    """
+    Sesión síncrona con la interfaz asíncrona que usan las rutas de solo
+    lectura; cada consulta se ejecuta en el threadpool.
+    """
+
+    def __init__(self, db: Session):
+        self._db = db
+
+    async def get(self, *args, **kwargs):
+        return await run_in_threadpool(self._db.get, *args, **kwargs)
+
+    async def scalars(self, *args, **kwargs):
+        return await run_in_threadpool(self._db.scalars, *args, **kwargs)
+
+    async def execute(self, *args, **kwargs):
+        return await run_in_threadpool(self._db.execute, *args, **kwargs)
+
+
+class VersionDatos(NamedTuple):
+    """
+    Versión de los datos de una respuesta (pensum_versiones) y su ETag.
+    """
+
+    version: int
+    etag: str
+
+
+def verificar_version(
+    request: Request,
+    response: Response,
+    pensum_id: Optional[int] = None,
+    db: Session = Depends(get_db),
+) -> VersionDatos:
+    """
+    Dependencia de GET condicional para las respuestas derivadas de los
+    datos de un pensum (o del catálogo completo, sin pensum_id).
+
+    Agrega a la respuesta ETag y Last-Modified a partir de la versión de los
+    datos. Si el cliente ya tiene esa versión (If-None-Match, o
+    If-Modified-Since cuando no envía ETag), corta la petición con un 304
+    sin construir el grafo ni serializar la respuesta. Un pensum que no
+    existe responde 404 aunque el cliente envíe encabezados condicionales.
+
+    La ruta debe leer las cachés de grafos y mallas con la misma versión
+    (GrafoService.get_grafo(..., version)), para que el cuerpo corresponda
+    siempre al ETag.
+
+    Returns:
+        VersionDatos: La versión actual de los datos y su ETag.
+    """
+    if pensum_id and not db.query(Pensum.id).filter(Pensum.id == pensum_id).first():
+        raise _pensum_no_encontrado(pensum_id)
+
+    version, actualizado = VersionService.get_version(db, pensum_id)
+    # Devuelve la conexión al pool antes de pasar a la ruta: la ruta corre en
+    # otro hilo del threadpool y, bajo carga, retener la conexión hasta
+    # entonces agota el pool mientras los hilos esperan por ella
+    db.rollback()
+
+    return VersionDatos(
+        version, _aplicar_version(request, response, pensum_id, version, actualizado)
+    )
+
+
+async def verificar_version_async(
+    request: Request,
+    response: Response,
+    pensum_id: Optional[int] = None,
+    db: AsyncSession = Depends(get_async_db),
+) -> VersionDatos:
+    """
+    Variante de verificar_version para las rutas asíncronas, sobre la sesión
+    de get_async_db.
+
+    Returns:
+        VersionDatos: La versión actual de los datos y su ETag.
+    """
+    if pensum_id and not (
+        await db.execute(select(Pensum.id).where(Pensum.id == pensum_id))
+    ).first():
+        raise _pensum_no_encontrado(pensum_id)
+
+    version, actualizado = VersionService.de_fila(
+        (await db.execute(VersionService.consulta_version(pensum_id))).first()
+    )
+
+    return VersionDatos(
+        version, _aplicar_version(request, response, pensum_id, version, actualizado)
+    )
+
+
+def _pensum_no_encontrado(pensum_id: int) -> HTTPException:
+    return HTTPException(
+        status_code=status.HTTP_404_NOT_FOUND,
+        detail=f"No se encontró pensum con ID {pensum_id}",
+    )
+
+
+def _aplicar_version(
+    request: Request,
+    response: Response,
+    pensum_id: Optional[int],
+    version: int,
+    actualizado: Optional[datetime],
+) -> str:
+    alcance = f"pensum-{pensum_id}" if pensum_id else "catalogo"
+    etag = f'W/"{alcance}-v{version}'
+    if actualizado is not None:
+        etag += f"-{int(actualizado.timestamp())}"
+    etag += '"'
+
+    # Los clientes deben revalidar siempre: los datos pueden cambiar en
+    # cualquier momento
+    headers = {"ETag": etag, "Cache-Control": "no-cache"}
+    if actualizado is not None:
+        headers["Last-Modified"] = format_datetime(actualizado, usegmt=True)
+
+    if _no_modificado(request, etag, actualizado):
+        raise HTTPException(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+
+    response.headers.update(headers)
+    return etag
+
+
+def _no_modificado(
+    request: Request, etag: str, actualizado: Optional[datetime]
+) -> bool:
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match is not None:
+        # Comparación débil: se ignora el prefijo W/
+        etiquetas = {_sin_prefijo_debil(e.strip()) for e in if_none_match.split(",")}
+        return "*" in etiquetas or _sin_prefijo_debil(etag) in etiquetas
+
+    if_modified_since = request.headers.get("if-modified-since")
+    if if_modified_since is None or actualizado is None:
+        return False
+
+    try:
+        fecha = parsedate_to_datetime(if_modified_since)
+    except (TypeError, ValueError):
+        return False
+
+    return fecha.tzinfo is not None and actualizado.replace(microsecond=0) <= fecha
+
+
+def _sin_prefijo_debil(etag: str) -> str:
+    return etag[2:] if etag.startswith("W/") else etag
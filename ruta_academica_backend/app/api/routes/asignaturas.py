@@ -1,11 +1,19 @@
-from typing import List
-
-from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session, joinedload
-
-from app.api.dependencies import get_db
-from app.models.asignatura import Asignatura, AsignaturaTrimestre
+from typing import List, Optional
+
+from fastapi import APIRouter, Depends, HTTPException, Response, status
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session, joinedload, selectinload
+
+from app.api.dependencies import get_async_db, get_db
+from app.models.asignatura import (
+    Asignatura,
+    AsignaturaTrimestre,
+    corequisito,
+    prerequisito,
+)
 from app.models.trimestre import Trimestre
+from app.services.grafo_service import GrafoService
 from app.schemas.asignatura import (
     AsignaturaCreate,
     AsignaturaUpdate,
@@ -18,26 +26,51 @@ router = APIRouter()
 
 
 @router.get("/", response_model=List[AsignaturaWithRelations])
-def get_asignaturas(skip: int = 0, limit: int = 300, db: Session = Depends(get_db)):
+def get_asignaturas(
+    response: Response,
+    skip: int = 0,
+    limit: int = 300,
+    cursor: Optional[int] = None,
+    db: Session = Depends(get_db),
+):
     """
     Obtener todas las asignaturas con sus prerrequisitos y correquisitos
+
+    Se pagina por ID: ``cursor`` devuelve las asignaturas con ID mayor al
+    indicado, y la cabecera ``X-Siguiente-Cursor`` trae el valor para la
+    página siguiente cuando puede haber más resultados. ``skip`` se mantiene
+    por compatibilidad, pero su costo crece con el desplazamiento.
     """
-    asignaturas = db.query(Asignatura).offset(skip).limit(limit).all()
-
-    result = []
-    for asignatura in asignaturas:
-        prerequisitos_ids = [p.id for p in asignatura.prerequisitos]
-        corequisitos_ids = [c.id for c in asignatura.corequisitos]
-
-        result.append(
-            {
-                **asignatura.__dict__,
-                "prerequisitos_ids": prerequisitos_ids,
-                "corequisitos_ids": corequisitos_ids,
-            }
-        )
+    query = db.query(Asignatura).order_by(Asignatura.id)
+    if cursor is not None:
+        query = query.filter(Asignatura.id > cursor)
+    elif skip:
+        query = query.offset(skip)
+
+    asignaturas = query.limit(limit).all()
+    if asignaturas and len(asignaturas) == limit:
+        response.headers["X-Siguiente-Cursor"] = str(asignaturas[-1].id)
+
+    ids = [asignatura.id for asignatura in asignaturas]
+    prerequisitos_ids = GrafoService.get_relacionadas(
+        db, prerequisito, prerequisito.c.prerequisito_id, ids
+    )
+    corequisitos_ids = GrafoService.get_relacionadas(
+        db, corequisito, corequisito.c.corequisito_id, ids
+    )
 
-    return result
+    return [
+        {
+            "id": asignatura.id,
+            "codigo": asignatura.codigo,
+            "nombre": asignatura.nombre,
+            "creditos": asignatura.creditos,
+            "req_creditos": asignatura.req_creditos,
+            "prerequisitos_ids": prerequisitos_ids[asignatura.id],
+            "corequisitos_ids": corequisitos_ids[asignatura.id],
+        }
+        for asignatura in asignaturas
+    ]
 
 
 @router.post("/", response_model=AsignaturaInDB, status_code=status.HTTP_201_CREATED)
@@ -118,7 +151,12 @@ def add_prerequisito(
     asignatura_id: int, prerequisito_id: int, db: Session = Depends(get_db)
 ):
     """
-    Agregar un prerrequisito a una asignatura
+    Agregar un prerrequisito a una asignatura.
+
+    Se rechaza con 400, indicando el ciclo, si la asignatura (o su grupo de
+    corequisitos) ya es requerida, directa o indirectamente, por el nuevo
+    prerrequisito, si ambas son del mismo grupo de corequisitos, y con 409
+    si el catálogo cambia repetidamente mientras se valida.
     """
     asignatura = db.query(Asignatura).filter(Asignatura.id == asignatura_id).first()
     if not asignatura:
@@ -134,10 +172,69 @@ def add_prerequisito(
             detail=f"No se encontró asignatura con ID {prerequisito_id}",
         )
 
-    if prerequisito not in asignatura.prerequisitos:
-        asignatura.prerequisitos.append(prerequisito)
-        db.commit()
-        db.refresh(asignatura)
+    try:
+        ciclo = GrafoService.agregar_prerequisito(db, asignatura, prerequisito)
+    except RuntimeError as e:
+        raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail=str(e))
+    if ciclo:
+        nombres = {
+            a.id: a
+            for a in db.query(Asignatura).filter(Asignatura.id.in_(ciclo))
+        }
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail={
+                "mensaje": f"El prerrequisito {prerequisito.codigo} crearía un ciclo",
+                "ciclo": [
+                    {
+                        "id": asig_id,
+                        "codigo": nombres[asig_id].codigo,
+                        "nombre": nombres[asig_id].nombre,
+                    }
+                    for asig_id in ciclo
+                ],
+            },
+        )
+
+    db.refresh(asignatura)
+
+    prerequisitos_ids = [p.id for p in asignatura.prerequisitos]
+    corequisitos_ids = [c.id for c in asignatura.corequisitos]
+
+    return {
+        **asignatura.__dict__,
+        "prerequisitos_ids": prerequisitos_ids,
+        "corequisitos_ids": corequisitos_ids,
+    }
+
+
+@router.delete(
+    "/eliminar-prerequisito/{asignatura_id}/{prerequisito_id}",
+    response_model=AsignaturaWithRelations,
+)
+def remove_prerequisito(
+    asignatura_id: int, prerequisito_id: int, db: Session = Depends(get_db)
+):
+    """
+    Eliminar un prerrequisito de una asignatura
+    """
+    asignatura = db.query(Asignatura).filter(Asignatura.id == asignatura_id).first()
+    if not asignatura:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"No se encontró asignatura con ID {asignatura_id}",
+        )
+
+    prerequisito = db.query(Asignatura).filter(Asignatura.id == prerequisito_id).first()
+    if not prerequisito or not GrafoService.eliminar_prerequisito(
+        db, asignatura, prerequisito
+    ):
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"La asignatura {asignatura_id} no tiene el prerrequisito {prerequisito_id}",
+        )
+
+    db.refresh(asignatura)
 
     prerequisitos_ids = [p.id for p in asignatura.prerequisitos]
     corequisitos_ids = [c.id for c in asignatura.corequisitos]
@@ -189,33 +286,41 @@ def add_corequisito(
 
 
 @router.get("/by-trimestre/{trimestre_id}", response_model=List[AsignaturaInDB])
-def get_asignaturas_by_trimestre(trimestre_id: int, db: Session = Depends(get_db)):
+async def get_asignaturas_by_trimestre(
+    trimestre_id: int, db: AsyncSession = Depends(get_async_db)
+):
     """
     Obtener todas las asignaturas de un trimestre específico
     """
-    trimestre = db.query(Trimestre).filter(Trimestre.id == trimestre_id).first()
+    trimestre = await db.get(Trimestre, trimestre_id)
     if not trimestre:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail=f"No se encontró trimestre con ID {trimestre_id}",
         )
 
-    asignaturas = (
-        db.query(Asignatura)
+    asignaturas = await db.scalars(
+        select(Asignatura)
         .join(AsignaturaTrimestre, Asignatura.id == AsignaturaTrimestre.asignatura_id)
         .filter(AsignaturaTrimestre.trimestre_id == trimestre_id)
-        .all()
     )
 
-    return asignaturas
+    return asignaturas.all()
 
 
 @router.get("/{asignatura_id}", response_model=AsignaturaWithRelations)
-def get_asignatura(asignatura_id: int, db: Session = Depends(get_db)):
+async def get_asignatura(asignatura_id: int, db: AsyncSession = Depends(get_async_db)):
     """
     Obtener una asignatura por su ID, incluyendo prerrequisitos y correquisitos
     """
-    asignatura = db.query(Asignatura).filter(Asignatura.id == asignatura_id).first()
+    asignatura = await db.get(
+        Asignatura,
+        asignatura_id,
+        options=[
+            selectinload(Asignatura.prerequisitos),
+            selectinload(Asignatura.corequisitos),
+        ],
+    )
     if not asignatura:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -267,6 +372,5 @@ def delete_asignatura(asignatura_id: int, db: Session = Depends(get_db)):
             detail=f"No se encontró asignatura con ID {asignatura_id}",
         )
 
-    db.delete(db_asignatura)
-    db.commit()
+    GrafoService.eliminar_asignatura(db, db_asignatura)
     return None
@@ -1,23 +1,34 @@
-from typing import List, Optional
+from typing import Dict, List, Optional
 
 from fastapi import APIRouter, Depends, HTTPException, status
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
-from app.api.dependencies import get_db
+from app.api.dependencies import (
+    VersionDatos,
+    get_async_db,
+    get_db,
+    verificar_version,
+    verificar_version_async,
+)
 from app.models.pensum import Pensum
 from app.models.carrera import Carrera
 from app.schemas.pensum import PensumCreate, PensumInDB
+from app.services.grafo_service import GrafoService
 
 router = APIRouter()
 
 
 @router.get("/", response_model=List[PensumInDB])
-def get_pensums(skip: int = 0, limit: int = 100, db: Session = Depends(get_db)):
+async def get_pensums(
+    skip: int = 0, limit: int = 100, db: AsyncSession = Depends(get_async_db)
+):
     """
     Obtener todos los pensums
     """
-    pensums = db.query(Pensum).offset(skip).limit(limit).all()
-    return pensums
+    pensums = await db.scalars(select(Pensum).offset(skip).limit(limit))
+    return pensums.all()
 
 
 @router.post("/", response_model=PensumInDB, status_code=status.HTTP_201_CREATED)
@@ -47,30 +58,56 @@ def create_pensum(pensum: PensumCreate, db: Session = Depends(get_db)):
 
 
 @router.get("/by-carrera/{carrera_id}", response_model=List[PensumInDB])
-def get_pensums_by_carrera(carrera_id: int, db: Session = Depends(get_db)):
+async def get_pensums_by_carrera(
+    carrera_id: int, db: AsyncSession = Depends(get_async_db)
+):
     """
     Obtener todos los pensums de una carrera específica
     """
-    carrera = db.query(Carrera).filter(Carrera.id == carrera_id).first()
+    carrera = await db.get(Carrera, carrera_id)
     if not carrera:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail=f"No se encontró carrera con ID {carrera_id}",
         )
 
-    pensums = db.query(Pensum).filter(Pensum.carrera_id == carrera_id).all()
-    return pensums
+    pensums = await db.scalars(select(Pensum).filter(Pensum.carrera_id == carrera_id))
+    return pensums.all()
 
 
-@router.get("/{pensum_id}", response_model=PensumInDB)
-def get_pensum(pensum_id: int, db: Session = Depends(get_db)):
+@router.get(
+    "/{pensum_id}",
+    response_model=PensumInDB,
+    dependencies=[Depends(verificar_version_async)],
+)
+async def get_pensum(pensum_id: int, db: AsyncSession = Depends(get_async_db)):
     """
     Obtener un pensum por su ID
     """
-    db_pensum = db.query(Pensum).filter(Pensum.id == pensum_id).first()
+    db_pensum = await db.get(Pensum, pensum_id)
     if not db_pensum:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail=f"No se encontró pensum con ID {pensum_id}",
         )
     return db_pensum
+
+
+@router.get("/{pensum_id}/malla", response_model=Dict)
+def get_malla_pensum(
+    pensum_id: int,
+    datos: VersionDatos = Depends(verificar_version),
+    db: Session = Depends(get_db),
+):
+    """
+    Obtener la malla completa de un pensum: todos sus trimestres con sus
+    asignaturas y los IDs de sus prerrequisitos y correquisitos
+    """
+    db_pensum = db.query(Pensum).filter(Pensum.id == pensum_id).first()
+    if not db_pensum:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"No se encontró pensum con ID {pensum_id}",
+        )
+
+    return GrafoService.get_malla(db, db_pensum, datos.version)
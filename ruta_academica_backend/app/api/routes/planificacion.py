@@ -0,0 +1,221 @@
+from typing import Dict, Optional
+
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from sqlalchemy.orm import Session
+
+from app.api.dependencies import get_db
+from app.models.pensum import Pensum
+from app.schemas.planificacion import CohorteRequest, ElegibilidadRequest, PlanRequest
+from app.services.grafo_service import GrafoService
+from app.services.planificacion_service import PlanificacionService
+
+router = APIRouter()
+
+
+def _get_grafo_pensum(db: Session, pensum_id: int):
+    pensum = db.query(Pensum).filter(Pensum.id == pensum_id).first()
+    if not pensum:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"No se encontró pensum con ID {pensum_id}",
+        )
+
+    return GrafoService.get_grafo(db, pensum_id)
+
+
+@router.post("/{pensum_id}/elegibles", response_model=Dict)
+def get_asignaturas_elegibles(
+    pensum_id: int, aprobadas: ElegibilidadRequest, db: Session = Depends(get_db)
+):
+    """
+    Obtiene las asignaturas del pensum que un estudiante puede inscribir,
+    dadas las asignaturas que ya aprobó.
+
+    Una asignatura es elegible si sus prerrequisitos directos están aprobados,
+    los créditos acumulados alcanzan su requisito de créditos y todo su grupo
+    de corequisitos pendiente también es elegible.
+
+    Args:
+        pensum_id: ID del pensum
+        aprobadas: IDs y/o códigos de las asignaturas aprobadas, y opcionalmente
+            los créditos acumulados (por defecto se suman los de las aprobadas)
+    """
+    grafo = _get_grafo_pensum(db, pensum_id)
+
+    resultado = PlanificacionService.get_elegibles(
+        grafo,
+        aprobadas.asignatura_ids,
+        aprobadas.codigos,
+        aprobadas.creditos_acumulados,
+    )
+
+    return {"pensum_id": pensum_id, **resultado}
+
+
+@router.post("/{pensum_id}/elegibles/cohorte", response_model=Dict)
+def get_elegibles_cohorte(
+    pensum_id: int, cohorte: CohorteRequest, db: Session = Depends(get_db)
+):
+    """
+    Calcula la elegibilidad de muchos estudiantes a la vez a partir de una
+    matriz estudiantes x asignaturas de aprobadas.
+
+    La matriz de elegibles usa las mismas columnas que la de aprobadas; para
+    obtener la elegibilidad de todo el pensum deben enviarse todas sus
+    asignaturas como columnas.
+
+    Args:
+        pensum_id: ID del pensum
+        cohorte: IDs de las asignaturas de cada columna, matriz de aprobadas
+            y opcionalmente los créditos acumulados de cada estudiante
+    """
+    error = cohorte.error_de_forma()
+    if error:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=error)
+
+    grafo = _get_grafo_pensum(db, pensum_id)
+
+    try:
+        elegibles, creditos_restantes = PlanificacionService.elegibles_cohorte(
+            grafo,
+            cohorte.aprobadas,
+            cohorte.columnas,
+            cohorte.creditos_acumulados,
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+
+    return {
+        "pensum_id": pensum_id,
+        "columnas": cohorte.columnas,
+        "elegibles": elegibles.tolist(),
+        "creditos_restantes": creditos_restantes.tolist(),
+    }
+
+
+@router.post("/{pensum_id}/plan", response_model=Dict)
+def get_plan_trimestres(
+    pensum_id: int, solicitud: PlanRequest, db: Session = Depends(get_db)
+):
+    """
+    Genera un plan trimestre a trimestre para las asignaturas pendientes de
+    un estudiante, respetando un tope de créditos por trimestre y cursando
+    juntos los corequisitos. Intenta minimizar el número de trimestres
+    priorizando las asignaturas del camino crítico.
+
+    Si se indica una asignatura objetivo, solo se planifican las asignaturas
+    necesarias para cursarla (y la propia asignatura).
+
+    Args:
+        pensum_id: ID del pensum
+        solicitud: Asignaturas aprobadas, tope de créditos por trimestre y
+            asignatura objetivo (opcional, por ID o código)
+    """
+    if solicitud.max_creditos <= 0:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="El tope de créditos por trimestre debe ser mayor que cero",
+        )
+
+    grafo = _get_grafo_pensum(db, pensum_id)
+
+    if grafo.has_cycle():
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="No se puede planificar: se detectaron ciclos en los prerrequisitos del pensum",
+        )
+
+    objetivo_id = solicitud.objetivo_id
+    if objetivo_id is None and solicitud.objetivo_codigo:
+        objetivo_id = grafo.elegibilidad.codigos.get(solicitud.objetivo_codigo.upper())
+        if objetivo_id is None:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail=f"La asignatura {solicitud.objetivo_codigo} no está asociada al pensum {pensum_id}",
+            )
+    elif objetivo_id is not None and objetivo_id not in grafo:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"La asignatura con ID {objetivo_id} no está asociada al pensum {pensum_id}",
+        )
+
+    plan = PlanificacionService.get_plan(
+        grafo,
+        solicitud.asignatura_ids,
+        solicitud.codigos,
+        solicitud.max_creditos,
+        objetivo_id,
+        solicitud.creditos_acumulados,
+    )
+
+    return {"pensum_id": pensum_id, "objetivo_id": objetivo_id, **plan}
+
+
+@router.get("/{pensum_id}/camino-critico", response_model=Dict)
+def get_camino_critico(pensum_id: int, db: Session = Depends(get_db)):
+    """
+    Calcula el camino crítico del pensum: para cada asignatura, el primer
+    trimestre en que puede cursarse, el último que no retrasa la graduación
+    y su holgura, comparados con el trimestre en que está ubicada.
+
+    El análisis se calcula en una sola pasada y se almacena con el grafo en
+    caché.
+
+    Args:
+        pensum_id: ID del pensum
+    """
+    grafo = _get_grafo_pensum(db, pensum_id)
+
+    if grafo.has_cycle():
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="No se puede calcular el camino crítico: se detectaron ciclos en los prerrequisitos del pensum",
+        )
+
+    return {"pensum_id": pensum_id, **PlanificacionService.get_camino_critico(grafo)}
+
+
+@router.get("/{pensum_id}/impacto", response_model=Dict)
+def get_ranking_impacto(
+    pensum_id: int,
+    limite: Optional[int] = Query(None, ge=1),
+    db: Session = Depends(get_db),
+):
+    """
+    Ordena las asignaturas del pensum según cuántas asignaturas quedan
+    bloqueadas (directa o indirectamente) si no se pueden cursar.
+
+    Args:
+        pensum_id: ID del pensum
+        limite: Número máximo de asignaturas a devolver (opcional)
+    """
+    grafo = _get_grafo_pensum(db, pensum_id)
+
+    return {
+        "pensum_id": pensum_id,
+        "ranking": PlanificacionService.get_ranking_impacto(grafo, limite),
+    }
+
+
+@router.get("/{pensum_id}/impacto/{asignatura_id}", response_model=Dict)
+def get_impacto_asignatura(
+    pensum_id: int, asignatura_id: int, db: Session = Depends(get_db)
+):
+    """
+    Obtiene todas las asignaturas que quedan bloqueadas si no se puede
+    cursar una asignatura (por ejemplo, si se cancela su sección), con el
+    total de créditos bloqueados.
+
+    Args:
+        pensum_id: ID del pensum
+        asignatura_id: ID de la asignatura
+    """
+    grafo = _get_grafo_pensum(db, pensum_id)
+
+    if asignatura_id not in grafo:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"La asignatura con ID {asignatura_id} no está asociada al pensum {pensum_id}",
+        )
+
+    return {"pensum_id": pensum_id, **PlanificacionService.get_impacto(grafo, asignatura_id)}
@@ -1,20 +1,46 @@
-from typing import Dict, List, Optional
+from typing import Dict, List, Optional, Union
 
-from fastapi import APIRouter, Depends, HTTPException, Query, status
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response, status
 from sqlalchemy.orm import Session
 
-from app.api.dependencies import get_db
-from app.models.asignatura import Asignatura
+from app.api.dependencies import VersionDatos, get_db, verificar_version
+from app.core.config import settings
+from app.core.graph import AsignaturaGrafoBase
+from app.models.asignatura import (
+    Asignatura,
+    AsignaturaTrimestre,
+    corequisito,
+    prerequisito,
+)
 from app.models.pensum import Pensum
+from app.models.trimestre import Trimestre
+from app.schemas.ruta import (
+    AsignaturaResumen,
+    AsignaturasPorNivel,
+    RutaAcademica,
+    RutaConCiclos,
+    RutaNoDisponible,
+    RutasRequest,
+)
 from app.services.grafo_service import GrafoService
+from app.services.respuesta_service import RespuestaService
 
 
 router = APIRouter()
 
 
-@router.get("/ruta/{asignatura_id}", response_model=Dict)
+@router.get(
+    "/ruta/{asignatura_id}",
+    response_model=Union[RutaAcademica, RutaConCiclos],
+    response_model_exclude_unset=True,
+)
 def get_ruta_academica(
-    asignatura_id: int, pensum_id: Optional[int] = None, db: Session = Depends(get_db)
+    asignatura_id: int,
+    request: Request,
+    response: Response,
+    pensum_id: Optional[int] = None,
+    datos: VersionDatos = Depends(verificar_version),
+    db: Session = Depends(get_db),
 ):
     """
     Obtiene la ruta académica completa para llegar a una asignatura por su ID,
@@ -25,6 +51,23 @@ def get_ruta_academica(
         asignatura_id: ID de la asignatura objetivo
         pensum_id: ID del pensum (opcional, para filtrar por pensum)
     """
+    return RespuestaService.responder(
+        request,
+        response,
+        ("ruta", asignatura_id, pensum_id, datos.etag),
+        lambda: _get_ruta_academica(db, asignatura_id, pensum_id, datos.version),
+    )
+
+
+def _get_ruta_academica(
+    db: Session,
+    asignatura_id: int,
+    pensum_id: Optional[int],
+    version: Optional[int] = None,
+) -> Union[RutaAcademica, RutaConCiclos]:
+    """
+    Calcula la ruta académica de una asignatura por su ID (ver get_ruta_academica).
+    """
     asignatura = db.query(Asignatura).filter(Asignatura.id == asignatura_id).first()
     if not asignatura:
         raise HTTPException(
@@ -40,64 +83,23 @@ def get_ruta_academica(
                 detail=f"No se encontró pensum con ID {pensum_id}",
             )
 
-    prerrequisitos = GrafoService.get_prerequisitos(db, asignatura_id, pensum_id)
-
-    grafo = GrafoService.build_asignaturas_graph(db, pensum_id)
-    niveles = GrafoService.get_niveles_topologicos(grafo, asignatura_id)
+    grafo = GrafoService.get_grafo_ruta(db, [asignatura.id], pensum_id, version)
 
-    if grafo.has_cycle():
-        ciclos = grafo.get_cycles()
-        ciclos_info = []
+    return _modelo_ruta(_construir_ruta(db, grafo, asignatura, pensum_id=pensum_id))
 
-        for ciclo in ciclos:
-            ciclo_asignaturas = []
-            for asig_id in ciclo:
-                asig = db.query(Asignatura).filter(Asignatura.id == asig_id).first()
-                if asig:
-                    ciclo_asignaturas.append(
-                        {"id": asig.id, "codigo": asig.codigo, "nombre": asig.nombre}
-                    )
-            ciclos_info.append(ciclo_asignaturas)
 
-        return {
-            "error": "Se detectaron ciclos en los prerrequisitos",
-            "ciclos": ciclos_info,
-            "asignatura_objetivo": {
-                "id": asignatura.id,
-                "codigo": asignatura.codigo,
-                "nombre": asignatura.nombre,
-            },
-        }
-
-    result = {
-        "asignatura_objetivo": {
-            "id": asignatura.id,
-            "codigo": asignatura.codigo,
-            "nombre": asignatura.nombre,
-            "creditos": asignatura.creditos,
-            "req_creditos": asignatura.req_creditos,
-            "trimestre": prerrequisitos["asignatura"].get("trimestre", None),
-            "pensum_id": prerrequisitos["asignatura"].get("pensum_id", None),
-        },
-        "prerrequisitos_directos": prerrequisitos["prerrequisitos_directos"],
-        "todos_prerrequisitos": prerrequisitos["todos_prerrequisitos"],
-        "corequisitos": prerrequisitos["corequisitos"],
-        "total_asignaturas_previas": len(prerrequisitos["todos_prerrequisitos"]),
-        "creditos_requeridos_total": sum(
-            materia["creditos"] for materia in prerrequisitos["todos_prerrequisitos"]
-        ),
-        "niveles_topologicos": niveles,
-        "estructura_dependencias": _construir_estructura_dependencias(
-            db, prerrequisitos["todos_prerrequisitos"]
-        ),
-    }
-
-    return result
-
-
-@router.get("/ruta-por-codigo/{codigo}", response_model=Dict)
+@router.get(
+    "/ruta-por-codigo/{codigo}",
+    response_model=Union[RutaAcademica, RutaConCiclos, RutaNoDisponible],
+    response_model_exclude_unset=True,
+)
 def get_ruta_academica_por_codigo(
-    codigo: str, pensum_id: Optional[int] = None, db: Session = Depends(get_db)
+    codigo: str,
+    request: Request,
+    response: Response,
+    pensum_id: Optional[int] = None,
+    datos: VersionDatos = Depends(verificar_version),
+    db: Session = Depends(get_db),
 ):
     """
     Obtiene la ruta académica completa para llegar a una asignatura por su código,
@@ -108,6 +110,24 @@ def get_ruta_academica_por_codigo(
         codigo: Código de la asignatura objetivo (ej. "MAT101")
         pensum_id: ID del pensum (opcional, para filtrar por pensum)
     """
+    return RespuestaService.responder(
+        request,
+        response,
+        ("ruta-por-codigo", codigo.upper(), pensum_id, datos.etag),
+        lambda: _get_ruta_academica_por_codigo(db, codigo, pensum_id, datos.version),
+    )
+
+
+def _get_ruta_academica_por_codigo(
+    db: Session,
+    codigo: str,
+    pensum_id: Optional[int],
+    version: Optional[int] = None,
+) -> Union[RutaAcademica, RutaConCiclos, RutaNoDisponible]:
+    """
+    Calcula la ruta académica de una asignatura por su código (ver
+    get_ruta_academica_por_codigo).
+    """
     codigo = codigo.upper()
 
     if pensum_id:
@@ -119,8 +139,6 @@ def get_ruta_academica_por_codigo(
             )
 
     if pensum_id:
-        from app.models.trimestre import Trimestre
-        from app.models.asignatura import AsignaturaTrimestre
         asignatura_query = (
             db.query(Asignatura)
             .join(
@@ -138,14 +156,14 @@ def get_ruta_academica_por_codigo(
                 db.query(Asignatura).filter(Asignatura.codigo == codigo).first()
             )
             if asig_general:
-                return {
-                    "error": f"La asignatura {codigo} existe en la base de datos pero no está asociada al pensum {pensum_id}",
-                    "asignatura_objetivo": {
-                        "id": asig_general.id,
-                        "codigo": asig_general.codigo,
-                        "nombre": asig_general.nombre,
-                    },
-                }
+                return RutaNoDisponible(
+                    error=f"La asignatura {codigo} existe en la base de datos pero no está asociada al pensum {pensum_id}",
+                    asignatura_objetivo=AsignaturaResumen(
+                        id=asig_general.id,
+                        codigo=asig_general.codigo,
+                        nombre=asig_general.nombre,
+                    ),
+                )
             else:
                 raise HTTPException(
                     status_code=status.HTTP_404_NOT_FOUND,
@@ -159,111 +177,221 @@ def get_ruta_academica_por_codigo(
                 detail=f"No se encontró asignatura con código {codigo}",
             )
 
-    prerequisitos_info = GrafoService.get_prerequisitos(db, asignatura.id, pensum_id)
+    grafo = GrafoService.get_grafo_ruta(db, [asignatura.id], pensum_id, version)
 
-    if "error" in prerequisitos_info:
-        return {
-            "error": prerequisitos_info["error"],
-            "asignatura_objetivo": {
-                "id": asignatura.id,
-                "codigo": asignatura.codigo,
-                "nombre": asignatura.nombre,
-            },
-        }
+    if asignatura.id not in grafo:
+        return RutaNoDisponible(
+            error=f"La asignatura {codigo} ({asignatura.id}) no está incluida en el grafo para el pensum {pensum_id}",
+            asignatura_objetivo=AsignaturaResumen(
+                id=asignatura.id, codigo=asignatura.codigo, nombre=asignatura.nombre
+            ),
+        )
 
-    grafo = GrafoService.build_asignaturas_graph(db, pensum_id)
+    return _modelo_ruta(_construir_ruta(db, grafo, asignatura, pensum_id=pensum_id))
 
-    if asignatura.id not in grafo.prerrequisitos_graph.nodes:
-        return {
-            "error": f"La asignatura {codigo} ({asignatura.id}) no está incluida en el grafo para el pensum {pensum_id}",
-            "asignatura_objetivo": {
-                "id": asignatura.id,
-                "codigo": asignatura.codigo,
-                "nombre": asignatura.nombre,
-            },
-        }
 
-    niveles = GrafoService.get_niveles_topologicos(grafo, asignatura.id)
+@router.post("/rutas", response_model=Dict)
+def get_rutas_academicas(rutas: RutasRequest, db: Session = Depends(get_db)):
+    """
+    Obtiene las rutas académicas de varias asignaturas objetivo en una sola
+    petición, a partir de un único grafo del pensum.
 
-    if grafo.has_cycle():
-        ciclos = grafo.get_cycles()
-        ciclos_info = []
+    Devuelve la ruta de cada objetivo y la unión sin duplicados de las
+    asignaturas requeridas, organizada en niveles topológicos combinados.
+    Los objetivos cuya ruta tiene ciclos reciben el error de ciclos en su
+    resultado y no se incluyen en la unión.
 
-        for ciclo in ciclos:
-            ciclo_asignaturas = []
-            for asig_id in ciclo:
-                asig = db.query(Asignatura).filter(Asignatura.id == asig_id).first()
-                if asig:
-                    ciclo_asignaturas.append(
-                        {"id": asig.id, "codigo": asig.codigo, "nombre": asig.nombre}
-                    )
-            ciclos_info.append(ciclo_asignaturas)
+    Args:
+        rutas: Códigos y/o IDs de las asignaturas objetivo y el pensum (opcional)
+    """
+    return _get_rutas_academicas(db, rutas)
 
-        return {
-            "error": "Se detectaron ciclos en los prerrequisitos",
-            "ciclos": ciclos_info,
-            "asignatura_objetivo": {
-                "id": asignatura.id,
-                "codigo": asignatura.codigo,
-                "nombre": asignatura.nombre,
-            },
-        }
 
-    trimestre_info = prerequisitos_info["asignatura"].get("trimestre", None)
-    pensum_info = prerequisitos_info["asignatura"].get("pensum_id", None)
+def _get_rutas_academicas(db: Session, rutas: RutasRequest) -> Dict:
+    """
+    Calcula las rutas académicas de varias asignaturas (ver get_rutas_academicas).
+    """
+    pensum_id = rutas.pensum_id
 
-    if (trimestre_info is None or pensum_info is None) and pensum_id:
-        from app.models.trimestre import Trimestre
-        from app.models.asignatura import AsignaturaTrimestre
+    if not rutas.codigos and not rutas.asignatura_ids:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Debe indicar al menos un código o ID de asignatura",
+        )
 
-        trimestre_data = (
-            db.query(Trimestre.numero)
-            .join(AsignaturaTrimestre, AsignaturaTrimestre.trimestre_id == Trimestre.id)
-            .filter(AsignaturaTrimestre.asignatura_id == asignatura.id)
-            .filter(Trimestre.pensum_id == pensum_id)
-            .first()
+    if pensum_id:
+        pensum = db.query(Pensum).filter(Pensum.id == pensum_id).first()
+        if not pensum:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail=f"No se encontró pensum con ID {pensum_id}",
+            )
+
+    codigos = list(dict.fromkeys(codigo.upper() for codigo in rutas.codigos))
+    candidatas = []
+    if codigos:
+        candidatas = (
+            db.query(Asignatura)
+            .filter(Asignatura.codigo.in_(codigos))
+            .order_by(Asignatura.id)
+            .all()
         )
 
-        if trimestre_data:
-            trimestre_info = trimestre_data[0]
-            pensum_info = pensum_id
+    por_id = {}
+    if rutas.asignatura_ids:
+        por_id = {
+            asig.id: asig
+            for asig in db.query(Asignatura).filter(
+                Asignatura.id.in_(rutas.asignatura_ids)
+            )
+        }
+
+    # Asignaturas solicitadas que están en el pensum (todas, sin pensum); se
+    # consulta aparte porque el grafo puede ser solo el de las rutas
+    en_pensum = {asig.id for asig in candidatas} | set(por_id)
+    if pensum_id and en_pensum:
+        en_pensum = {
+            fila[0]
+            for fila in db.query(AsignaturaTrimestre.asignatura_id)
+            .join(Trimestre, AsignaturaTrimestre.trimestre_id == Trimestre.id)
+            .filter(Trimestre.pensum_id == pensum_id)
+            .filter(AsignaturaTrimestre.asignatura_id.in_(en_pensum))
+        }
 
-    result = {
-        "asignatura_objetivo": {
-            "id": asignatura.id,
-            "codigo": asignatura.codigo,
-            "nombre": asignatura.nombre,
-            "creditos": asignatura.creditos,
-            "req_creditos": asignatura.req_creditos,
-            "trimestre": trimestre_info,
-            "pensum_id": pensum_info,
-        },
-        "prerrequisitos_directos": prerequisitos_info["prerrequisitos_directos"],
-        "todos_prerrequisitos": prerequisitos_info["todos_prerrequisitos"],
-        "corequisitos": prerequisitos_info["corequisitos"],
-        "total_asignaturas_previas": len(prerequisitos_info["todos_prerrequisitos"]),
+    # Con pensum se prefiere la asignatura asociada a él; si no, la primera por ID
+    por_codigo = {}
+    for asig in candidatas:
+        actual = por_codigo.get(asig.codigo)
+        if actual is None or (asig.id in en_pensum and actual.id not in en_pensum):
+            por_codigo[asig.codigo] = asig
+
+    objetivo_ids = [
+        asig.id
+        for asig in (*por_codigo.values(), *por_id.values())
+        if asig.id in en_pensum
+    ]
+    grafo = GrafoService.get_grafo_ruta(
+        db, list(dict.fromkeys(objetivo_ids)), pensum_id
+    )
+
+    objetivos = []
+    resultados = []
+    pendientes = []
+
+    solicitudes = [(codigo, por_codigo.get(codigo)) for codigo in codigos] + [
+        (asignatura_id, por_id.get(asignatura_id))
+        for asignatura_id in dict.fromkeys(rutas.asignatura_ids)
+    ]
+
+    for solicitud, asignatura in solicitudes:
+        if asignatura is None:
+            resultados.append(
+                {
+                    "solicitud": solicitud,
+                    "error": f"No se encontró asignatura {solicitud}",
+                }
+            )
+        elif asignatura.id not in grafo:
+            resultados.append(
+                {
+                    "solicitud": solicitud,
+                    "error": f"La asignatura {asignatura.codigo} no está asociada al pensum {pensum_id}",
+                    "asignatura_objetivo": {
+                        "id": asignatura.id,
+                        "codigo": asignatura.codigo,
+                        "nombre": asignatura.nombre,
+                    },
+                }
+            )
+        else:
+            if asignatura not in objetivos:
+                objetivos.append(asignatura)
+            resultado = {"solicitud": solicitud}
+            resultados.append(resultado)
+            pendientes.append((resultado, asignatura))
+
+    # Las rutas con ciclos se reportan como error en su propio resultado; el
+    # resto de objetivos se calcula normalmente
+    sin_ciclos = [
+        asignatura
+        for asignatura in objetivos
+        if not grafo.tiene_ciclo_en_ruta(asignatura.id)
+    ]
+
+    requeridas = {}
+    for asignatura in sin_ciclos:
+        for pre_id, pre_data in grafo.get_all_prerequisitos_bfs(asignatura.id):
+            if pre_id not in requeridas:
+                requeridas[pre_id] = {
+                    "id": pre_id,
+                    "codigo": pre_data["codigo"],
+                    "nombre": pre_data["nombre"],
+                    "creditos": pre_data["creditos"],
+                    "trimestre": pre_data.get("trimestre", None),
+                }
+
+    asignaturas_requeridas = list(requeridas.values())
+    estructura = _construir_estructura_dependencias(
+        db, asignaturas_requeridas, pensum_id
+    )
+
+    rutas_por_id = {
+        asignatura.id: _construir_ruta(db, grafo, asignatura, estructura, pensum_id)
+        for asignatura in objetivos
+    }
+    for resultado, asignatura in pendientes:
+        resultado.update(rutas_por_id[asignatura.id])
+
+    return {
+        "pensum_id": pensum_id,
+        "resultados": resultados,
+        "asignaturas_requeridas": asignaturas_requeridas,
+        "total_asignaturas_requeridas": len(asignaturas_requeridas),
         "creditos_requeridos_total": sum(
-            materia["creditos"]
-            for materia in prerequisitos_info["todos_prerrequisitos"]
+            materia["creditos"] for materia in asignaturas_requeridas
         ),
-        "niveles_topologicos": niveles,
-        "estructura_dependencias": _construir_estructura_dependencias(
-            db, prerequisitos_info["todos_prerrequisitos"]
+        "niveles_topologicos": GrafoService.get_niveles_topologicos_multiples(
+            grafo, [asignatura.id for asignatura in sin_ciclos]
         ),
     }
 
-    return result
 
-
-@router.get("/asignaturas-por-nivel/{pensum_id}", response_model=Dict)
-def get_asignaturas_por_nivel(pensum_id: int, db: Session = Depends(get_db)):
+@router.get(
+    "/asignaturas-por-nivel/{pensum_id}",
+    response_model=AsignaturasPorNivel,
+    response_model_exclude_unset=True,
+)
+def get_asignaturas_por_nivel(
+    pensum_id: int,
+    request: Request,
+    response: Response,
+    datos: VersionDatos = Depends(verificar_version),
+    db: Session = Depends(get_db),
+):
     """
     Organiza las asignaturas de un pensum por niveles según sus prerrequisitos.
     Una asignatura está en el nivel N si su prerrequisito más profundo está en el nivel N-1.
+    Las asignaturas bloqueadas por ciclos se devuelven en "no_asignadas",
+    indicando con "en_ciclo" si forman parte del ciclo o solo dependen de él.
 
     Args:
         pensum_id: ID del pensum
     """
+    return RespuestaService.responder(
+        request,
+        response,
+        ("asignaturas-por-nivel", pensum_id, datos.etag),
+        lambda: _get_asignaturas_por_nivel(db, pensum_id, datos.version),
+    )
+
+
+def _get_asignaturas_por_nivel(
+    db: Session, pensum_id: int, version: Optional[int] = None
+) -> AsignaturasPorNivel:
+    """
+    Calcula los niveles de las asignaturas de un pensum (ver
+    get_asignaturas_por_nivel).
+    """
     pensum = db.query(Pensum).filter(Pensum.id == pensum_id).first()
     if not pensum:
         raise HTTPException(
@@ -271,156 +399,299 @@ def get_asignaturas_por_nivel(pensum_id: int, db: Session = Depends(get_db)):
             detail=f"No se encontró pensum con ID {pensum_id}",
         )
 
-    graph = GrafoService.build_asignaturas_graph(db, pensum_id)
+    grafo = GrafoService.get_grafo(db, pensum_id, version)
 
-    from app.models.trimestre import Trimestre
-    from app.models.asignatura import AsignaturaTrimestre
+    niveles, pendientes = grafo.get_niveles_kahn()
 
-    asignaturas = (
-        db.query(Asignatura)
-        .join(AsignaturaTrimestre, Asignatura.id == AsignaturaTrimestre.asignatura_id)
-        .join(Trimestre, AsignaturaTrimestre.trimestre_id == Trimestre.id)
-        .filter(Trimestre.pensum_id == pensum_id)
-        .all()
-    )
+    def _asignatura_nivel(asignatura_id: int) -> Dict:
+        data = grafo.get_asignatura(asignatura_id)
+        return {
+            "id": asignatura_id,
+            "codigo": data["codigo"],
+            "nombre": data["nombre"],
+            "creditos": data["creditos"],
+            "trimestre": data.get("trimestre", None),
+        }
 
-    asignatura_trimestres = {}
-    for asignatura in asignaturas:
-        trimestre_info = (
-            db.query(Trimestre.numero)
-            .join(AsignaturaTrimestre, Trimestre.id == AsignaturaTrimestre.trimestre_id)
-            .filter(AsignaturaTrimestre.asignatura_id == asignatura.id)
-            .filter(Trimestre.pensum_id == pensum_id)
-            .first()
-        )
+    levels = {
+        nivel: [_asignatura_nivel(asignatura_id) for asignatura_id in asignatura_ids]
+        for nivel, asignatura_ids in enumerate(niveles)
+    }
+    if not levels:
+        levels[0] = []
 
-        if trimestre_info:
-            asignatura_trimestres[asignatura.id] = trimestre_info[0]
-        else:
-            asignatura_trimestres[asignatura.id] = None
+    en_ciclo = set()
+    if pendientes:
+        for componente in grafo.get_componentes_ciclicas():
+            en_ciclo.update(componente)
 
-    levels = {}
-    assigned = set()
+    no_asignadas = []
+    for asignatura_id in pendientes:
+        asignatura = _asignatura_nivel(asignatura_id)
+        # False: la asignatura no está en un ciclo, pero depende de una que sí
+        asignatura["en_ciclo"] = asignatura_id in en_ciclo
+        no_asignadas.append(asignatura)
 
-    level0 = []
-    for asignatura in asignaturas:
-        if not asignatura.prerequisitos:
-            level0.append(
-                {
-                    "id": asignatura.id,
-                    "codigo": asignatura.codigo,
-                    "nombre": asignatura.nombre,
-                    "creditos": asignatura.creditos,
-                    "trimestre": asignatura_trimestres.get(asignatura.id),
-                }
-            )
-            assigned.add(asignatura.id)
+    asignadas = len(grafo) - len(pendientes)
 
-    levels[0] = level0
+    result = {
+        "niveles": levels,
+        "no_asignadas": no_asignadas,
+        "total_niveles": len(levels),
+        "total_asignaturas": len(grafo),
+        "asignaturas_asignadas": asignadas,
+        "asignaturas_no_asignadas": len(no_asignadas),
+    }
 
-    level = 1
-    while len(assigned) < len(asignaturas):
-        current_level = []
+    return AsignaturasPorNivel.model_validate(result)
 
-        for asignatura in asignaturas:
-            if asignatura.id in assigned:
-                continue
 
-            all_prereqs_assigned = all(
-                pre.id in assigned for pre in asignatura.prerequisitos
-            )
+@router.get("/ciclos/{pensum_id}", response_model=Dict)
+def get_ciclos_pensum(
+    pensum_id: int,
+    datos: VersionDatos = Depends(verificar_version),
+    db: Session = Depends(get_db),
+):
+    """
+    Obtiene el reporte de ciclos de prerrequisitos de un pensum: las
+    componentes cíclicas y los ciclos elementales con sus asignaturas. El
+    reporte se calcula una vez por grafo y se sirve desde la caché.
 
-            if all_prereqs_assigned:
-                current_level.append(
-                    {
-                        "id": asignatura.id,
-                        "codigo": asignatura.codigo,
-                        "nombre": asignatura.nombre,
-                        "creditos": asignatura.creditos,
-                        "trimestre": asignatura_trimestres.get(asignatura.id),
-                    }
-                )
-                assigned.add(asignatura.id)
+    Args:
+        pensum_id: ID del pensum
+    """
+    return _get_ciclos_pensum(db, pensum_id, datos.version)
 
-        if not current_level:
-            break
 
-        levels[level] = current_level
-        level += 1
+def _get_ciclos_pensum(
+    db: Session, pensum_id: int, version: Optional[int] = None
+) -> Dict:
+    """
+    Calcula el reporte de ciclos de un pensum (ver get_ciclos_pensum).
+    """
+    pensum = db.query(Pensum).filter(Pensum.id == pensum_id).first()
+    if not pensum:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"No se encontró pensum con ID {pensum_id}",
+        )
+
+    grafo = GrafoService.get_grafo(db, pensum_id, version)
+    reporte = grafo.reporte_ciclos(
+        settings.CICLOS_MAX_ENUMERADOS, settings.CICLOS_TIEMPO_LIMITE
+    )
 
-    no_asignadas = []
-    for asignatura in asignaturas:
-        if asignatura.id not in assigned:
-            no_asignadas.append(
-                {
+    return {
+        "pensum_id": pensum_id,
+        "tiene_ciclos": bool(reporte["componentes"]),
+        "componentes": [
+            _asignaturas_de_grafo(grafo, componente)
+            for componente in reporte["componentes"]
+        ],
+        "ciclos": [_asignaturas_de_grafo(grafo, ciclo) for ciclo in reporte["ciclos"]],
+        "ciclos_truncados": reporte["truncado"],
+    }
+
+
+def _construir_ruta(
+    db: Session,
+    grafo: AsignaturaGrafoBase,
+    asignatura: Asignatura,
+    estructura: Optional[Dict] = None,
+    pensum_id: Optional[int] = None,
+) -> Dict:
+    """
+    Construye la ruta académica de una asignatura a partir de un único grafo:
+    prerrequisitos directos, cierre de prerrequisitos, corequisitos,
+    niveles topológicos, ciclos y estructura de dependencias.
+
+    Args:
+        db: Sesión de base de datos
+        grafo: Grafo de asignaturas del pensum (o del catálogo completo)
+        asignatura: Asignatura objetivo
+        estructura: Estructura de dependencias ya construida que incluye los
+            prerrequisitos de la asignatura (opcional)
+        pensum_id: ID del pensum consultado (opcional)
+
+    Returns:
+        Diccionario con la ruta académica, o con el error si hay ciclos
+    """
+    if grafo.tiene_ciclo_en_ruta(asignatura.id):
+        return _respuesta_ciclos(
+            grafo,
+            [asignatura.id],
+            {
+                "asignatura_objetivo": {
                     "id": asignatura.id,
                     "codigo": asignatura.codigo,
                     "nombre": asignatura.nombre,
-                    "creditos": asignatura.creditos,
-                    "trimestre": asignatura_trimestres.get(asignatura.id),
                 }
+            },
+        )
+
+    prerrequisitos = GrafoService.get_prerequisitos_de_grafo(grafo, asignatura)
+    niveles = GrafoService.get_niveles_topologicos(grafo, asignatura.id)
+
+    return {
+        "asignatura_objetivo": {
+            "id": asignatura.id,
+            "codigo": asignatura.codigo,
+            "nombre": asignatura.nombre,
+            "creditos": asignatura.creditos,
+            "req_creditos": asignatura.req_creditos,
+            "trimestre": prerrequisitos["asignatura"].get("trimestre", None),
+            "pensum_id": prerrequisitos["asignatura"].get("pensum_id", None),
+        },
+        "prerrequisitos_directos": prerrequisitos["prerrequisitos_directos"],
+        "todos_prerrequisitos": prerrequisitos["todos_prerrequisitos"],
+        "corequisitos": prerrequisitos["corequisitos"],
+        "total_asignaturas_previas": len(prerrequisitos["todos_prerrequisitos"]),
+        "creditos_requeridos_total": sum(
+            materia["creditos"] for materia in prerrequisitos["todos_prerrequisitos"]
+        ),
+        "niveles_topologicos": niveles,
+        "estructura_dependencias": (
+            _construir_estructura_dependencias(
+                db, prerrequisitos["todos_prerrequisitos"], pensum_id
             )
+            if estructura is None
+            else {
+                pre["id"]: estructura[pre["id"]]
+                for pre in prerrequisitos["todos_prerrequisitos"]
+            }
+        ),
+    }
 
-    result = {
-        "niveles": levels,
-        "no_asignadas": no_asignadas,
-        "total_niveles": len(levels),
-        "total_asignaturas": len(asignaturas),
-        "asignaturas_asignadas": len(assigned),
-        "asignaturas_no_asignadas": len(no_asignadas),
+
+def _modelo_ruta(ruta: Dict) -> Union[RutaAcademica, RutaConCiclos]:
+    """
+    Valida la ruta construida por _construir_ruta con su esquema de
+    respuesta, para serializarla con el serializador compilado de Pydantic.
+    """
+    if "error" in ruta:
+        return RutaConCiclos.model_validate(ruta)
+    return RutaAcademica.model_validate(ruta)
+
+
+def _respuesta_ciclos(
+    grafo: AsignaturaGrafoBase, asignatura_ids: List[int], objetivo: Dict
+) -> Dict:
+    """
+    Construye la respuesta de error cuando la ruta de una asignatura tiene
+    ciclos. Solo se reportan los ciclos que afectan a la ruta, tomados del
+    reporte de ciclos del grafo, y los datos de sus asignaturas se leen del
+    propio grafo.
+
+    Args:
+        grafo: Grafo de asignaturas con ciclos
+        asignatura_ids: IDs de las asignaturas objetivo
+        objetivo: Datos de la(s) asignatura(s) objetivo a incluir en la respuesta
+
+    Returns:
+        Diccionario con el error, los ciclos encontrados y el objetivo
+    """
+    reporte_ciclos = grafo.get_reporte_ciclos_de_ruta(
+        asignatura_ids, settings.CICLOS_MAX_ENUMERADOS, settings.CICLOS_TIEMPO_LIMITE
+    )
+
+    return {
+        "error": "Se detectaron ciclos en los prerrequisitos",
+        "ciclos": [
+            _asignaturas_de_grafo(grafo, ciclo) for ciclo in reporte_ciclos["ciclos"]
+        ],
+        "ciclos_truncados": reporte_ciclos["truncado"],
+        **objetivo,
     }
 
-    return result
+
+def _asignaturas_de_grafo(
+    grafo: AsignaturaGrafoBase, asignatura_ids: List[int]
+) -> List[Dict]:
+    """
+    Obtiene el ID, código y nombre de una lista de asignaturas del grafo.
+    """
+    asignaturas = []
+    for asignatura_id in asignatura_ids:
+        data = grafo.get_asignatura(asignatura_id)
+        asignaturas.append(
+            {
+                "id": asignatura_id,
+                "codigo": data.get("codigo"),
+                "nombre": data.get("nombre"),
+            }
+        )
+    return asignaturas
 
 
-def _construir_estructura_dependencias(db: Session, prerrequisitos: List[Dict]) -> Dict:
+def _construir_estructura_dependencias(
+    db: Session, prerrequisitos: List[Dict], pensum_id: Optional[int] = None
+) -> Dict:
     """
     Construye una estructura que muestra las dependencias entre las asignaturas prerrequisitos.
 
+    Los datos se cargan en bloque con tres consultas (prerrequisitos,
+    corequisitos y trimestres de todas las asignaturas), sin importar
+    cuántos prerrequisitos tenga la ruta.
+
     Args:
         db: Sesión de base de datos
         prerrequisitos: Lista de prerrequisitos
+        pensum_id: ID del pensum consultado; el trimestre de cada asignatura
+            se toma de él y solo se busca en otro pensum si no está en este
 
     Returns:
         Diccionario con la estructura de dependencias
     """
+    ids = [pre["id"] for pre in prerrequisitos]
+    if not ids:
+        return {}
+
+    pre_ids = {asignatura_id: [] for asignatura_id in ids}
+    for asignatura_id, prerequisito_id in (
+        db.query(prerequisito.c.asignatura_id, prerequisito.c.prerequisito_id)
+        .filter(prerequisito.c.asignatura_id.in_(ids))
+        .order_by(prerequisito.c.asignatura_id, prerequisito.c.prerequisito_id)
+    ):
+        pre_ids[asignatura_id].append(prerequisito_id)
+
+    co_ids = {asignatura_id: [] for asignatura_id in ids}
+    for asignatura_id, corequisito_id in (
+        db.query(corequisito.c.asignatura_id, corequisito.c.corequisito_id)
+        .filter(corequisito.c.asignatura_id.in_(ids))
+        .order_by(corequisito.c.asignatura_id, corequisito.c.corequisito_id)
+    ):
+        co_ids[asignatura_id].append(corequisito_id)
+
+    # Primer trimestre de cada asignatura en el pensum consultado o, si no
+    # está en él, en cualquier otro
+    trimestres = {}
+    for asignatura_id, trimestre_numero, trimestre_pensum_id in (
+        db.query(AsignaturaTrimestre.asignatura_id, Trimestre.numero, Trimestre.pensum_id)
+        .join(Trimestre, AsignaturaTrimestre.trimestre_id == Trimestre.id)
+        .filter(AsignaturaTrimestre.asignatura_id.in_(ids))
+        .order_by(AsignaturaTrimestre.asignatura_id, AsignaturaTrimestre.trimestre_id)
+    ):
+        actual = trimestres.get(asignatura_id)
+        if actual is None or (
+            trimestre_pensum_id == pensum_id and actual[1] != pensum_id
+        ):
+            trimestres[asignatura_id] = (trimestre_numero, trimestre_pensum_id)
+
     estructura = {}
 
     for pre in prerrequisitos:
         asignatura_id = pre["id"]
-        asignatura = db.query(Asignatura).filter(Asignatura.id == asignatura_id).first()
-
-        if asignatura:
-            pre_ids = [p.id for p in asignatura.prerequisitos]
-
-            co_ids = [c.id for c in asignatura.corequisitos]
-
-            from app.models.trimestre import Trimestre
-            from app.models.asignatura import AsignaturaTrimestre
-
-            trimestre_info = (
-                db.query(Trimestre.numero, Trimestre.pensum_id)
-                .join(
-                    AsignaturaTrimestre,
-                    AsignaturaTrimestre.trimestre_id == Trimestre.id,
-                )
-                .filter(AsignaturaTrimestre.asignatura_id == asignatura_id)
-                .first()
-            )
+        trimestre_numero, trimestre_pensum_id = trimestres.get(
+            asignatura_id, (None, None)
+        )
 
-            trimestre_numero = None
-            pensum_id = None
-            if trimestre_info:
-                trimestre_numero = trimestre_info[0]
-                pensum_id = trimestre_info[1]
-
-            estructura[asignatura_id] = {
-                "codigo": asignatura.codigo,
-                "nombre": asignatura.nombre,
-                "prerrequisitos_directos": pre_ids,
-                "corequisitos": co_ids,
-                "trimestre": trimestre_numero,
-                "pensum_id": pensum_id,
-            }
+        estructura[asignatura_id] = {
+            "codigo": pre["codigo"],
+            "nombre": pre["nombre"],
+            "prerrequisitos_directos": pre_ids[asignatura_id],
+            "corequisitos": co_ids[asignatura_id],
+            "trimestre": trimestre_numero,
+            "pensum_id": trimestre_pensum_id,
+        }
 
     return estructura
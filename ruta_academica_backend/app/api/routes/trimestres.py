@@ -1,9 +1,10 @@
 from typing import List
 
 from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
+from sqlalchemy.orm import Session, joinedload, selectinload
 
 from app.api.dependencies import get_db
+from app.models.asignatura import AsignaturaTrimestre
 from app.models.trimestre import Trimestre
 from app.models.pensum import Pensum
 from app.schemas.trimestre import (
@@ -79,7 +80,16 @@ def get_trimestre_with_asignaturas(trimestre_id: int, db: Session = Depends(get_
     """
     Obtener un trimestre por su ID, incluyendo sus asignaturas
     """
-    db_trimestre = db.query(Trimestre).filter(Trimestre.id == trimestre_id).first()
+    db_trimestre = (
+        db.query(Trimestre)
+        .options(
+            selectinload(Trimestre.asignaturas).joinedload(
+                AsignaturaTrimestre.asignatura
+            )
+        )
+        .filter(Trimestre.id == trimestre_id)
+        .first()
+    )
 
     if not db_trimestre:
         raise HTTPException(
@@ -87,4 +97,12 @@ def get_trimestre_with_asignaturas(trimestre_id: int, db: Session = Depends(get_
             detail=f"No se encontró trimestre con ID {trimestre_id}",
         )
 
-    return db_trimestre
+    return {
+        "id": db_trimestre.id,
+        "numero": db_trimestre.numero,
+        "pensum_id": db_trimestre.pensum_id,
+        "asignaturas": sorted(
+            (asig_trimestre.asignatura for asig_trimestre in db_trimestre.asignaturas),
+            key=lambda asignatura: asignatura.id,
+        ),
+    }
@@ -0,0 +1,178 @@
+import threading
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, Optional
+
+
+class CacheLRU:
+    """
+    Caché en memoria con desalojo LRU, limitada por número de entradas
+    y por un presupuesto aproximado de memoria en bytes.
+
+    Es segura para hilos: los handlers síncronos de FastAPI se ejecutan
+    en un threadpool y comparten la misma instancia.
+
+    Cada entrada puede guardar la versión de los datos con la que se
+    construyó; al leerla indicando otra versión, cuenta como fallo y se
+    reemplaza al construirla de nuevo.
+    """
+
+    def __init__(
+        self,
+        max_entradas: int,
+        max_bytes: int,
+        calcular_tamano: Optional[Callable[[Any], int]] = None,
+    ):
+        """
+        Args:
+            max_entradas: Número máximo de entradas almacenadas
+            max_bytes: Presupuesto de memoria total (aproximado) en bytes
+            calcular_tamano: Función que estima el tamaño en bytes de un valor
+        """
+        self.max_entradas = max_entradas
+        self.max_bytes = max_bytes
+        self._calcular_tamano = calcular_tamano or (lambda valor: 0)
+        self._entradas: "OrderedDict[Hashable, Any]" = OrderedDict()
+        self._tamanos: Dict[Hashable, int] = {}
+        self._versiones: Dict[Hashable, Hashable] = {}
+        self._bytes_totales = 0
+        self._lock = threading.RLock()
+        self._generacion = 0
+        self.aciertos = 0
+        self.fallos = 0
+        self.desalojos = 0
+
+    def get(self, clave: Hashable, version: Optional[Hashable] = None) -> Any:
+        """
+        Obtiene un valor de la caché y lo marca como usado recientemente.
+
+        Args:
+            clave: Clave del valor
+            version: Versión de los datos que debe tener el valor (opcional)
+
+        Returns:
+            El valor almacenado o None si la clave no existe o su versión es otra
+        """
+        with self._lock:
+            if not self.contiene(clave, version):
+                self.fallos += 1
+                return None
+
+            self._entradas.move_to_end(clave)
+            self.aciertos += 1
+            return self._entradas[clave]
+
+    def set(
+        self, clave: Hashable, valor: Any, version: Optional[Hashable] = None
+    ) -> None:
+        """
+        Almacena un valor, con la versión de los datos con la que se
+        construyó, y desaloja las entradas menos usadas si se exceden los
+        límites. Un valor más grande que el presupuesto completo no se
+        almacena.
+        """
+        tamano = self._calcular_tamano(valor)
+
+        with self._lock:
+            self._eliminar(clave)
+
+            if tamano > self.max_bytes:
+                return
+
+            self._entradas[clave] = valor
+            self._tamanos[clave] = tamano
+            self._versiones[clave] = version
+            self._bytes_totales += tamano
+
+            while self._entradas and (
+                len(self._entradas) > self.max_entradas
+                or self._bytes_totales > self.max_bytes
+            ):
+                clave_antigua = next(iter(self._entradas))
+                self._eliminar(clave_antigua)
+                self.desalojos += 1
+
+    def get_or_set(
+        self,
+        clave: Hashable,
+        construir: Callable[[], Any],
+        version: Optional[Hashable] = None,
+    ) -> Any:
+        """
+        Obtiene un valor de la caché o lo construye y almacena si no existe
+        o si se construyó con otra versión de los datos.
+
+        La construcción se realiza fuera del lock para no bloquear las
+        lecturas de otras claves mientras se consulta la base de datos.
+        Si la caché se invalida durante la construcción, el valor se
+        devuelve pero no se almacena, porque puede estar desactualizado.
+        """
+        valor = self.get(clave, version)
+        if valor is not None:
+            return valor
+
+        with self._lock:
+            generacion = self._generacion
+
+        valor = construir()
+
+        with self._lock:
+            if generacion == self._generacion:
+                self.set(clave, valor, version)
+
+        return valor
+
+    def invalidate(self, clave: Hashable) -> None:
+        """
+        Elimina una entrada de la caché si existe.
+        """
+        with self._lock:
+            self._generacion += 1
+            self._eliminar(clave)
+
+    def clear(self) -> None:
+        """
+        Elimina todas las entradas de la caché.
+        """
+        with self._lock:
+            self._generacion += 1
+            self._entradas.clear()
+            self._tamanos.clear()
+            self._versiones.clear()
+            self._bytes_totales = 0
+
+    def stats(self) -> Dict[str, int]:
+        """
+        Devuelve contadores de uso de la caché.
+        """
+        with self._lock:
+            return {
+                "entradas": len(self._entradas),
+                "bytes": self._bytes_totales,
+                "aciertos": self.aciertos,
+                "fallos": self.fallos,
+                "desalojos": self.desalojos,
+            }
+
+    def contiene(self, clave: Hashable, version: Optional[Hashable] = None) -> bool:
+        """
+        Indica si la clave está en la caché y, si se indica versión, si su
+        valor se construyó con esa versión de los datos. No cuenta como uso.
+        """
+        with self._lock:
+            return clave in self._entradas and (
+                version is None or self._versiones[clave] == version
+            )
+
+    def __contains__(self, clave: Hashable) -> bool:
+        with self._lock:
+            return clave in self._entradas
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._entradas)
+
+    def _eliminar(self, clave: Hashable) -> None:
+        if clave in self._entradas:
+            del self._entradas[clave]
+            del self._versiones[clave]
+            self._bytes_totales -= self._tamanos.pop(clave)
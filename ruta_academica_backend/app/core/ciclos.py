@@ -0,0 +1,148 @@
+import time
+from collections import defaultdict
+from typing import Callable, Dict, Iterable, List, Optional, Set, Tuple
+
+
+def componentes_fuertes(
+    ids: List[int], sucesores: Callable[[int], Iterable[int]]
+) -> List[List[int]]:
+    """
+    Calcula las componentes fuertemente conexas con el algoritmo de Tarjan
+    (versión iterativa, sin recursión), en tiempo O(N + E).
+
+    Args:
+        ids: IDs de los nodos del grafo
+        sucesores: Función que devuelve los sucesores directos de un ID
+
+    Returns:
+        Lista de componentes; cada componente es una lista de IDs
+    """
+    indice: Dict[int, int] = {}
+    bajo: Dict[int, int] = {}
+    en_pila: Set[int] = set()
+    pila: List[int] = []
+    componentes: List[List[int]] = []
+    contador = 0
+
+    for raiz in ids:
+        if raiz in indice:
+            continue
+
+        indice[raiz] = bajo[raiz] = contador
+        contador += 1
+        pila.append(raiz)
+        en_pila.add(raiz)
+        trabajo = [(raiz, iter(sucesores(raiz)))]
+
+        while trabajo:
+            nodo, vecinos = trabajo[-1]
+            avanzo = False
+
+            for vecino in vecinos:
+                if vecino not in indice:
+                    indice[vecino] = bajo[vecino] = contador
+                    contador += 1
+                    pila.append(vecino)
+                    en_pila.add(vecino)
+                    trabajo.append((vecino, iter(sucesores(vecino))))
+                    avanzo = True
+                    break
+                if vecino in en_pila:
+                    bajo[nodo] = min(bajo[nodo], indice[vecino])
+
+            if avanzo:
+                continue
+
+            trabajo.pop()
+            if trabajo:
+                padre = trabajo[-1][0]
+                bajo[padre] = min(bajo[padre], bajo[nodo])
+
+            if bajo[nodo] == indice[nodo]:
+                componente = []
+                while True:
+                    miembro = pila.pop()
+                    en_pila.discard(miembro)
+                    componente.append(miembro)
+                    if miembro == nodo:
+                        break
+                componentes.append(componente)
+
+    return componentes
+
+
+def enumerar_ciclos(
+    componente: List[int],
+    sucesores: Callable[[int], Iterable[int]],
+    max_ciclos: Optional[int] = None,
+    limite: Optional[float] = None,
+) -> Tuple[List[List[int]], bool]:
+    """
+    Enumera los ciclos elementales de una componente fuertemente conexa con
+    el algoritmo de Johnson, deteniéndose al alcanzar un número máximo de
+    ciclos o un instante límite.
+
+    Cada ciclo se devuelve cerrado: el primer ID se repite al final.
+
+    Args:
+        componente: IDs de la componente
+        sucesores: Función que devuelve los sucesores directos de un ID
+        max_ciclos: Número máximo de ciclos a devolver (opcional)
+        limite: Instante (time.perf_counter) a partir del cual se detiene (opcional)
+
+    Returns:
+        Tupla (ciclos, truncado)
+    """
+    rango = {nodo: i for i, nodo in enumerate(componente)}
+    ciclos: List[List[int]] = []
+    pasos = 0
+
+    for inicio in componente:
+        minimo = rango[inicio]
+
+        def vecinos(nodo: int) -> List[int]:
+            return [
+                w for w in sucesores(nodo) if w in rango and rango[w] >= minimo
+            ]
+
+        camino = [inicio]
+        bloqueados = {inicio}
+        bloqueantes: Dict[int, Set[int]] = defaultdict(set)
+        pila = [iter(vecinos(inicio))]
+        cerrado = [False]
+
+        while pila:
+            pasos += 1
+            if limite is not None and pasos % 256 == 0 and time.perf_counter() > limite:
+                return ciclos, True
+
+            for w in pila[-1]:
+                if w == inicio:
+                    if max_ciclos is not None and len(ciclos) >= max_ciclos:
+                        return ciclos, True
+                    ciclos.append(camino + [inicio])
+                    cerrado[-1] = True
+                elif w not in bloqueados:
+                    camino.append(w)
+                    cerrado.append(False)
+                    pila.append(iter(vecinos(w)))
+                    bloqueados.add(w)
+                    break
+            else:
+                pila.pop()
+                v = camino.pop()
+                if cerrado.pop():
+                    if cerrado:
+                        cerrado[-1] = True
+                    desbloquear = [v]
+                    while desbloquear:
+                        u = desbloquear.pop()
+                        if u in bloqueados:
+                            bloqueados.remove(u)
+                            desbloquear.extend(bloqueantes[u])
+                            bloqueantes[u].clear()
+                else:
+                    for w in vecinos(v):
+                        bloqueantes[w].add(v)
+
+    return ciclos, False
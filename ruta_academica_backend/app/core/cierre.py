@@ -0,0 +1,141 @@
+import sys
+from typing import Callable, Dict, Iterable, List
+from collections import deque
+
+
+class CierreTransitivo:
+    """
+    Índice de cierre transitivo de los prerrequisitos de un grafo.
+
+    Cada asignatura tiene un bitset (un entero de Python) con todos sus
+    prerrequisitos directos e indirectos. Los bits se asignan según el orden
+    topológico, de modo que recorrer un bitset de menor a mayor produce las
+    asignaturas en orden topológico. Los bitsets se llenan en ese mismo
+    orden: el conjunto de ancestros de un nodo es la unión de los ancestros
+    de sus prerrequisitos directos, ya calculados.
+
+    Las asignaturas que forman parte de un ciclo (o dependen de uno) no
+    tienen orden topológico; reciben los bits finales y sus ancestros se
+    calculan con un BFS individual.
+    """
+
+    def __init__(
+        self,
+        ids: List[int],
+        predecesores: Callable[[int], Iterable[int]],
+        sucesores: Callable[[int], Iterable[int]],
+    ):
+        """
+        Args:
+            ids: IDs de todas las asignaturas del grafo
+            predecesores: Función que devuelve los prerrequisitos directos de un ID
+            sucesores: Función que devuelve los dependientes directos de un ID
+        """
+        in_degree = {asignatura_id: 0 for asignatura_id in ids}
+        for asignatura_id in ids:
+            for sucesor in sucesores(asignatura_id):
+                in_degree[sucesor] += 1
+
+        queue = deque(
+            asignatura_id for asignatura_id, grado in in_degree.items() if grado == 0
+        )
+        orden = []
+
+        while queue:
+            actual = queue.popleft()
+            orden.append(actual)
+
+            for sucesor in sucesores(actual):
+                in_degree[sucesor] -= 1
+                if in_degree[sucesor] == 0:
+                    queue.append(sucesor)
+
+        self.num_ordenados = len(orden)
+        self.en_orden = set(orden)
+        orden.extend(
+            asignatura_id for asignatura_id in ids if asignatura_id not in self.en_orden
+        )
+
+        self.orden: List[int] = orden
+        self.bits: Dict[int, int] = {
+            asignatura_id: bit for bit, asignatura_id in enumerate(orden)
+        }
+        self.ancestros: Dict[int, int] = {}
+
+        for asignatura_id in orden[: self.num_ordenados]:
+            mascara = 0
+            for pre_id in predecesores(asignatura_id):
+                mascara |= self.ancestros[pre_id] | (1 << self.bits[pre_id])
+            self.ancestros[asignatura_id] = mascara
+
+        for asignatura_id in orden[self.num_ordenados :]:
+            self.ancestros[asignatura_id] = self._ancestros_bfs(
+                asignatura_id, predecesores
+            )
+
+    def _ancestros_bfs(
+        self, asignatura_id: int, predecesores: Callable[[int], Iterable[int]]
+    ) -> int:
+        mascara = 0
+        queue = deque([asignatura_id])
+
+        while queue:
+            actual = queue.popleft()
+            for pre_id in predecesores(actual):
+                bit = 1 << self.bits[pre_id]
+                if not mascara & bit:
+                    mascara |= bit
+                    queue.append(pre_id)
+
+        return mascara
+
+    def mascara(self, asignatura_ids: Iterable[int]) -> int:
+        """
+        Construye el bitset de un conjunto de asignaturas.
+        """
+        mascara = 0
+        for asignatura_id in asignatura_ids:
+            mascara |= 1 << self.bits[asignatura_id]
+        return mascara
+
+    def ids(self, mascara: int) -> List[int]:
+        """
+        Convierte un bitset en la lista de IDs, en orden topológico.
+        """
+        orden = self.orden
+        resultado = []
+
+        while mascara:
+            bajo = mascara & -mascara
+            resultado.append(orden[bajo.bit_length() - 1])
+            mascara ^= bajo
+
+        return resultado
+
+    def estimate_memory(self) -> int:
+        """
+        Estima la memoria ocupada por el índice en bytes.
+        """
+        total = sys.getsizeof(self.orden) + sys.getsizeof(self.en_orden)
+        total += sys.getsizeof(self.bits) + sys.getsizeof(self.ancestros)
+        total += sum(sys.getsizeof(mascara) for mascara in self.ancestros.values())
+        return total
+
+
+def contar_bits(mascara: int) -> int:
+    """
+    Cuenta los bits encendidos de un bitset.
+    """
+    return bin(mascara).count("1")
+
+
+def posiciones_bits(mascara: int) -> List[int]:
+    """
+    Obtiene las posiciones de los bits encendidos de un bitset, de menor a mayor.
+    """
+    posiciones = []
+    while mascara:
+        bajo = mascara & -mascara
+        posiciones.append(bajo.bit_length() - 1)
+        mascara ^= bajo
+    return posiciones
@@ -0,0 +1,161 @@
+import numpy as np
+from typing import List, Optional, Tuple
+
+from app.core.cierre import posiciones_bits
+from app.core.elegibilidad import IndiceElegibilidad
+
+
+class MatricesElegibilidad:
+    """
+    Representación matricial del índice de elegibilidad para calcular la
+    elegibilidad de una cohorte completa de estudiantes a la vez.
+
+    Las columnas siguen el orden de bits del índice (orden topológico). Las
+    relaciones se guardan dispersas, agrupadas por asignatura (como las
+    columnas de una matriz CSC), para que la memoria crezca con el número
+    de relaciones y no con n²:
+
+    - ``prerrequisitos``: para cada asignatura con prerrequisitos, las
+      columnas de sus prerrequisitos directos.
+    - ``grupos``: para cada asignatura con grupo de corequisitos, las
+      columnas de los miembros del grupo.
+    - ``creditos`` y ``req_creditos`` son vectores por asignatura.
+    """
+
+    def __init__(self, indice: IndiceElegibilidad):
+        """
+        Args:
+            indice: Índice de elegibilidad del grafo
+        """
+        self.orden: List[int] = indice.orden
+        self.columnas = {asignatura_id: i for i, asignatura_id in enumerate(self.orden)}
+        self.prerrequisitos = RelacionDispersa(indice.directos)
+        self.grupos = RelacionDispersa(indice.grupos)
+
+        self.creditos = np.array(indice.creditos, dtype=np.int64)
+        self.req_creditos = np.array(indice.req_creditos, dtype=np.int64)
+        self.creditos_totales = int(self.creditos.sum())
+
+    def elegibles(
+        self, aprobadas: np.ndarray, creditos: Optional[np.ndarray] = None
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Calcula la elegibilidad de varios estudiantes con operaciones matriciales.
+
+        Aplica las mismas reglas que IndiceElegibilidad.elegibles: todos los
+        prerrequisitos directos aprobados, créditos acumulados suficientes y
+        grupo de corequisitos pendiente completamente elegible.
+
+        Args:
+            aprobadas: Matriz booleana estudiantes x asignaturas (columnas en
+                el orden de ``self.orden``)
+            creditos: Vector de créditos acumulados por estudiante (por
+                defecto, la suma de los créditos de las aprobadas)
+
+        Returns:
+            Tupla (elegibles, creditos_restantes): matriz booleana estudiantes x
+            asignaturas y vector de créditos que faltan para completar el pensum
+        """
+        aprobadas = np.asarray(aprobadas, dtype=bool)
+        creditos_aprobados = aprobadas @ self.creditos
+        if creditos is None:
+            creditos = creditos_aprobados
+
+        pendientes = ~aprobadas
+        candidatas = (
+            pendientes
+            & ~self.prerrequisitos.alguna(pendientes)
+            & (self.req_creditos[None, :] <= np.asarray(creditos)[:, None])
+        )
+
+        elegibles = candidatas & ~self.grupos.alguna(pendientes & ~candidatas)
+
+        return elegibles, self.creditos_totales - creditos_aprobados
+
+    def matriz_aprobadas(self, estudiantes: List[List[int]]) -> np.ndarray:
+        """
+        Construye la matriz booleana de aprobadas a partir de listas de IDs
+        por estudiante. Los IDs que no pertenecen al grafo se ignoran.
+
+        Args:
+            estudiantes: Lista con los IDs aprobados de cada estudiante
+
+        Returns:
+            Matriz booleana estudiantes x asignaturas
+        """
+        columnas = self.columnas
+        matriz = np.zeros((len(estudiantes), len(self.orden)), dtype=bool)
+
+        for fila, aprobadas in enumerate(estudiantes):
+            indices = [columnas[a] for a in aprobadas if a in columnas]
+            matriz[fila, indices] = True
+
+        return matriz
+
+    def estimate_memory(self) -> int:
+        """
+        Estima la memoria ocupada por las matrices en bytes.
+        """
+        return (
+            self.prerrequisitos.estimate_memory()
+            + self.grupos.estimate_memory()
+            + self.creditos.nbytes
+            + self.req_creditos.nbytes
+        )
+
+
+class RelacionDispersa:
+    """
+    Relación entre columnas (j relacionada con i) guardada por columna de
+    destino: ``columnas`` son las asignaturas con al menos una relacionada,
+    ``inicios`` la posición donde empiezan sus relacionadas en ``origenes``.
+    """
+
+    def __init__(self, mascaras: List[int]):
+        """
+        Args:
+            mascaras: Bitset de las columnas relacionadas con cada columna
+        """
+        origenes: List[int] = []
+        columnas: List[int] = []
+        inicios: List[int] = []
+
+        for i, mascara in enumerate(mascaras):
+            if mascara:
+                columnas.append(i)
+                inicios.append(len(origenes))
+                origenes.extend(posiciones_bits(mascara))
+
+        self.n = len(mascaras)
+        self.origenes = np.array(origenes, dtype=np.intp)
+        self.columnas = np.array(columnas, dtype=np.intp)
+        self.inicios = np.array(inicios, dtype=np.intp)
+
+    def alguna(self, marcadas: np.ndarray) -> np.ndarray:
+        """
+        Indica, para cada fila y columna, si alguna de sus relacionadas está
+        marcada.
+
+        Args:
+            marcadas: Matriz booleana filas x columnas
+
+        Returns:
+            Matriz booleana filas x columnas
+        """
+        # Se opera sobre la transpuesta empaquetada en bits: cada columna
+        # relacionada es una fila contigua de filas/8 bytes
+        filas = marcadas.shape[0]
+        empaquetadas = np.packbits(marcadas.T, axis=1)
+        resultado = np.zeros((self.n, empaquetadas.shape[1]), dtype=np.uint8)
+        if len(self.origenes) and filas:
+            resultado[self.columnas] = np.bitwise_or.reduceat(
+                empaquetadas[self.origenes], self.inicios, axis=0
+            )
+        return np.unpackbits(resultado, axis=1, count=filas).T.view(bool)
+
+    def estimate_memory(self) -> int:
+        """
+        Estima la memoria ocupada por la relación en bytes.
+        """
+        return self.origenes.nbytes + self.columnas.nbytes + self.inicios.nbytes
+
@@ -0,0 +1,135 @@
+import sys
+from typing import Callable, Dict, Iterable, List
+
+
+class UnionFind:
+    """
+    Estructura de conjuntos disjuntos con unión por rango y compresión de
+    caminos.
+    """
+
+    def __init__(self, elementos: Iterable[int]):
+        self.padre: Dict[int, int] = {e: e for e in elementos}
+        self.rango: Dict[int, int] = dict.fromkeys(self.padre, 0)
+
+    def find(self, elemento: int) -> int:
+        padre = self.padre
+        raiz = elemento
+        while padre[raiz] != raiz:
+            raiz = padre[raiz]
+
+        while padre[elemento] != raiz:
+            padre[elemento], elemento = raiz, padre[elemento]
+
+        return raiz
+
+    def union(self, a: int, b: int) -> None:
+        raiz_a, raiz_b = self.find(a), self.find(b)
+        if raiz_a == raiz_b:
+            return
+
+        if self.rango[raiz_a] < self.rango[raiz_b]:
+            raiz_a, raiz_b = raiz_b, raiz_a
+        self.padre[raiz_b] = raiz_a
+        if self.rango[raiz_a] == self.rango[raiz_b]:
+            self.rango[raiz_a] += 1
+
+
+class CondensacionCorequisitos:
+    """
+    Condensación de los grupos de corequisitos del grafo.
+
+    Las asignaturas unidas por cadenas de corequisitos (directas o
+    transitivas) se cursan en el mismo trimestre, por lo que se agrupan con
+    union-find en un súper nodo. Cada grupo se identifica con su primera
+    asignatura en orden de inserción (el representante), y sus
+    prerrequisitos y dependientes son la unión de los de sus miembros.
+
+    Si un miembro tiene como prerrequisito a otro miembro del mismo grupo,
+    el súper nodo queda con un lazo: el grupo no se puede cursar y se trata
+    como un ciclo.
+    """
+
+    def __init__(
+        self,
+        ids: List[int],
+        predecesores: Callable[[int], Iterable[int]],
+        sucesores: Callable[[int], Iterable[int]],
+        vecinos_corequisito: Callable[[int], Iterable[int]],
+    ):
+        """
+        Args:
+            ids: IDs de todas las asignaturas del grafo, en orden de inserción
+            predecesores: Función que devuelve los prerrequisitos directos de un ID
+            sucesores: Función que devuelve los dependientes directos de un ID
+            vecinos_corequisito: Función que devuelve los corequisitos de un ID
+        """
+        conjuntos = UnionFind(ids)
+        for asignatura_id in ids:
+            for co_id in vecinos_corequisito(asignatura_id):
+                conjuntos.union(asignatura_id, co_id)
+
+        self.representante: Dict[int, int] = {}
+        self.miembros: Dict[int, List[int]] = {}
+        por_raiz: Dict[int, int] = {}
+
+        for asignatura_id in ids:
+            raiz = conjuntos.find(asignatura_id)
+            representante = por_raiz.setdefault(raiz, asignatura_id)
+            self.representante[asignatura_id] = representante
+            self.miembros.setdefault(representante, []).append(asignatura_id)
+
+        self.representantes: List[int] = list(self.miembros)
+        self._predecesores = self._condensar(predecesores)
+        self._sucesores = self._condensar(sucesores)
+
+    def _condensar(
+        self, vecinos: Callable[[int], Iterable[int]]
+    ) -> Dict[int, List[int]]:
+        representante = self.representante
+        condensados = {}
+
+        for grupo, miembros in self.miembros.items():
+            if len(miembros) == 1:
+                # Varios vecinos pueden pertenecer al mismo grupo
+                condensados[grupo] = list(
+                    dict.fromkeys(representante[vecino] for vecino in vecinos(grupo))
+                )
+                continue
+
+            vistos = {}
+            for miembro in miembros:
+                for vecino in vecinos(miembro):
+                    vistos.setdefault(representante[vecino], None)
+            condensados[grupo] = list(vistos)
+
+        return condensados
+
+    def predecesores(self, grupo: int) -> List[int]:
+        """
+        Representantes de los grupos que son prerrequisito directo del grupo.
+        """
+        return self._predecesores[grupo]
+
+    def sucesores(self, grupo: int) -> List[int]:
+        """
+        Representantes de los grupos que dependen directamente del grupo.
+        """
+        return self._sucesores[grupo]
+
+    def expandir(self, grupos: Iterable[int]) -> List[int]:
+        """
+        Convierte una secuencia de representantes en los IDs de todos sus
+        miembros, conservando el orden de los grupos.
+        """
+        miembros = self.miembros
+        return [asignatura_id for grupo in grupos for asignatura_id in miembros[grupo]]
+
+    def estimate_memory(self) -> int:
+        """
+        Estima la memoria ocupada por la condensación en bytes.
+        """
+        total = sys.getsizeof(self.representante) + sys.getsizeof(self.miembros)
+        for adyacencia in (self.miembros, self._predecesores, self._sucesores):
+            total += sum(sys.getsizeof(v) for v in adyacencia.values())
+        return total
@@ -1,3 +1,5 @@
+from typing import Optional
+
 from pydantic_settings import BaseSettings
 
 
@@ -10,6 +12,33 @@ class Settings(BaseSettings):
     API_VERSION: str = "0.1.0"
 
     DATABASE_URL: str = "sqlite:///./ruta_academica.db"
+    # URL del motor asíncrono de las rutas de solo lectura; por defecto,
+    # DATABASE_URL con el driver asíncrono equivalente (aiosqlite o asyncpg)
+    DATABASE_ASYNC_URL: Optional[str] = None
+    # Sirve los listados y detalles con la sesión asíncrona; si se desactiva,
+    # sus consultas usan la sesión síncrona en el threadpool
+    RUTAS_ASINCRONAS: bool = True
+
+    # Motor del grafo de asignaturas: "networkx" o "csr" (arreglos compactos)
+    GRAFO_BACKEND: str = "networkx"
+    # Origen de las rutas: "memoria" (grafo completo del pensum en caché),
+    # "tabla" (subgrafo de la ruta a partir de la tabla asignatura_ancestros),
+    # "cte" (subgrafo de la ruta con una consulta recursiva) o "auto"
+    GRAFO_MOTOR: str = "memoria"
+    # Con "auto", tamaño máximo del pensum para cargarlo completo en memoria
+    GRAFO_AUTO_MAX_ASIGNATURAS: int = 2000
+    # Límites de la enumeración de ciclos elementales en los reportes de ciclos
+    CICLOS_MAX_ENUMERADOS: int = 50
+    CICLOS_TIEMPO_LIMITE: float = 0.5
+    GRAFO_CACHE_MAX_ENTRADAS: int = 32
+    GRAFO_CACHE_MAX_BYTES: int = 64 * 1024 * 1024
+    MALLA_CACHE_MAX_ENTRADAS: int = 32
+    MALLA_CACHE_MAX_BYTES: int = 16 * 1024 * 1024
+    # Caché de respuestas ya serializadas de las rutas y los niveles
+    RESPUESTAS_CACHE_MAX_ENTRADAS: int = 512
+    RESPUESTAS_CACHE_MAX_BYTES: int = 32 * 1024 * 1024
+    # Guarda también las respuestas comprimidas con gzip para los clientes que lo aceptan
+    RESPUESTAS_GZIP: bool = True
 
     class Config:
         env_file = ".env"
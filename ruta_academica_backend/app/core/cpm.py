@@ -0,0 +1,99 @@
+import sys
+from typing import Dict, List
+
+from app.core.cierre import posiciones_bits
+from app.core.elegibilidad import IndiceElegibilidad
+from app.core.planificador import alturas, profundidades
+
+
+class AnalisisCPM:
+    """
+    Análisis de camino crítico (CPM) del pensum completo, midiendo el
+    tiempo en trimestres y suponiendo que cada asignatura dura uno.
+
+    Para cada asignatura se calcula:
+
+    - ``inicio_temprano``: primer trimestre en que se puede cursar, uno más
+      que la cadena de prerrequisitos más larga que llega a ella.
+    - ``inicio_tardio``: último trimestre en que se puede cursar sin alargar
+      la carrera, ``duracion - altura + 1``, donde la altura es la cadena de
+      dependientes más larga que sale de ella.
+    - ``holgura``: diferencia entre ambos; las asignaturas con holgura cero
+      forman el camino crítico.
+
+    Los grupos de corequisitos se tratan como una unidad que se cursa en el
+    mismo trimestre.
+    """
+
+    def __init__(self, indice: IndiceElegibilidad):
+        """
+        Args:
+            indice: Índice de elegibilidad del grafo (sin ciclos)
+        """
+        todas = (1 << len(indice.orden)) - 1
+        temprano = profundidades(indice, todas)
+        altura = alturas(indice, todas)
+
+        self.duracion = max(temprano.values(), default=0)
+        self.inicio_temprano: Dict[int, int] = {}
+        self.inicio_tardio: Dict[int, int] = {}
+        self.holgura: Dict[int, int] = {}
+
+        for bit, asignatura_id in enumerate(indice.orden):
+            tardio = self.duracion - altura[bit] + 1
+            self.inicio_temprano[asignatura_id] = temprano[bit]
+            self.inicio_tardio[asignatura_id] = tardio
+            self.holgura[asignatura_id] = tardio - temprano[bit]
+
+        self.cadena_critica = self._cadena_critica(indice)
+
+    def _cadena_critica(self, indice: IndiceElegibilidad) -> List[int]:
+        """
+        Construye una cadena de asignaturas críticas que va del primer al
+        último trimestre, siguiendo prerrequisitos directos con holgura cero.
+        Cuando hay varias opciones se elige la primera en orden topológico.
+        """
+        orden = indice.orden
+        criticas = [
+            bit
+            for bit, asignatura_id in enumerate(orden)
+            if self.holgura[asignatura_id] == 0
+        ]
+
+        actual = next(
+            (bit for bit in criticas if self.inicio_temprano[orden[bit]] == 1), None
+        )
+        cadena = []
+
+        while actual is not None:
+            cadena.append(orden[actual])
+            siguiente_trimestre = self.inicio_temprano[orden[actual]] + 1
+            actual = next(
+                (
+                    sucesor
+                    for sucesor in sorted(
+                        s
+                        for miembro in posiciones_bits(indice.grupos[actual])
+                        for s in indice.sucesores[miembro]
+                    )
+                    if self.holgura[orden[sucesor]] == 0
+                    and self.inicio_temprano[orden[sucesor]] == siguiente_trimestre
+                ),
+                None,
+            )
+
+        return cadena
+
+    def estimate_memory(self) -> int:
+        """
+        Estima la memoria ocupada por el análisis en bytes.
+        """
+        return sum(
+            sys.getsizeof(valores)
+            for valores in (
+                self.inicio_temprano,
+                self.inicio_tardio,
+                self.holgura,
+                self.cadena_critica,
+            )
+        )
@@ -0,0 +1,227 @@
+import sys
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+from app.core.cierre import CierreTransitivo, posiciones_bits
+from app.core.condensacion import CondensacionCorequisitos
+
+
+class IndiceElegibilidad:
+    """
+    Índice para calcular qué asignaturas puede inscribir un estudiante a
+    partir de las que ya aprobó.
+
+    Las asignaturas se numeran siguiendo el orden topológico del cierre
+    transitivo (que se calcula sobre los grupos de corequisitos
+    condensados), expandiendo cada grupo en sus miembros; así los miembros
+    de un grupo ocupan bits contiguos. Cada asignatura tiene un bitset con
+    sus prerrequisitos directos, otro con su grupo de corequisitos y otro con
+    todas las asignaturas que requiere su grupo. Los créditos, el requisito
+    de créditos y los dependientes directos se guardan en listas indexadas
+    por bit, de modo que una consulta solo hace operaciones sobre enteros.
+    """
+
+    def __init__(
+        self,
+        cierre: CierreTransitivo,
+        condensacion: CondensacionCorequisitos,
+        datos: Callable[[int], Dict],
+        predecesores: Callable[[int], Iterable[int]],
+    ):
+        """
+        Args:
+            cierre: Índice de cierre transitivo de los grupos condensados
+            condensacion: Condensación de los grupos de corequisitos
+            datos: Función que devuelve los datos de una asignatura
+            predecesores: Función que devuelve los prerrequisitos directos de un ID
+        """
+        self.cierre = cierre
+        self.condensacion = condensacion
+        self.orden: List[int] = condensacion.expandir(cierre.orden)
+        self.bits: Dict[int, int] = {
+            asignatura_id: bit for bit, asignatura_id in enumerate(self.orden)
+        }
+        self.codigos: Dict[str, int] = {}
+
+        n = len(self.orden)
+        self.directos: List[int] = [0] * n
+        self.grupos: List[int] = [0] * n
+        self.ancestros: List[int] = [0] * n
+        self.creditos: List[int] = [0] * n
+        self.req_creditos: List[int] = [0] * n
+
+        for bit, asignatura_id in enumerate(self.orden):
+            data = datos(asignatura_id)
+            self.codigos.setdefault(data["codigo"], asignatura_id)
+            self.creditos[bit] = data.get("creditos") or 0
+            self.req_creditos[bit] = data.get("req_creditos") or 0
+
+            mascara = 0
+            for pre_id in predecesores(asignatura_id):
+                mascara |= 1 << self.bits[pre_id]
+            self.directos[bit] = mascara
+
+        # Bitset de asignaturas de cada grupo, indexado por bit del cierre
+        self.mascaras_grupo: List[int] = []
+        for grupo in cierre.orden:
+            mascara = 0
+            for miembro in condensacion.miembros[grupo]:
+                mascara |= 1 << self.bits[miembro]
+            self.mascaras_grupo.append(mascara)
+            for miembro in condensacion.miembros[grupo]:
+                self.grupos[self.bits[miembro]] = mascara
+
+        for grupo in cierre.orden:
+            ancestros = 0
+            for ancestro_bit in posiciones_bits(cierre.ancestros[grupo]):
+                ancestros |= self.mascaras_grupo[ancestro_bit]
+            for miembro in condensacion.miembros[grupo]:
+                self.ancestros[self.bits[miembro]] = ancestros
+
+        self.sucesores: List[List[int]] = [[] for _ in range(n)]
+        for bit, mascara in enumerate(self.directos):
+            for pre_bit in posiciones_bits(mascara):
+                self.sucesores[pre_bit].append(bit)
+
+        self.con_corequisitos = 0
+        for bit, grupo in enumerate(self.grupos):
+            if grupo != 1 << bit:
+                self.con_corequisitos |= 1 << bit
+
+    def ids(self, mascara: int) -> List[int]:
+        """
+        Convierte un bitset en la lista de IDs, en orden topológico.
+        """
+        orden = self.orden
+        resultado = []
+
+        while mascara:
+            bajo = mascara & -mascara
+            resultado.append(orden[bajo.bit_length() - 1])
+            mascara ^= bajo
+
+        return resultado
+
+    def resolver(
+        self,
+        asignatura_ids: Iterable[int] = (),
+        codigos: Iterable[str] = (),
+    ) -> Tuple[int, List]:
+        """
+        Convierte IDs y códigos de asignaturas en un bitset.
+
+        Args:
+            asignatura_ids: IDs de asignaturas
+            codigos: Códigos de asignaturas
+
+        Returns:
+            Tupla (bitset, no_encontradas) con los IDs o códigos que no
+            pertenecen al grafo
+        """
+        mascara = 0
+        no_encontradas = []
+
+        for asignatura_id in asignatura_ids:
+            bit = self.bits.get(asignatura_id)
+            if bit is None:
+                no_encontradas.append(asignatura_id)
+            else:
+                mascara |= 1 << bit
+
+        for codigo in codigos:
+            asignatura_id = self.codigos.get(codigo.upper())
+            if asignatura_id is None:
+                no_encontradas.append(codigo)
+            else:
+                mascara |= 1 << self.bits[asignatura_id]
+
+        return mascara, no_encontradas
+
+    def creditos_de(self, mascara: int) -> int:
+        """
+        Suma los créditos de las asignaturas de un bitset.
+        """
+        creditos = self.creditos
+        total = 0
+
+        while mascara:
+            bajo = mascara & -mascara
+            total += creditos[bajo.bit_length() - 1]
+            mascara ^= bajo
+
+        return total
+
+    def elegibles(self, aprobadas: int, creditos: Optional[int] = None) -> int:
+        """
+        Calcula el bitset de asignaturas que se pueden inscribir.
+
+        Una asignatura es elegible si no está aprobada, todos sus
+        prerrequisitos directos están aprobados y los créditos acumulados
+        alcanzan su requisito de créditos. Si tiene corequisitos, todo su
+        grupo de corequisitos pendiente debe ser elegible, ya que se cursa
+        en el mismo trimestre.
+
+        Args:
+            aprobadas: Bitset de asignaturas aprobadas
+            creditos: Créditos acumulados (por defecto, los de las aprobadas)
+
+        Returns:
+            Bitset de asignaturas elegibles
+        """
+        if creditos is None:
+            creditos = self.creditos_de(aprobadas)
+
+        directos = self.directos
+        req_creditos = self.req_creditos
+        candidatas = 0
+
+        for bit in range(len(self.orden)):
+            marca = 1 << bit
+            if (
+                not aprobadas & marca
+                and not directos[bit] & ~aprobadas
+                and req_creditos[bit] <= creditos
+            ):
+                candidatas |= marca
+
+        return self.filtrar_grupos(candidatas, aprobadas)
+
+    def filtrar_grupos(self, candidatas: int, aprobadas: int) -> int:
+        """
+        Descarta las candidatas cuyo grupo de corequisitos pendiente no es
+        completamente elegible.
+
+        Args:
+            candidatas: Bitset de asignaturas candidatas
+            aprobadas: Bitset de asignaturas aprobadas
+
+        Returns:
+            Bitset de candidatas con sus grupos completos
+        """
+        revisar = candidatas & self.con_corequisitos
+        grupos = self.grupos
+
+        while revisar:
+            bajo = revisar & -revisar
+            grupo = grupos[bajo.bit_length() - 1]
+            if grupo & ~aprobadas & ~candidatas:
+                candidatas &= ~grupo
+            revisar &= ~grupo
+
+        return candidatas
+
+    def estimate_memory(self) -> int:
+        """
+        Estima la memoria ocupada por el índice en bytes.
+        """
+        total = sys.getsizeof(self.codigos) + sys.getsizeof(self.bits)
+        for valores in (
+            self.directos,
+            self.grupos,
+            self.ancestros,
+            self.creditos,
+            self.req_creditos,
+        ):
+            total += sys.getsizeof(valores) + sum(sys.getsizeof(v) for v in valores)
+        total += sum(sys.getsizeof(s) for s in self.sucesores)
+        return total
+
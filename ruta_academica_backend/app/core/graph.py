@@ -1,108 +1,343 @@
+import sys
+import threading
+from abc import ABC, abstractmethod
+import time
 import networkx as nx
-from typing import Dict, List, Tuple, Any, Set
+from typing import Callable, Dict, Iterable, List, Optional, Tuple, Any, Set
 from collections import deque
 
+from app.core.ciclos import componentes_fuertes, enumerar_ciclos
+from app.core.cierre import CierreTransitivo, contar_bits
+from app.core.cohorte import MatricesElegibilidad
+from app.core.condensacion import CondensacionCorequisitos
+from app.core.cpm import AnalisisCPM
+from app.core.elegibilidad import IndiceElegibilidad
+from app.core.impacto import ImpactoDescendientes
 
-class AsignaturaGrafo:
+
+_lock_indices = threading.RLock()
+
+
+class AsignaturaGrafoBase(ABC):
     """
-    Clase para manejar el grafo de asignaturas y sus prerrequisitos.
+    Algoritmos comunes sobre el grafo de asignaturas.
+
+    Las implementaciones concretas (networkx o arreglos CSR) solo deben
+    proveer el acceso a nodos y adyacencias (los métodos abstractos); los
+    recorridos se definen aquí para que ambos motores produzcan exactamente
+    los mismos resultados.
     """
 
-    def __init__(self):
-        self.prerrequisitos_graph = nx.DiGraph()
-        self.corequisitos_graph = nx.Graph()
-        self.combined_graph = nx.DiGraph()
+    @abstractmethod
+    def __contains__(self, asignatura_id: int) -> bool:
+        raise NotImplementedError
 
-    def add_asignatura(
-        self, asignatura_id: int, asignatura_data: Dict[str, Any]
-    ) -> None:
+    @abstractmethod
+    def __len__(self) -> int:
+        raise NotImplementedError
+
+    @abstractmethod
+    def get_asignatura_ids(self) -> List[int]:
         """
-        Agrega una asignatura al grafo.
+        Obtiene los IDs de todas las asignaturas del grafo en orden de inserción.
+        """
+        raise NotImplementedError
+
+    @abstractmethod
+    def get_asignatura(self, asignatura_id: int) -> Dict[str, Any]:
+        """
+        Obtiene los datos de una asignatura (código, nombre, créditos, etc.).
+        """
+        raise NotImplementedError
+
+    @abstractmethod
+    def _predecesores(self, asignatura_id: int) -> Iterable[int]:
+        """
+        IDs de los prerrequisitos directos de una asignatura.
+        """
+        raise NotImplementedError
+
+    @abstractmethod
+    def _sucesores(self, asignatura_id: int) -> Iterable[int]:
+        """
+        IDs de las asignaturas que tienen a esta como prerrequisito directo.
+        """
+        raise NotImplementedError
+
+    @abstractmethod
+    def _vecinos_corequisito(self, asignatura_id: int) -> Iterable[int]:
+        """
+        IDs de los corequisitos de una asignatura.
+        """
+        raise NotImplementedError
+
+    @abstractmethod
+    def estimate_memory(self) -> int:
+        """
+        Estima la memoria ocupada por el grafo en bytes.
+        """
+        raise NotImplementedError
+
+    def _estimate_indices_memory(self) -> int:
+        """
+        Estima la memoria de los índices derivados (como el cierre
+        transitivo), que se construyen después de almacenar el grafo en
+        caché. Se reserva el tamaño de un bitset de n bits por asignatura y
+        el del índice de cohortes (MatricesElegibilidad): una entrada por
+        prerrequisito y por miembro de cada grupo de corequisitos (el propio
+        y sus corequisitos) y los vectores por asignatura.
+        """
+        asignatura_ids = self.get_asignatura_ids()
+        n = len(asignatura_ids)
+        relaciones = sum(
+            1
+            + sum(1 for _ in self._predecesores(asignatura_id))
+            + sum(1 for _ in self._vecinos_corequisito(asignatura_id))
+            for asignatura_id in asignatura_ids
+        )
+
+        bitsets = n * (sys.getsizeof(0) + n // 8)
+        # Índices y columnas (intp) de las relaciones dispersas, y los
+        # vectores de créditos (int64) por asignatura
+        cohorte = 8 * relaciones + 2 * 8 * 2 * n + 2 * 8 * n
+        return bitsets + cohorte
+
+    def get_sucesores(self, asignatura_id: int) -> List[int]:
+        """
+        Obtiene los IDs de las asignaturas que requieren directamente a esta.
 
         Args:
             asignatura_id: ID de la asignatura
-            asignatura_data: Datos de la asignatura (nombre, código, etc.)
+
+        Returns:
+            Lista de IDs de asignaturas dependientes directas
         """
-        self.prerrequisitos_graph.add_node(asignatura_id, **asignatura_data)
-        self.corequisitos_graph.add_node(asignatura_id, **asignatura_data)
-        self.combined_graph.add_node(asignatura_id, **asignatura_data)
+        if asignatura_id not in self:
+            return []
 
-    def add_prerequisito(self, asignatura_id: int, prerequisito_id: int) -> None:
+        return list(self._sucesores(asignatura_id))
+
+    _condensacion: Optional[CondensacionCorequisitos] = None
+    _cierre: Optional[CierreTransitivo] = None
+    _elegibilidad: Optional[IndiceElegibilidad] = None
+    _matrices_elegibilidad: Optional[MatricesElegibilidad] = None
+    _cpm: Optional[AnalisisCPM] = None
+    _impacto: Optional[ImpactoDescendientes] = None
+    _reporte_ciclos: Optional[Dict[str, Any]] = None
+
+    def _obtener_indice(self, atributo: str, construir: Callable[[], Any]) -> Any:
         """
-        Agrega un prerrequisito entre dos asignaturas.
+        Devuelve un índice derivado almacenado en la instancia, construyéndolo
+        la primera vez que se consulta. Como el grafo se comparte desde la
+        caché, cada índice se construye una sola vez por grafo.
 
         Args:
-            asignatura_id: ID de la asignatura
-            prerequisito_id: ID del prerrequisito
+            atributo: Nombre del atributo donde se almacena el índice
+            construir: Función que construye el índice
 
-        Nota: La dirección de la arista es: prerequisito -> asignatura
-              Esto significa que el prerrequisito debe ser cursado antes de la asignatura
+        Returns:
+            El índice
         """
-        self.prerrequisitos_graph.add_edge(prerequisito_id, asignatura_id)
-        self.combined_graph.add_edge(
-            prerequisito_id, asignatura_id, tipo="prerequisito"
+        indice = getattr(self, atributo)
+        if indice is None:
+            with _lock_indices:
+                indice = getattr(self, atributo)
+                if indice is None:
+                    indice = construir()
+                    setattr(self, atributo, indice)
+        return indice
+
+    @property
+    def condensacion(self) -> CondensacionCorequisitos:
+        """
+        Grupos de corequisitos condensados en súper nodos (union-find).
+        """
+        return self._obtener_indice(
+            "_condensacion",
+            lambda: CondensacionCorequisitos(
+                self.get_asignatura_ids(),
+                self._predecesores,
+                self._sucesores,
+                self._vecinos_corequisito,
+            ),
         )
 
-    def add_corequisito(self, asignatura_id: int, corequisito_id: int) -> None:
+    @property
+    def cierre(self) -> CierreTransitivo:
         """
-        Agrega un corequisito entre dos asignaturas.
+        Índice de cierre transitivo de los prerrequisitos, calculado sobre el
+        grafo condensado: sus IDs son los representantes de cada grupo de
+        corequisitos.
+        """
+        return self._obtener_indice(
+            "_cierre",
+            lambda: CierreTransitivo(
+                self.condensacion.representantes,
+                self.condensacion.predecesores,
+                self.condensacion.sucesores,
+            ),
+        )
+
+    @property
+    def elegibilidad(self) -> IndiceElegibilidad:
+        """
+        Índice de elegibilidad (prerrequisitos directos, grupos de
+        corequisitos y créditos por asignatura).
+        """
+        return self._obtener_indice(
+            "_elegibilidad",
+            lambda: IndiceElegibilidad(
+                self.cierre,
+                self.condensacion,
+                self.get_asignatura,
+                self._predecesores,
+            ),
+        )
+
+    @property
+    def matrices_elegibilidad(self) -> MatricesElegibilidad:
+        """
+        Matrices de prerrequisitos directos y grupos de corequisitos para
+        calcular la elegibilidad de una cohorte completa con NumPy.
+        """
+        return self._obtener_indice(
+            "_matrices_elegibilidad",
+            lambda: MatricesElegibilidad(self.elegibilidad),
+        )
+
+    @property
+    def cpm(self) -> AnalisisCPM:
+        """
+        Análisis de camino crítico del pensum (inicio temprano, inicio
+        tardío y holgura de cada asignatura). Requiere un grafo sin ciclos.
+        """
+        return self._obtener_indice("_cpm", lambda: AnalisisCPM(self.elegibilidad))
+
+    @property
+    def impacto(self) -> ImpactoDescendientes:
+        """
+        Índice de asignaturas bloqueadas (descendientes y corequisitos) por
+        cada asignatura, con el ranking del pensum.
+        """
+        return self._obtener_indice(
+            "_impacto", lambda: ImpactoDescendientes(self.elegibilidad)
+        )
+
+    def reset_indices(self) -> None:
+        """
+        Descarta los índices derivados; se reconstruyen en la próxima consulta.
+        """
+        self._condensacion = None
+        self._cierre = None
+        self._elegibilidad = None
+        self._matrices_elegibilidad = None
+        self._cpm = None
+        self._impacto = None
+        self._reporte_ciclos = None
+
+    def get_ancestros(self, asignatura_id: int) -> List[int]:
+        """
+        Obtiene los IDs de todas las asignaturas requeridas, directa o
+        indirectamente, para cursar una asignatura, en orden topológico, a
+        partir del índice de cierre.
+
+        Como los corequisitos se cursan juntos, incluye los prerrequisitos de
+        los corequisitos de la asignatura y los grupos de corequisitos
+        completos de cada prerrequisito, pero no el propio grupo de la
+        asignatura.
 
         Args:
             asignatura_id: ID de la asignatura
-            corequisito_id: ID del corequisito
 
-        Nota: Los corequisitos son bidireccionales (no dirigidos)
-              Esto significa que ambas asignaturas deben cursarse simultáneamente
+        Returns:
+            Lista de IDs de los prerrequisitos
         """
-        self.corequisitos_graph.add_edge(asignatura_id, corequisito_id)
-        self.combined_graph.add_edge(asignatura_id, corequisito_id, tipo="corequisito")
-        self.combined_graph.add_edge(corequisito_id, asignatura_id, tipo="corequisito")
+        if asignatura_id not in self:
+            return []
 
-    def get_all_prerequisitos_bfs(
-        self, asignatura_id: int
-    ) -> List[Tuple[int, Dict[str, Any]]]:
+        condensacion = self.condensacion
+        cierre = self.cierre
+        grupo = condensacion.representante[asignatura_id]
+
+        return condensacion.expandir(cierre.ids(cierre.ancestros[grupo]))
+
+    def es_prerequisito_de(self, prerequisito_id: int, asignatura_id: int) -> bool:
         """
-        Obtiene todos los prerrequisitos de una asignatura utilizando BFS,
-        incluyendo prerrequisitos indirectos.
+        Indica si una asignatura es requerida (directa o indirectamente)
+        para cursar otra.
+
+        Args:
+            prerequisito_id: ID de la posible asignatura requerida
+            asignatura_id: ID de la asignatura objetivo
+
+        Returns:
+            True si prerequisito_id es prerrequisito de asignatura_id
+        """
+        if prerequisito_id not in self or asignatura_id not in self:
+            return False
+
+        representante = self.condensacion.representante
+        cierre = self.cierre
+        return bool(
+            cierre.ancestros[representante[asignatura_id]]
+            >> cierre.bits[representante[prerequisito_id]]
+            & 1
+        )
+
+    def contar_prerequisitos(self, asignatura_id: int) -> int:
+        """
+        Cuenta las asignaturas requeridas, directa o indirectamente, para
+        cursar una asignatura.
 
         Args:
             asignatura_id: ID de la asignatura
 
         Returns:
-            Lista de tuplas (id_prerrequisito, datos) para todos los prerrequisitos necesarios
+            Número de asignaturas requeridas
         """
-        if asignatura_id not in self.prerrequisitos_graph.nodes:
-            return []
+        if asignatura_id not in self:
+            return 0
 
-        visited = set()
-        all_prerequisites = []
-        queue = deque([asignatura_id])
+        elegibilidad = self.elegibilidad
+        return contar_bits(elegibilidad.ancestros[elegibilidad.bits[asignatura_id]])
 
-        while queue:
-            current_id = queue.popleft()
+    def get_all_prerequisitos_ids(self, asignatura_id: int) -> List[int]:
+        """
+        Obtiene los IDs de todos los prerrequisitos de una asignatura,
+        incluyendo prerrequisitos indirectos y los corequisitos de estos.
+
+        Equivale a get_ancestros: el cierre se calcula sobre los grupos de
+        corequisitos condensados y se expande a sus miembros, por lo que las
+        cadenas de corequisitos se incluyen completas.
 
-            if current_id != asignatura_id:
-                pre_data = self.prerrequisitos_graph.nodes[current_id]
-                all_prerequisites.append((current_id, pre_data))
+        Args:
+            asignatura_id: ID de la asignatura
 
-            for pre_id in self.prerrequisitos_graph.predecessors(current_id):
-                if pre_id not in visited:
-                    visited.add(pre_id)
-                    queue.append(pre_id)
+        Returns:
+            Lista de IDs de todos los prerrequisitos necesarios
+        """
+        return self.get_ancestros(asignatura_id)
 
-        all_required_ids = set(prereq_id for prereq_id, _ in all_prerequisites)
-        additional_coreqs = []
+    def get_all_prerequisitos_bfs(
+        self, asignatura_id: int
+    ) -> List[Tuple[int, Dict[str, Any]]]:
+        """
+        Obtiene todos los prerrequisitos de una asignatura, incluyendo
+        prerrequisitos indirectos y los corequisitos de estos.
 
-        for pre_id, _ in all_prerequisites:
-            for co_id in self.corequisitos_graph.neighbors(pre_id):
-                if co_id not in all_required_ids and co_id != asignatura_id:
-                    all_required_ids.add(co_id)
-                    co_data = self.corequisitos_graph.nodes[co_id]
-                    additional_coreqs.append((co_id, co_data))
+        Conserva el nombre histórico, pero ya no ejecuta un BFS por consulta:
+        usa el índice de cierre transitivo del grafo.
 
-        all_prerequisites.extend(additional_coreqs)
+        Args:
+            asignatura_id: ID de la asignatura
 
-        return all_prerequisites
+        Returns:
+            Lista de tuplas (id_prerrequisito, datos) para todos los prerrequisitos necesarios
+        """
+        return [
+            (pre_id, self.get_asignatura(pre_id))
+            for pre_id in self.get_all_prerequisitos_ids(asignatura_id)
+        ]
 
     def get_direct_prerequisitos(
         self, asignatura_id: int
@@ -116,12 +351,12 @@ class AsignaturaGrafo:
         Returns:
             Lista de tuplas (id_prerrequisito, datos) para los prerrequisitos directos
         """
-        if asignatura_id not in self.prerrequisitos_graph.nodes:
+        if asignatura_id not in self:
             return []
 
         prerequisitos = []
-        for pre_id in self.prerrequisitos_graph.predecessors(asignatura_id):
-            pre_data = self.prerrequisitos_graph.nodes[pre_id]
+        for pre_id in self._predecesores(asignatura_id):
+            pre_data = self.get_asignatura(pre_id)
             prerequisitos.append((pre_id, pre_data))
 
         return prerequisitos
@@ -136,12 +371,12 @@ class AsignaturaGrafo:
         Returns:
             Lista de tuplas (id_corequisito, datos) para todos los corequisitos
         """
-        if asignatura_id not in self.corequisitos_graph.nodes:
+        if asignatura_id not in self:
             return []
 
         corequisitos = []
-        for co_id in self.corequisitos_graph.neighbors(asignatura_id):
-            co_data = self.corequisitos_graph.nodes[co_id]
+        for co_id in self._vecinos_corequisito(asignatura_id):
+            co_data = self.get_asignatura(co_id)
             corequisitos.append((co_id, co_data))
 
         return corequisitos
@@ -156,9 +391,9 @@ class AsignaturaGrafo:
         Returns:
             True si hay ciclos, False en caso contrario
         """
-        in_degree = {node: 0 for node in self.prerrequisitos_graph.nodes()}
-        for node in self.prerrequisitos_graph.nodes():
-            for successor in self.prerrequisitos_graph.successors(node):
+        in_degree = {node: 0 for node in self.get_asignatura_ids()}
+        for node in in_degree:
+            for successor in self._sucesores(node):
                 in_degree[successor] += 1
 
         queue = deque([node for node, degree in in_degree.items() if degree == 0])
@@ -169,82 +404,441 @@ class AsignaturaGrafo:
             current = queue.popleft()
             visited_count += 1
 
-            for neighbor in self.prerrequisitos_graph.successors(current):
+            for neighbor in self._sucesores(current):
                 in_degree[neighbor] -= 1
                 if in_degree[neighbor] == 0:
                     queue.append(neighbor)
 
-        return visited_count != len(self.prerrequisitos_graph.nodes())
+        return visited_count != len(in_degree)
 
-    def get_cycles_bfs(self) -> List[List[int]]:
+    def get_componentes_ciclicas(self) -> List[List[int]]:
         """
-        Obtiene los ciclos en el grafo de prerrequisitos utilizando BFS.
+        Obtiene las componentes fuertemente conexas que contienen ciclos,
+        en tiempo lineal (algoritmo de Tarjan) sobre el grafo condensado.
 
-        Esta implementación detecta los ciclos encontrando los nodos
-        que no pueden ser incluidos en un ordenamiento topológico y
-        luego busca los ciclos específicos con BFS adicionales.
+        Una componente es cíclica si tiene más de un grupo de corequisitos o
+        si el grupo es prerrequisito de sí mismo (una asignatura que se
+        requiere a sí misma, o que requiere a uno de sus corequisitos).
 
         Returns:
-            Lista de ciclos, donde cada ciclo es una lista de IDs de asignaturas
+            Lista de componentes; cada componente es una lista de IDs de asignaturas
         """
-        in_degree = {node: 0 for node in self.prerrequisitos_graph.nodes()}
-        for node in self.prerrequisitos_graph.nodes():
-            for successor in self.prerrequisitos_graph.successors(node):
-                in_degree[successor] += 1
-
-        queue = deque([node for node, degree in in_degree.items() if degree == 0])
-
-        topological_sorted = []
+        condensacion = self.condensacion
+        componentes = []
+
+        for componente in componentes_fuertes(
+            condensacion.representantes, condensacion.sucesores
+        ):
+            if len(componente) > 1 or componente[0] in condensacion.sucesores(
+                componente[0]
+            ):
+                componentes.append(condensacion.expandir(componente))
+
+        return componentes
+
+    def get_reporte_ciclos(
+        self,
+        max_ciclos: Optional[int] = None,
+        tiempo_limite: Optional[float] = None,
+    ) -> Dict[str, Any]:
+        """
+        Obtiene un reporte de los ciclos del grafo de prerrequisitos.
 
-        while queue:
-            current = queue.popleft()
-            topological_sorted.append(current)
+        Las componentes cíclicas se calculan siempre completas. Los ciclos
+        elementales se enumeran dentro de cada componente con un límite de
+        cantidad y de tiempo, porque su número puede crecer de forma
+        exponencial cuando varios ciclos se superponen. Si el ciclo de una
+        componente solo se cierra a través de corequisitos (por ejemplo, una
+        asignatura que requiere a su propio corequisito), se reporta la
+        componente completa como ciclo.
 
-            for neighbor in self.prerrequisitos_graph.successors(current):
-                in_degree[neighbor] -= 1
-                if in_degree[neighbor] == 0:
-                    queue.append(neighbor)
+        Args:
+            max_ciclos: Número máximo de ciclos a enumerar (opcional)
+            tiempo_limite: Tiempo máximo en segundos para la enumeración (opcional)
 
-        nodes_in_cycles = set(self.prerrequisitos_graph.nodes()) - set(
-            topological_sorted
+        Returns:
+            Diccionario con las componentes, los ciclos y si la enumeración fue truncada
+        """
+        componentes = self.get_componentes_ciclicas()
+        limite = (
+            time.perf_counter() + tiempo_limite if tiempo_limite is not None else None
         )
 
-        all_cycles = []
-
-        for start_node in nodes_in_cycles:
-            queue = deque([(start_node, [start_node])])
+        ciclos = []
+        truncado = False
+
+        for componente in componentes:
+            restantes = None if max_ciclos is None else max_ciclos - len(ciclos)
+            ciclos_componente, truncado = enumerar_ciclos(
+                componente, self._sucesores, restantes, limite
+            )
+            if not ciclos_componente and not truncado:
+                # El ciclo pasa por un corequisito: se reporta el grupo completo
+                ciclos_componente = [componente + componente[:1]]
+            ciclos.extend(ciclos_componente)
+            if truncado:
+                break
+
+        return {
+            "componentes": componentes,
+            "ciclos": ciclos,
+            "truncado": truncado,
+        }
+
+    def get_niveles_kahn(
+        self, asignatura_ids: Optional[Iterable[int]] = None
+    ) -> Tuple[List[List[int]], List[int]]:
+        """
+        Organiza las asignaturas del grafo en niveles con una sola pasada del
+        algoritmo de Kahn por grados de entrada, en O(N + E), sobre los
+        grupos de corequisitos condensados.
 
-            while queue:
-                node, path = queue.popleft()
+        Una asignatura queda en el nivel N si su prerrequisito más profundo
+        está en el nivel N-1; los miembros de un grupo de corequisitos
+        quedan en el mismo nivel. Dentro de cada nivel se conserva el orden
+        de inserción de las asignaturas.
 
-                for successor in self.prerrequisitos_graph.successors(node):
-                    if successor in path:
-                        cycle_start = path.index(successor)
-                        cycle = path[cycle_start:] + [successor]
-                        if cycle not in all_cycles:
-                            all_cycles.append(cycle)
-                    elif successor in nodes_in_cycles:
-                        new_path = path + [successor]
-                        queue.append((successor, new_path))
+        Args:
+            asignatura_ids: IDs de las asignaturas a organizar (opcional, por
+                defecto todas). Solo se consideran los prerrequisitos entre
+                ellas.
 
-        return all_cycles
+        Returns:
+            Tupla (niveles, pendientes): los niveles son listas de IDs, y los
+            pendientes son las asignaturas que no pudieron ubicarse porque
+            forman parte de un ciclo o dependen de uno
+        """
+        condensacion = self.condensacion
+        representante = condensacion.representante
+
+        if asignatura_ids is None:
+            ids = self.get_asignatura_ids()
+            grupos = condensacion.representantes
+            sucesores = {grupo: condensacion.sucesores(grupo) for grupo in grupos}
+        else:
+            incluidas = {a for a in asignatura_ids if a in self}
+            ids = [a for a in self.get_asignatura_ids() if a in incluidas]
+            grupos = list(dict.fromkeys(representante[a] for a in ids))
+
+            # Solo cuentan las aristas entre asignaturas del subconjunto: los
+            # miembros de un grupo que quedan fuera no aportan dependientes
+            sucesores = {grupo: [] for grupo in grupos}
+            for asignatura_id in ids:
+                sucesores[representante[asignatura_id]].extend(
+                    representante[s] for s in self._sucesores(asignatura_id)
+                    if s in incluidas
+                )
+            sucesores = {
+                grupo: list(dict.fromkeys(vecinos)) for grupo, vecinos in sucesores.items()
+            }
+
+        posicion = {grupo: i for i, grupo in enumerate(grupos)}
+        in_degree = dict.fromkeys(grupos, 0)
+        for grupo in grupos:
+            for sucesor in sucesores[grupo]:
+                in_degree[sucesor] += 1
+
+        nivel = [grupo for grupo in grupos if in_degree[grupo] == 0]
+        niveles = []
+        asignados = 0
+
+        while nivel:
+            niveles.append(nivel)
+            asignados += len(nivel)
+
+            siguiente = []
+            for grupo in nivel:
+                for sucesor in sucesores[grupo]:
+                    in_degree[sucesor] -= 1
+                    if in_degree[sucesor] == 0:
+                        siguiente.append(sucesor)
+
+            siguiente.sort(key=posicion.__getitem__)
+            nivel = siguiente
+
+        # Se expanden los grupos y se restablece el orden de inserción
+        orden_ids = {asignatura_id: i for i, asignatura_id in enumerate(ids)}
+        niveles = [
+            sorted(
+                (
+                    asignatura_id
+                    for asignatura_id in condensacion.expandir(nivel)
+                    if asignatura_id in orden_ids
+                ),
+                key=orden_ids.__getitem__,
+            )
+            for nivel in niveles
+        ]
+
+        if asignados == len(grupos):
+            return niveles, []
+
+        ubicadas = {asignatura_id for nivel in niveles for asignatura_id in nivel}
+        pendientes = [
+            asignatura_id for asignatura_id in ids if asignatura_id not in ubicadas
+        ]
+
+        return niveles, pendientes
 
     def has_cycle(self) -> bool:
         """
         Detecta si hay ciclos en el grafo de prerrequisitos.
-        Usa la implementación BFS.
+
+        Reutiliza el ordenamiento topológico del índice de cierre: hay ciclos
+        si algún grupo de corequisitos quedó fuera de él. Tras la primera consulta la
+        respuesta es inmediata.
 
         Returns:
             True si hay ciclos, False en caso contrario
         """
-        return self.has_cycle_bfs()
+        cierre = self.cierre
+        return cierre.num_ordenados < len(cierre.orden)
 
-    def get_cycles(self) -> List[List[int]]:
+    def tiene_ciclo_en_ruta(self, asignatura_id: int) -> bool:
         """
-        Obtiene los ciclos en el grafo de prerrequisitos.
-        Usa la implementación BFS.
+        Indica si la asignatura forma parte de un ciclo o depende de uno, es
+        decir, si su grupo de corequisitos quedó fuera del orden topológico
+        del índice de cierre. Los ciclos en otras partes del grafo no
+        afectan a su ruta.
+
+        Args:
+            asignatura_id: ID de la asignatura
+
+        Returns:
+            True si la ruta de la asignatura tiene ciclos
+        """
+        if asignatura_id not in self:
+            return False
+
+        grupo = self.condensacion.representante[asignatura_id]
+        return grupo not in self.cierre.en_orden
+
+    def reporte_ciclos(
+        self,
+        max_ciclos: Optional[int] = None,
+        tiempo_limite: Optional[float] = None,
+    ) -> Dict[str, Any]:
+        """
+        Obtiene el reporte de ciclos del grafo (ver get_reporte_ciclos),
+        calculado una sola vez por grafo con los límites de la primera
+        consulta. Como el grafo se comparte desde la caché, el reporte de
+        cada pensum se reutiliza entre peticiones.
+
+        Args:
+            max_ciclos: Número máximo de ciclos a enumerar (opcional)
+            tiempo_limite: Tiempo máximo en segundos para la enumeración (opcional)
+
+        Returns:
+            Diccionario con las componentes, los ciclos y si la enumeración fue truncada
+        """
+        return self._obtener_indice(
+            "_reporte_ciclos",
+            lambda: self.get_reporte_ciclos(max_ciclos, tiempo_limite),
+        )
+
+    def get_reporte_ciclos_de_ruta(
+        self,
+        asignatura_ids: Iterable[int],
+        max_ciclos: Optional[int] = None,
+        tiempo_limite: Optional[float] = None,
+    ) -> Dict[str, Any]:
+        """
+        Filtra el reporte de ciclos del grafo a las componentes que afectan a
+        las rutas de las asignaturas: las que contienen a alguna de ellas o a
+        alguno de sus prerrequisitos directos o indirectos.
+
+        Args:
+            asignatura_ids: IDs de las asignaturas objetivo
+            max_ciclos: Número máximo de ciclos a enumerar (opcional)
+            tiempo_limite: Tiempo máximo en segundos para la enumeración (opcional)
+
+        Returns:
+            Diccionario con las componentes, los ciclos y si la enumeración
+            del grafo fue truncada
+        """
+        relevantes = set()
+        for asignatura_id in asignatura_ids:
+            if self.tiene_ciclo_en_ruta(asignatura_id):
+                grupo = self.condensacion.representante[asignatura_id]
+                relevantes.update(self.condensacion.miembros[grupo])
+                relevantes.update(self.get_ancestros(asignatura_id))
+
+        reporte = self.reporte_ciclos(max_ciclos, tiempo_limite)
+        return {
+            "componentes": [
+                componente
+                for componente in reporte["componentes"]
+                if not relevantes.isdisjoint(componente)
+            ],
+            "ciclos": [
+                ciclo for ciclo in reporte["ciclos"] if not relevantes.isdisjoint(ciclo)
+            ],
+            "truncado": reporte["truncado"],
+        }
+
+    def get_cycles(
+        self,
+        max_ciclos: Optional[int] = None,
+        tiempo_limite: Optional[float] = None,
+    ) -> List[List[int]]:
+        """
+        Obtiene los ciclos elementales en el grafo de prerrequisitos,
+        enumerados por componente fuertemente conexa.
+
+        Args:
+            max_ciclos: Número máximo de ciclos a enumerar (opcional)
+            tiempo_limite: Tiempo máximo en segundos para la enumeración (opcional)
 
         Returns:
             Lista de ciclos, donde cada ciclo es una lista de IDs de asignaturas
         """
-        return self.get_cycles_bfs()
+        return self.get_reporte_ciclos(max_ciclos, tiempo_limite)["ciclos"]
+
+
+class AsignaturaGrafo(AsignaturaGrafoBase):
+    """
+    Clase para manejar el grafo de asignaturas y sus prerrequisitos.
+    """
+
+    def __init__(self):
+        self.prerrequisitos_graph = nx.DiGraph()
+        self.corequisitos_graph = nx.Graph()
+        self.combined_graph = nx.DiGraph()
+
+    @classmethod
+    def from_data(
+        cls,
+        asignaturas: List[Tuple[int, Dict[str, Any]]],
+        prerequisitos: List[Tuple[int, int]],
+        corequisitos: List[Tuple[int, int]],
+    ) -> "AsignaturaGrafo":
+        """
+        Construye el grafo a partir de listas de nodos y aristas.
+
+        Args:
+            asignaturas: Lista de tuplas (id_asignatura, datos)
+            prerequisitos: Lista de tuplas (id_asignatura, id_prerrequisito)
+            corequisitos: Lista de tuplas (id_asignatura, id_corequisito)
+
+        Returns:
+            AsignaturaGrafo: Instancia del grafo de asignaturas
+        """
+        grafo = cls()
+
+        for asignatura_id, asignatura_data in asignaturas:
+            grafo.add_asignatura(asignatura_id, asignatura_data)
+
+        for asignatura_id, prerequisito_id in prerequisitos:
+            grafo.add_prerequisito(asignatura_id, prerequisito_id)
+
+        for asignatura_id, corequisito_id in corequisitos:
+            grafo.add_corequisito(asignatura_id, corequisito_id)
+
+        return grafo
+
+    def add_asignatura(
+        self, asignatura_id: int, asignatura_data: Dict[str, Any]
+    ) -> None:
+        """
+        Agrega una asignatura al grafo.
+
+        Args:
+            asignatura_id: ID de la asignatura
+            asignatura_data: Datos de la asignatura (nombre, código, etc.)
+        """
+        self.reset_indices()
+        self.prerrequisitos_graph.add_node(asignatura_id, **asignatura_data)
+        self.corequisitos_graph.add_node(asignatura_id, **asignatura_data)
+        self.combined_graph.add_node(asignatura_id, **asignatura_data)
+
+    def add_prerequisito(self, asignatura_id: int, prerequisito_id: int) -> None:
+        """
+        Agrega un prerrequisito entre dos asignaturas.
+
+        Args:
+            asignatura_id: ID de la asignatura
+            prerequisito_id: ID del prerrequisito
+
+        Nota: La dirección de la arista es: prerequisito -> asignatura
+              Esto significa que el prerrequisito debe ser cursado antes de la asignatura
+        """
+        self.reset_indices()
+        self.prerrequisitos_graph.add_edge(prerequisito_id, asignatura_id)
+        self.combined_graph.add_edge(
+            prerequisito_id, asignatura_id, tipo="prerequisito"
+        )
+
+    def add_corequisito(self, asignatura_id: int, corequisito_id: int) -> None:
+        """
+        Agrega un corequisito entre dos asignaturas.
+
+        Args:
+            asignatura_id: ID de la asignatura
+            corequisito_id: ID del corequisito
+
+        Nota: Los corequisitos son bidireccionales (no dirigidos)
+              Esto significa que ambas asignaturas deben cursarse simultáneamente
+        """
+        self.reset_indices()
+        self.corequisitos_graph.add_edge(asignatura_id, corequisito_id)
+        self.combined_graph.add_edge(asignatura_id, corequisito_id, tipo="corequisito")
+        self.combined_graph.add_edge(corequisito_id, asignatura_id, tipo="corequisito")
+
+    def __contains__(self, asignatura_id: int) -> bool:
+        return asignatura_id in self.prerrequisitos_graph
+
+    def __len__(self) -> int:
+        return self.prerrequisitos_graph.number_of_nodes()
+
+    def get_asignatura_ids(self) -> List[int]:
+        return list(self.prerrequisitos_graph.nodes())
+
+    def get_asignatura(self, asignatura_id: int) -> Dict[str, Any]:
+        return self.prerrequisitos_graph.nodes[asignatura_id]
+
+    def _predecesores(self, asignatura_id: int) -> Iterable[int]:
+        return self.prerrequisitos_graph.predecessors(asignatura_id)
+
+    def _sucesores(self, asignatura_id: int) -> Iterable[int]:
+        return self.prerrequisitos_graph.successors(asignatura_id)
+
+    def _vecinos_corequisito(self, asignatura_id: int) -> Iterable[int]:
+        if asignatura_id not in self.corequisitos_graph:
+            return ()
+        return self.corequisitos_graph.neighbors(asignatura_id)
+
+    def estimate_memory(self) -> int:
+        """
+        Estima la memoria ocupada por el grafo en bytes.
+
+        Recorre las estructuras internas (diccionarios de nodos y
+        adyacencias) de los tres grafos de networkx. No es exacto, pero
+        sirve como presupuesto para la caché de grafos.
+
+        Returns:
+            Tamaño aproximado en bytes
+        """
+        total = sys.getsizeof(self) + self._estimate_indices_memory()
+
+        for graph in (
+            self.prerrequisitos_graph,
+            self.corequisitos_graph,
+            self.combined_graph,
+        ):
+            total += sys.getsizeof(graph._node) + sys.getsizeof(graph._adj)
+
+            for node_id, data in graph._node.items():
+                total += sys.getsizeof(node_id) + sys.getsizeof(data)
+                total += sum(sys.getsizeof(value) for value in data.values())
+
+            adjacencias = [graph._adj]
+            if graph.is_directed():
+                adjacencias.append(graph._pred)
+                total += sys.getsizeof(graph._pred)
+
+            for adj in adjacencias:
+                for vecinos in adj.values():
+                    total += sys.getsizeof(vecinos)
+                    total += sum(sys.getsizeof(attrs) for attrs in vecinos.values())
+
+        return total
@@ -0,0 +1,248 @@
+import sys
+from array import array
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+from collections import deque
+
+from app.core.graph import AsignaturaGrafoBase
+
+
+_SIN_VALOR = -1
+
+
+def _construir_csr(
+    num_nodos: int, aristas: List[Tuple[int, int]]
+) -> Tuple[array, array]:
+    """
+    Construye los arreglos CSR (offsets y destinos) de una lista de aristas
+    expresadas con índices densos, conservando el orden de inserción.
+
+    Args:
+        num_nodos: Número de nodos del grafo
+        aristas: Lista de tuplas (indice_origen, indice_destino)
+
+    Returns:
+        Tupla (offsets, destinos): los destinos del nodo i son
+        destinos[offsets[i]:offsets[i + 1]]
+    """
+    offsets = array("l", bytes(array("l").itemsize * (num_nodos + 1)))
+    for origen, _ in aristas:
+        offsets[origen + 1] += 1
+    for i in range(num_nodos):
+        offsets[i + 1] += offsets[i]
+
+    destinos = array("l", bytes(array("l").itemsize * len(aristas)))
+    siguiente = array("l", offsets[:-1])
+    for origen, destino in aristas:
+        destinos[siguiente[origen]] = destino
+        siguiente[origen] += 1
+
+    return offsets, destinos
+
+
+class AsignaturaGrafoCSR(AsignaturaGrafoBase):
+    """
+    Grafo de asignaturas compacto basado en arreglos.
+
+    Los nodos se identifican internamente con índices densos 0..n-1 y las
+    adyacencias se almacenan en formato CSR (compressed sparse row):
+    prerrequisitos directos (aristas inversas), dependientes directos
+    (aristas hacia adelante) y corequisitos. Los atributos de los nodos se
+    guardan como estructura de arreglos en lugar de un diccionario por nodo.
+
+    El grafo es inmutable: se construye completo con ``from_data``.
+    """
+
+    def __init__(self):
+        self._ids = array("q")
+        self._indices: Dict[int, int] = {}
+
+        self._codigos: List[str] = []
+        self._nombres: List[str] = []
+        self._creditos = array("l")
+        self._req_creditos = array("l")
+        self._trimestres = array("l")
+        self._pensum_ids = array("l")
+
+        self._pre_offsets, self._pre_destinos = array("l", [0]), array("l")
+        self._suc_offsets, self._suc_destinos = array("l", [0]), array("l")
+        self._co_offsets, self._co_destinos = array("l", [0]), array("l")
+
+    @classmethod
+    def from_data(
+        cls,
+        asignaturas: List[Tuple[int, Dict[str, Any]]],
+        prerequisitos: List[Tuple[int, int]],
+        corequisitos: List[Tuple[int, int]],
+    ) -> "AsignaturaGrafoCSR":
+        """
+        Construye el grafo a partir de listas de nodos y aristas.
+
+        Las aristas que referencian asignaturas ausentes se descartan, y las
+        aristas repetidas se agregan una sola vez.
+
+        Args:
+            asignaturas: Lista de tuplas (id_asignatura, datos)
+            prerequisitos: Lista de tuplas (id_asignatura, id_prerrequisito)
+            corequisitos: Lista de tuplas (id_asignatura, id_corequisito)
+
+        Returns:
+            AsignaturaGrafoCSR: Instancia del grafo de asignaturas
+        """
+        grafo = cls()
+
+        for asignatura_id, data in asignaturas:
+            if asignatura_id in grafo._indices:
+                continue
+
+            grafo._indices[asignatura_id] = len(grafo._ids)
+            grafo._ids.append(asignatura_id)
+            grafo._codigos.append(data["codigo"])
+            grafo._nombres.append(data["nombre"])
+            grafo._creditos.append(_a_entero(data.get("creditos")))
+            grafo._req_creditos.append(_a_entero(data.get("req_creditos")))
+            grafo._trimestres.append(_a_entero(data.get("trimestre")))
+            grafo._pensum_ids.append(_a_entero(data.get("pensum_id")))
+
+        indices = grafo._indices
+        num_nodos = len(grafo._ids)
+
+        aristas_pre = []
+        vistas = set()
+        for asignatura_id, prerequisito_id in prerequisitos:
+            if asignatura_id not in indices or prerequisito_id not in indices:
+                continue
+            arista = (indices[prerequisito_id], indices[asignatura_id])
+            if arista not in vistas:
+                vistas.add(arista)
+                aristas_pre.append(arista)
+
+        aristas_co = []
+        vistas = set()
+        for asignatura_id, corequisito_id in corequisitos:
+            if asignatura_id not in indices or corequisito_id not in indices:
+                continue
+            i, j = indices[asignatura_id], indices[corequisito_id]
+            for arista in ((i, j), (j, i)):
+                if arista not in vistas:
+                    vistas.add(arista)
+                    aristas_co.append(arista)
+
+        grafo._suc_offsets, grafo._suc_destinos = _construir_csr(num_nodos, aristas_pre)
+        grafo._pre_offsets, grafo._pre_destinos = _construir_csr(
+            num_nodos, [(destino, origen) for origen, destino in aristas_pre]
+        )
+        grafo._co_offsets, grafo._co_destinos = _construir_csr(num_nodos, aristas_co)
+
+        return grafo
+
+    def __contains__(self, asignatura_id: int) -> bool:
+        return asignatura_id in self._indices
+
+    def __len__(self) -> int:
+        return len(self._ids)
+
+    def get_asignatura_ids(self) -> List[int]:
+        return self._ids.tolist()
+
+    def get_asignatura(self, asignatura_id: int) -> Dict[str, Any]:
+        i = self._indices[asignatura_id]
+
+        data = {
+            "codigo": self._codigos[i],
+            "nombre": self._nombres[i],
+            "creditos": _a_valor(self._creditos[i]),
+            "req_creditos": _a_valor(self._req_creditos[i]),
+        }
+
+        if self._trimestres[i] != _SIN_VALOR:
+            data["trimestre"] = self._trimestres[i]
+            data["pensum_id"] = _a_valor(self._pensum_ids[i])
+
+        return data
+
+    def _predecesores(self, asignatura_id: int) -> Iterable[int]:
+        return self._vecinos(
+            self._pre_offsets, self._pre_destinos, self._indices[asignatura_id]
+        )
+
+    def _sucesores(self, asignatura_id: int) -> Iterable[int]:
+        return self._vecinos(
+            self._suc_offsets, self._suc_destinos, self._indices[asignatura_id]
+        )
+
+    def _vecinos_corequisito(self, asignatura_id: int) -> Iterable[int]:
+        return self._vecinos(
+            self._co_offsets, self._co_destinos, self._indices[asignatura_id]
+        )
+
+    def _vecinos(self, offsets: array, destinos: array, i: int) -> List[int]:
+        ids = self._ids
+        return [ids[j] for j in destinos[offsets[i] : offsets[i + 1]]]
+
+    def has_cycle_bfs(self) -> bool:
+        """
+        Detecta si hay ciclos en el grafo de prerrequisitos con el algoritmo
+        de Kahn sobre los arreglos CSR.
+
+        Returns:
+            True si hay ciclos, False en caso contrario
+        """
+        num_nodos = len(self._ids)
+        suc_offsets, suc_destinos = self._suc_offsets, self._suc_destinos
+
+        in_degree = array("l", bytes(array("l").itemsize * num_nodos))
+        for destino in suc_destinos:
+            in_degree[destino] += 1
+
+        queue = deque(i for i in range(num_nodos) if in_degree[i] == 0)
+        visited_count = 0
+
+        while queue:
+            actual = queue.popleft()
+            visited_count += 1
+
+            for sucesor in suc_destinos[suc_offsets[actual] : suc_offsets[actual + 1]]:
+                in_degree[sucesor] -= 1
+                if in_degree[sucesor] == 0:
+                    queue.append(sucesor)
+
+        return visited_count != num_nodos
+
+    def estimate_memory(self) -> int:
+        """
+        Estima la memoria ocupada por el grafo en bytes.
+
+        Returns:
+            Tamaño aproximado en bytes
+        """
+        total = sys.getsizeof(self) + self._estimate_indices_memory()
+        total += sys.getsizeof(self._indices)
+        total += sum(sys.getsizeof(k) for k in self._indices)
+
+        for arreglo in (
+            self._ids,
+            self._creditos,
+            self._req_creditos,
+            self._trimestres,
+            self._pensum_ids,
+            self._pre_offsets,
+            self._pre_destinos,
+            self._suc_offsets,
+            self._suc_destinos,
+            self._co_offsets,
+            self._co_destinos,
+        ):
+            total += sys.getsizeof(arreglo)
+
+        for textos in (self._codigos, self._nombres):
+            total += sys.getsizeof(textos) + sum(sys.getsizeof(t) for t in textos)
+
+        return total
+
+
+def _a_entero(valor: Optional[int]) -> int:
+    return _SIN_VALOR if valor is None else valor
+
+
+def _a_valor(valor: int) -> Optional[int]:
+    return None if valor == _SIN_VALOR else valor
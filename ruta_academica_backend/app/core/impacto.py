@@ -0,0 +1,102 @@
+import sys
+from typing import List
+
+from app.core.cierre import contar_bits
+from app.core.elegibilidad import IndiceElegibilidad
+
+
+class ImpactoDescendientes:
+    """
+    Índice de impacto hacia adelante: para cada asignatura, el bitset de
+    todas las asignaturas que quedan bloqueadas si no se puede cursar.
+
+    Quedan bloqueados sus dependientes directos e indirectos y, como los
+    corequisitos se cursan juntos, su grupo de corequisitos y los de cada
+    asignatura bloqueada, con sus respectivos dependientes.
+
+    Los descendientes se calculan sobre los grupos de corequisitos
+    condensados, en orden topológico inverso: los de un grupo son la unión
+    de los de sus dependientes directos, ya calculados. Los grupos en ciclos
+    usan un BFS individual.
+    """
+
+    def __init__(self, indice: IndiceElegibilidad):
+        """
+        Args:
+            indice: Índice de elegibilidad del grafo
+        """
+        n = len(indice.orden)
+        cierre = indice.cierre
+        condensacion = indice.condensacion
+        mascaras_grupo = indice.mascaras_grupo
+        num_grupos = len(cierre.orden)
+        num_ordenados = cierre.num_ordenados
+
+        # Dependientes de cada grupo condensado, indexados por bit del cierre
+        sucesores = [
+            [cierre.bits[sucesor] for sucesor in condensacion.sucesores(grupo)]
+            for grupo in cierre.orden
+        ]
+
+        # Los grupos en ciclos (o detrás de uno) ocupan los bits finales y
+        # pueden ser dependientes de los ordenados: se calculan primero.
+        descendientes: List[int] = [0] * num_grupos
+        for bit in range(num_ordenados, num_grupos):
+            descendientes[bit] = _descendientes_bfs(bit, sucesores, mascaras_grupo)
+
+        for bit in range(num_ordenados - 1, -1, -1):
+            mascara = 0
+            for sucesor in sucesores[bit]:
+                mascara |= descendientes[sucesor] | mascaras_grupo[sucesor]
+            descendientes[bit] = mascara
+
+        self.bloqueadas: List[int] = [0] * n
+        for grupo_bit, grupo in enumerate(cierre.orden):
+            bloqueadas = mascaras_grupo[grupo_bit] | descendientes[grupo_bit]
+            for miembro in condensacion.miembros[grupo]:
+                bit = indice.bits[miembro]
+                self.bloqueadas[bit] = bloqueadas & ~(1 << bit)
+
+        self.total_bloqueadas: List[int] = [contar_bits(m) for m in self.bloqueadas]
+        self.creditos_bloqueados: List[int] = [
+            indice.creditos_de(m) for m in self.bloqueadas
+        ]
+
+        # Ranking de bits: más asignaturas bloqueadas primero, luego más créditos
+        self.ranking: List[int] = sorted(
+            range(n),
+            key=lambda bit: (
+                -self.total_bloqueadas[bit],
+                -self.creditos_bloqueados[bit],
+                bit,
+            ),
+        )
+
+    def estimate_memory(self) -> int:
+        """
+        Estima la memoria ocupada por el índice en bytes.
+        """
+        total = sys.getsizeof(self.bloqueadas) + sum(
+            sys.getsizeof(m) for m in self.bloqueadas
+        )
+        for valores in (self.total_bloqueadas, self.creditos_bloqueados, self.ranking):
+            total += sys.getsizeof(valores)
+        return total
+
+
+def _descendientes_bfs(
+    bit: int, sucesores: List[List[int]], mascaras_grupo: List[int]
+) -> int:
+    mascara = 0
+    visitados = {bit}
+    pendientes = [bit]
+
+    while pendientes:
+        actual = pendientes.pop()
+        for sucesor in sucesores[actual]:
+            mascara |= mascaras_grupo[sucesor]
+            if sucesor not in visitados:
+                visitados.add(sucesor)
+                pendientes.append(sucesor)
+
+    return mascara
@@ -0,0 +1,260 @@
+from collections import deque
+from typing import Callable, Dict, Iterable, List, Optional, Set, Tuple
+
+
+class OrdenTopologicoDinamico:
+    """
+    Orden topológico en línea del grafo de prerrequisitos (algoritmo de
+    Pearce–Kelly).
+
+    Mantiene una posición por asignatura tal que todo prerrequisito queda
+    antes que la asignatura que lo requiere. Al agregar una arista que ya
+    respeta el orden no hay nada que hacer; si no, solo se exploran y
+    reordenan las asignaturas cuyas posiciones están entre los dos
+    extremos de la arista, y se detecta el ciclo si la asignatura alcanza
+    a su nuevo prerrequisito dentro de esa ventana.
+
+    Si los datos iniciales ya contienen ciclos, el orden no existe: la
+    estructura queda inválida y cada validación recorre el grafo completo
+    desde la asignatura.
+
+    Una misma arista puede agregarse varias veces (por ejemplo, si los nodos
+    son grupos de corequisitos y varios miembros de un grupo requieren a
+    miembros del otro): se cuenta cada una y la arista desaparece al
+    eliminar la última.
+    """
+
+    def __init__(self, ids: Iterable[int], aristas: Iterable[Tuple[int, int]]):
+        """
+        Args:
+            ids: IDs de todas las asignaturas
+            aristas: Tuplas (asignatura_id, prerequisito_id)
+        """
+        self._sucesores: Dict[int, Set[int]] = {}
+        self._predecesores: Dict[int, Set[int]] = {}
+        self._multiplicidad: Dict[Tuple[int, int], int] = {}
+        self.posicion: Dict[int, int] = {}
+        self._siguiente = 0
+
+        for asignatura_id in ids:
+            self.agregar_asignatura(asignatura_id)
+
+        for asignatura_id, prerequisito_id in aristas:
+            self.agregar_asignatura(asignatura_id)
+            self.agregar_asignatura(prerequisito_id)
+            self._enlazar(asignatura_id, prerequisito_id)
+
+        self.valido = self._ordenar()
+
+    def __contains__(self, asignatura_id: int) -> bool:
+        return asignatura_id in self._sucesores
+
+    def _enlazar(self, asignatura_id: int, prerequisito_id: int) -> bool:
+        """
+        Cuenta una arista más y la agrega a las adyacencias si es nueva.
+
+        Returns:
+            True si la arista no existía
+        """
+        arista = (asignatura_id, prerequisito_id)
+        self._multiplicidad[arista] = self._multiplicidad.get(arista, 0) + 1
+        if self._multiplicidad[arista] > 1:
+            return False
+
+        self._sucesores[prerequisito_id].add(asignatura_id)
+        self._predecesores[asignatura_id].add(prerequisito_id)
+        return True
+
+    def _ordenar(self) -> bool:
+        in_degree = {nodo: len(pre) for nodo, pre in self._predecesores.items()}
+        queue = deque(nodo for nodo, grado in in_degree.items() if grado == 0)
+        orden = []
+
+        while queue:
+            actual = queue.popleft()
+            orden.append(actual)
+            for sucesor in self._sucesores[actual]:
+                in_degree[sucesor] -= 1
+                if in_degree[sucesor] == 0:
+                    queue.append(sucesor)
+
+        self.posicion = {nodo: i for i, nodo in enumerate(orden)}
+        self._siguiente = len(orden)
+        return len(orden) == len(self._sucesores)
+
+    def agregar_asignatura(self, asignatura_id: int) -> None:
+        """
+        Agrega una asignatura sin prerrequisitos al final del orden.
+        """
+        if asignatura_id in self._sucesores:
+            return
+
+        self._sucesores[asignatura_id] = set()
+        self._predecesores[asignatura_id] = set()
+        self.posicion[asignatura_id] = self._siguiente
+        self._siguiente += 1
+
+    def eliminar_asignatura(self, asignatura_id: int) -> None:
+        """
+        Elimina una asignatura y sus aristas; el orden sigue siendo válido.
+        """
+        for sucesor in self._sucesores.pop(asignatura_id, ()):
+            self._predecesores[sucesor].discard(asignatura_id)
+            self._multiplicidad.pop((sucesor, asignatura_id), None)
+        for predecesor in self._predecesores.pop(asignatura_id, ()):
+            self._sucesores[predecesor].discard(asignatura_id)
+            self._multiplicidad.pop((asignatura_id, predecesor), None)
+        self.posicion.pop(asignatura_id, None)
+
+    def buscar_ciclo(
+        self, asignatura_id: int, prerequisito_id: int
+    ) -> Optional[List[int]]:
+        """
+        Indica si agregar el prerrequisito crearía un ciclo, sin modificar
+        la estructura.
+
+        Args:
+            asignatura_id: ID de la asignatura
+            prerequisito_id: ID del nuevo prerrequisito
+
+        Returns:
+            El ciclo que se formaría (cerrado, empezando y terminando en la
+            asignatura) o None si la arista es válida
+        """
+        if asignatura_id == prerequisito_id:
+            return [asignatura_id, asignatura_id]
+
+        if prerequisito_id not in self._sucesores or asignatura_id not in self._sucesores:
+            return None
+
+        if self.valido:
+            limite = self.posicion[prerequisito_id]
+            if self.posicion[asignatura_id] > limite:
+                return None
+        else:
+            limite = None
+
+        camino = self._camino(asignatura_id, prerequisito_id, limite)
+        return camino + [asignatura_id] if camino else None
+
+    def agregar_prerequisito(
+        self, asignatura_id: int, prerequisito_id: int
+    ) -> Optional[List[int]]:
+        """
+        Agrega un prerrequisito si no crea un ciclo, actualizando el orden.
+
+        Args:
+            asignatura_id: ID de la asignatura
+            prerequisito_id: ID del nuevo prerrequisito
+
+        Returns:
+            El ciclo que se formaría, en cuyo caso la arista no se agrega, o
+            None si se agregó
+        """
+        self.agregar_asignatura(asignatura_id)
+        self.agregar_asignatura(prerequisito_id)
+
+        ciclo = self.buscar_ciclo(asignatura_id, prerequisito_id)
+        if ciclo:
+            return ciclo
+
+        if not self._enlazar(asignatura_id, prerequisito_id):
+            return None
+
+        if self.valido and self.posicion[asignatura_id] < self.posicion[prerequisito_id]:
+            self._reordenar(asignatura_id, prerequisito_id)
+
+        return None
+
+    def eliminar_prerequisito(self, asignatura_id: int, prerequisito_id: int) -> None:
+        """
+        Elimina una ocurrencia de un prerrequisito; el orden sigue siendo
+        válido.
+        """
+        arista = (asignatura_id, prerequisito_id)
+        restantes = self._multiplicidad.get(arista, 0) - 1
+        if restantes > 0:
+            self._multiplicidad[arista] = restantes
+            return
+
+        self._multiplicidad.pop(arista, None)
+        if asignatura_id in self._predecesores:
+            self._predecesores[asignatura_id].discard(prerequisito_id)
+        if prerequisito_id in self._sucesores:
+            self._sucesores[prerequisito_id].discard(asignatura_id)
+
+    def _camino(
+        self, origen: int, destino: int, limite: Optional[int]
+    ) -> Optional[List[int]]:
+        """
+        Busca un camino de prerrequisitos hacia adelante de origen a destino
+        visitando solo asignaturas con posición menor o igual al límite.
+        """
+        posicion = self.posicion
+        padre = {origen: None}
+        pila = [origen]
+
+        while pila:
+            actual = pila.pop()
+            if actual == destino:
+                camino = []
+                while actual is not None:
+                    camino.append(actual)
+                    actual = padre[actual]
+                return camino[::-1]
+
+            for sucesor in self._sucesores[actual]:
+                if sucesor in padre:
+                    continue
+                if limite is not None and posicion[sucesor] > limite:
+                    continue
+                padre[sucesor] = actual
+                pila.append(sucesor)
+
+        return None
+
+    def _reordenar(self, asignatura_id: int, prerequisito_id: int) -> None:
+        """
+        Restablece el orden tras agregar prerequisito -> asignatura cuando
+        la asignatura estaba antes que el prerrequisito. Solo se mueven las
+        asignaturas de la ventana [posición(asignatura), posición(prerrequisito)]
+        alcanzables desde la asignatura o que alcanzan al prerrequisito.
+        """
+        posicion = self.posicion
+        inferior = posicion[asignatura_id]
+        superior = posicion[prerequisito_id]
+
+        adelante = self._alcanzables(
+            asignatura_id, self._sucesores, lambda p: p <= superior
+        )
+        atras = self._alcanzables(
+            prerequisito_id, self._predecesores, lambda p: p >= inferior
+        )
+
+        adelante.sort(key=posicion.__getitem__)
+        atras.sort(key=posicion.__getitem__)
+
+        # Las que alcanzan al prerrequisito van primero, luego las alcanzables
+        # desde la asignatura, reutilizando las mismas posiciones
+        posiciones = sorted(posicion[nodo] for nodo in atras + adelante)
+        for nodo, nueva in zip(atras + adelante, posiciones):
+            posicion[nodo] = nueva
+
+    def _alcanzables(
+        self,
+        origen: int,
+        adyacencia: Dict[int, Set[int]],
+        dentro: Callable[[int], bool],
+    ) -> List[int]:
+        posicion = self.posicion
+        visitados = {origen}
+        pila = [origen]
+
+        while pila:
+            actual = pila.pop()
+            for vecino in adyacencia[actual]:
+                if vecino not in visitados and dentro(posicion[vecino]):
+                    visitados.add(vecino)
+                    pila.append(vecino)
+
+        return list(visitados)
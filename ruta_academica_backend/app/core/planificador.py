@@ -0,0 +1,192 @@
+from typing import Dict, List, Optional
+
+from app.core.cierre import posiciones_bits
+from app.core.elegibilidad import IndiceElegibilidad
+
+
+def requeridas_para(indice: IndiceElegibilidad, objetivo: int) -> int:
+    """
+    Calcula el bitset de asignaturas necesarias para cursar las del objetivo:
+    sus grupos de corequisitos y todas las asignaturas que esos grupos
+    requieren, directa o indirectamente.
+
+    Args:
+        indice: Índice de elegibilidad del grafo
+        objetivo: Bitset de asignaturas objetivo
+
+    Returns:
+        Bitset de asignaturas requeridas, incluido el objetivo
+    """
+    grupos = indice.grupos
+    ancestros = indice.ancestros
+
+    requeridas = objetivo
+    for bit in posiciones_bits(objetivo):
+        requeridas |= grupos[bit] | ancestros[bit]
+
+    return requeridas
+
+
+def alturas(indice: IndiceElegibilidad, asignaturas: int) -> Dict[int, int]:
+    """
+    Calcula la longitud del camino crítico que sale de cada asignatura: el
+    número de trimestres necesarios, como mínimo, para cursarla junto con
+    todas las asignaturas del conjunto que dependen de ella.
+
+    Los corequisitos se cursan en el mismo trimestre, por lo que todos los
+    miembros de un grupo comparten la altura del más alto.
+
+    Args:
+        indice: Índice de elegibilidad del grafo (sin ciclos)
+        asignaturas: Bitset del conjunto a considerar
+
+    Returns:
+        Diccionario bit -> altura
+    """
+    return _caminos_mas_largos(indice, asignaturas, indice.sucesores)
+
+
+def profundidades(indice: IndiceElegibilidad, asignaturas: int) -> Dict[int, int]:
+    """
+    Calcula el primer trimestre en que se puede cursar cada asignatura del
+    conjunto: uno más que el camino más largo de prerrequisitos que llega a
+    ella. Los miembros de un grupo de corequisitos comparten el mismo valor.
+
+    Args:
+        indice: Índice de elegibilidad del grafo (sin ciclos)
+        asignaturas: Bitset del conjunto a considerar
+
+    Returns:
+        Diccionario bit -> profundidad (1 para las asignaturas sin prerrequisitos)
+    """
+    predecesores = [posiciones_bits(directos) for directos in indice.directos]
+    return _caminos_mas_largos(indice, asignaturas, predecesores)
+
+
+def _caminos_mas_largos(
+    indice: IndiceElegibilidad, asignaturas: int, adyacentes: List[List[int]]
+) -> Dict[int, int]:
+    grupos = indice.grupos
+    longitud: Dict[int, int] = {}
+    en_curso = set()
+
+    def siguientes_de(bit: int) -> List[int]:
+        miembros = grupos[bit] & asignaturas
+        return [
+            vecino
+            for miembro in posiciones_bits(miembros)
+            for vecino in adyacentes[miembro]
+            if asignaturas >> vecino & 1 and not miembros >> vecino & 1
+        ]
+
+    # Recorrido en profundidad iterativo sobre los grupos de corequisitos.
+    # Las aristas que vuelven a un grupo en curso (un ciclo formado por
+    # prerrequisitos y corequisitos) se ignoran.
+    for raiz in posiciones_bits(asignaturas):
+        if raiz in longitud:
+            continue
+
+        en_curso.update(posiciones_bits(grupos[raiz] & asignaturas))
+        pila = [(raiz, siguientes_de(raiz))]
+        while pila:
+            bit, siguientes = pila[-1]
+            pendiente = next(
+                (s for s in siguientes if s not in longitud and s not in en_curso),
+                None,
+            )
+            if pendiente is not None:
+                en_curso.update(posiciones_bits(grupos[pendiente] & asignaturas))
+                pila.append((pendiente, siguientes_de(pendiente)))
+                continue
+
+            pila.pop()
+            valor = 1 + max(
+                (longitud[s] for s in siguientes if s in longitud), default=0
+            )
+            for miembro in posiciones_bits(grupos[bit] & asignaturas):
+                longitud[miembro] = valor
+                en_curso.discard(miembro)
+
+    return longitud
+
+
+def planificar(
+    indice: IndiceElegibilidad,
+    aprobadas: int,
+    max_creditos: int,
+    objetivo: Optional[int] = None,
+    creditos: Optional[int] = None,
+) -> Dict:
+    """
+    Planifica las asignaturas pendientes trimestre a trimestre con un tope
+    de créditos por trimestre, intentando minimizar el número de trimestres.
+
+    Usa planificación por lista con prioridad de camino crítico: en cada
+    trimestre se consideran las asignaturas elegibles (con su grupo de
+    corequisitos como una unidad) y se inscriben primero las de mayor
+    altura, es decir, las que más trimestres de dependencias tienen por
+    delante, mientras quepan en el tope de créditos.
+
+    Args:
+        indice: Índice de elegibilidad del grafo (sin ciclos)
+        aprobadas: Bitset de asignaturas aprobadas
+        max_creditos: Tope de créditos por trimestre
+        objetivo: Bitset de asignaturas objetivo (opcional, por defecto
+            todas las pendientes)
+        creditos: Créditos acumulados iniciales (por defecto, los de las aprobadas)
+
+    Returns:
+        Diccionario con los bitsets de cada trimestre, el bitset de las
+        asignaturas que no se pudieron planificar y la cota inferior de
+        trimestres por camino crítico
+    """
+    if objetivo is None:
+        requeridas = (1 << len(indice.orden)) - 1
+    else:
+        requeridas = requeridas_para(indice, objetivo)
+
+    pendientes = requeridas & ~aprobadas
+    if creditos is None:
+        creditos = indice.creditos_de(aprobadas)
+
+    prioridad = alturas(indice, pendientes)
+    grupos = indice.grupos
+
+    trimestres: List[int] = []
+    cursadas = aprobadas
+
+    while pendientes:
+        elegibles = indice.elegibles(cursadas, creditos) & pendientes
+
+        unidades = []
+        restantes = elegibles
+        while restantes:
+            bajo = restantes & -restantes
+            bit = bajo.bit_length() - 1
+            unidad = grupos[bit] & pendientes
+            restantes &= ~unidad
+            unidades.append((prioridad[bit], indice.creditos_de(unidad), bit, unidad))
+
+        # Mayor altura primero; a igual altura, la unidad con más créditos
+        unidades.sort(key=lambda u: (-u[0], -u[1], u[2]))
+
+        trimestre = 0
+        creditos_trimestre = 0
+        for _, creditos_unidad, _, unidad in unidades:
+            if creditos_trimestre + creditos_unidad <= max_creditos:
+                trimestre |= unidad
+                creditos_trimestre += creditos_unidad
+
+        if not trimestre:
+            break
+
+        trimestres.append(trimestre)
+        cursadas |= trimestre
+        pendientes &= ~trimestre
+        creditos += creditos_trimestre
+
+    return {
+        "trimestres": trimestres,
+        "no_planificadas": pendientes,
+        "camino_critico": max(prioridad.values(), default=0),
+    }
@@ -1,8 +1,16 @@
+from typing import Optional
+
 from sqlalchemy import create_engine
+from sqlalchemy.ext.asyncio import AsyncEngine, async_sessionmaker, create_async_engine
 from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import NullPool
 
 from app.core.config import settings
 
+# Con SQLite, cada sesión abre su propia conexión (NullPool). Un pool de
+# tamaño fijo se agota bajo carga: las rutas síncronas retienen su conexión
+# mientras esperan un hilo libre del threadpool para terminar la respuesta,
+# y esos hilos esperan a su vez por una conexión.
 engine = create_engine(
     settings.DATABASE_URL,
     connect_args=(
@@ -10,5 +18,44 @@ engine = create_engine(
         if settings.DATABASE_URL.startswith("sqlite")
         else {}
     ),
+    poolclass=NullPool if settings.DATABASE_URL.startswith("sqlite") else None,
 )
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+
+# Drivers asíncronos equivalentes a los de DATABASE_URL
+_DRIVERS_ASINCRONOS = {
+    "sqlite": "sqlite+aiosqlite",
+    "sqlite+pysqlite": "sqlite+aiosqlite",
+    "postgresql": "postgresql+asyncpg",
+    "postgresql+psycopg2": "postgresql+asyncpg",
+}
+
+# Sesiones asíncronas para las rutas de solo lectura. El motor se crea al
+# primer uso, para que los scripts y las rutas síncronas no requieran el
+# driver asíncrono.
+AsyncSessionLocal = async_sessionmaker(autoflush=False, expire_on_commit=False)
+_async_engine: Optional[AsyncEngine] = None
+
+
+def get_async_database_url() -> str:
+    """
+    Obtiene la URL de la base de datos para el motor asíncrono:
+    DATABASE_ASYNC_URL si está definida o, si no, DATABASE_URL con el driver
+    asíncrono equivalente (aiosqlite para SQLite, asyncpg para PostgreSQL).
+    """
+    if settings.DATABASE_ASYNC_URL:
+        return settings.DATABASE_ASYNC_URL
+
+    esquema, separador, resto = settings.DATABASE_URL.partition("://")
+    return _DRIVERS_ASINCRONOS.get(esquema, esquema) + separador + resto
+
+
+def get_async_engine() -> AsyncEngine:
+    """
+    Obtiene el motor asíncrono de base de datos, creándolo si no existe.
+    """
+    global _async_engine
+
+    if _async_engine is None:
+        _async_engine = create_async_engine(get_async_database_url())
+    return _async_engine
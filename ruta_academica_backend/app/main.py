@@ -1,7 +1,14 @@
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 
-from app.api.routes import asignaturas, carreras, pensums, trimestres, prerrequisitos
+from app.api.routes import (
+    asignaturas,
+    carreras,
+    pensums,
+    trimestres,
+    prerrequisitos,
+    planificacion,
+)
 from app.core.config import settings
 
 app = FastAPI(
@@ -39,6 +46,11 @@ app.include_router(
     prefix=f"{settings.API_PREFIX}/prerrequisitos",
     tags=["prerrequisitos"],
 )
+app.include_router(
+    planificacion.router,
+    prefix=f"{settings.API_PREFIX}/planificacion",
+    tags=["planificacion"],
+)
 
 
 @app.get("/", tags=["root"])
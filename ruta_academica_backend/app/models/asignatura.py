@@ -17,6 +17,23 @@ corequisito = Table(
     Column("corequisito_id", Integer, ForeignKey("asignaturas.id"), primary_key=True),
 )
 
+# Tabla de cierre de prerrequisitos: una fila por cada asignatura y cada uno
+# de sus prerrequisitos directos o indirectos, con la menor distancia entre
+# ambos (1 para los directos). Se mantiene en cada escritura de prerrequisitos.
+asignatura_ancestro = Table(
+    "asignatura_ancestros",
+    Base.metadata,
+    Column("asignatura_id", Integer, ForeignKey("asignaturas.id"), primary_key=True),
+    Column(
+        "ancestro_id",
+        Integer,
+        ForeignKey("asignaturas.id"),
+        primary_key=True,
+        index=True,
+    ),
+    Column("profundidad", Integer, nullable=False),
+)
+
 
 class Asignatura(Base):
     __tablename__ = "asignaturas"
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, ForeignKey, Date
+from sqlalchemy import Column, Integer, String, ForeignKey, Date, DateTime, Table
 from sqlalchemy.orm import relationship
 
 from app.db.base import Base
@@ -14,3 +14,16 @@ class Pensum(Base):
     carrera_id = Column(Integer, ForeignKey("carreras.id"))
     carrera = relationship("Carrera", back_populates="pensums")
     trimestres = relationship("Trimestre", back_populates="pensum")
+
+
+# Versión de los datos de cada pensum: se incrementa en cada transacción que
+# modifica sus asignaturas, prerrequisitos, corequisitos o trimestres. La
+# fila con pensum_id 0 es la versión del catálogo completo, que cambia con
+# cualquier modificación. Sin fila, la versión es 0.
+pensum_version = Table(
+    "pensum_versiones",
+    Base.metadata,
+    Column("pensum_id", Integer, primary_key=True),
+    Column("version", Integer, nullable=False),
+    Column("actualizado", DateTime, nullable=False),
+)
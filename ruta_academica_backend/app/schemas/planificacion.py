@@ -0,0 +1,47 @@
+from typing import List, Optional
+from pydantic import BaseModel
+
+
+class ElegibilidadRequest(BaseModel):
+    asignatura_ids: List[int] = []
+    codigos: List[str] = []
+    creditos_acumulados: Optional[int] = None
+
+
+class CohorteRequest(BaseModel):
+    columnas: List[int]
+    aprobadas: List[List[bool]]
+    creditos_acumulados: Optional[List[int]] = None
+
+    def error_de_forma(self) -> Optional[str]:
+        """
+        Valida las dimensiones de la matriz antes de calcular nada.
+
+        Returns:
+            Descripción del problema o None si la forma es válida
+        """
+        if not self.columnas:
+            return "Debe indicar al menos una columna"
+
+        repetidas = sorted({c for c in self.columnas if self.columnas.count(c) > 1})
+        if repetidas:
+            return f"Las columnas {repetidas} están repetidas"
+
+        if any(len(fila) != len(self.columnas) for fila in self.aprobadas):
+            return "Cada fila de aprobadas debe tener una entrada por columna"
+
+        if self.creditos_acumulados is not None and len(
+            self.creditos_acumulados
+        ) != len(self.aprobadas):
+            return "Debe indicar los créditos acumulados de cada estudiante"
+
+        return None
+
+
+class PlanRequest(BaseModel):
+    max_creditos: int
+    asignatura_ids: List[int] = []
+    codigos: List[str] = []
+    creditos_acumulados: Optional[int] = None
+    objetivo_id: Optional[int] = None
+    objetivo_codigo: Optional[str] = None
@@ -0,0 +1,84 @@
+from typing import Dict, List, Optional
+from pydantic import BaseModel
+
+
+class RutasRequest(BaseModel):
+    codigos: List[str] = []
+    asignatura_ids: List[int] = []
+    pensum_id: Optional[int] = None
+
+
+# Las respuestas de rutas se serializan con exclude_unset: "trimestre" solo
+# aparece en los prerrequisitos ubicados en algún trimestre del grafo. codigo,
+# nombre y creditos admiten null, como las columnas de asignaturas
+
+
+class AsignaturaResumen(BaseModel):
+    id: int
+    codigo: Optional[str] = None
+    nombre: Optional[str] = None
+
+
+class AsignaturaObjetivo(AsignaturaResumen):
+    creditos: Optional[int] = None
+    req_creditos: Optional[int] = None
+    trimestre: Optional[int] = None
+    pensum_id: Optional[int] = None
+
+
+class AsignaturaRequerida(AsignaturaResumen):
+    creditos: Optional[int] = None
+    trimestre: Optional[int] = None
+
+
+class AsignaturaNivel(AsignaturaRequerida):
+    pass
+
+
+class AsignaturaNoAsignada(AsignaturaNivel):
+    en_ciclo: bool
+
+
+# Asignaturas de un nivel topológico; los niveles se indexan desde 0
+NivelTopologico = List[AsignaturaNivel]
+
+
+class EstructuraDependencia(BaseModel):
+    codigo: Optional[str] = None
+    nombre: Optional[str] = None
+    prerrequisitos_directos: List[int]
+    corequisitos: List[int]
+    trimestre: Optional[int] = None
+    pensum_id: Optional[int] = None
+
+
+class RutaAcademica(BaseModel):
+    asignatura_objetivo: AsignaturaObjetivo
+    prerrequisitos_directos: List[AsignaturaRequerida]
+    todos_prerrequisitos: List[AsignaturaRequerida]
+    corequisitos: List[AsignaturaRequerida]
+    total_asignaturas_previas: int
+    creditos_requeridos_total: int
+    niveles_topologicos: Dict[int, NivelTopologico]
+    estructura_dependencias: Dict[int, EstructuraDependencia]
+
+
+class RutaConCiclos(BaseModel):
+    error: str
+    ciclos: List[List[AsignaturaResumen]]
+    ciclos_truncados: bool
+    asignatura_objetivo: AsignaturaResumen
+
+
+class RutaNoDisponible(BaseModel):
+    error: str
+    asignatura_objetivo: AsignaturaResumen
+
+
+class AsignaturasPorNivel(BaseModel):
+    niveles: Dict[int, NivelTopologico]
+    no_asignadas: List[AsignaturaNoAsignada]
+    total_niveles: int
+    total_asignaturas: int
+    asignaturas_asignadas: int
+    asignaturas_no_asignadas: int
@@ -0,0 +1,196 @@
+from collections import deque
+from typing import Dict, Iterable, List
+
+from sqlalchemy.orm import Session
+
+from app.models.asignatura import Asignatura, asignatura_ancestro, prerequisito
+
+
+class AncestrosService:
+    """
+    Mantenimiento y consulta de la tabla de cierre ``asignatura_ancestros``.
+
+    Cada cambio en los prerrequisitos solo altera los ancestros de la
+    asignatura modificada y de sus descendientes, por lo que únicamente se
+    recalculan esas filas. Las escrituras deben hacerse en la misma
+    transacción que el cambio de prerrequisitos, después de un flush.
+    """
+
+    @staticmethod
+    def get_ancestros(db: Session, asignatura_ids: Iterable[int]) -> Dict[int, int]:
+        """
+        Obtiene en una sola consulta los prerrequisitos directos e indirectos
+        de una o varias asignaturas.
+
+        Args:
+            db: Sesión de base de datos
+            asignatura_ids: IDs de las asignaturas
+
+        Returns:
+            Diccionario ancestro_id -> menor profundidad desde cualquiera de
+            las asignaturas
+        """
+        ancestros: Dict[int, int] = {}
+        for ancestro_id, profundidad in db.query(
+            asignatura_ancestro.c.ancestro_id, asignatura_ancestro.c.profundidad
+        ).filter(asignatura_ancestro.c.asignatura_id.in_(list(asignatura_ids))):
+            if ancestros.get(ancestro_id, profundidad) >= profundidad:
+                ancestros[ancestro_id] = profundidad
+
+        return ancestros
+
+    @staticmethod
+    def get_descendientes(db: Session, asignatura_id: int) -> List[int]:
+        """
+        Obtiene las asignaturas que tienen a la asignatura como prerrequisito
+        directo o indirecto.
+        """
+        return [
+            fila[0]
+            for fila in db.query(asignatura_ancestro.c.asignatura_id).filter(
+                asignatura_ancestro.c.ancestro_id == asignatura_id
+            )
+        ]
+
+    @staticmethod
+    def actualizar_asignatura(db: Session, asignatura_id: int) -> None:
+        """
+        Recalcula los ancestros de una asignatura y de sus descendientes
+        después de agregar o eliminar uno de sus prerrequisitos directos.
+        El cambio de prerrequisitos ya debe estar en la sesión (flush).
+
+        Args:
+            db: Sesión de base de datos
+            asignatura_id: ID de la asignatura cuyos prerrequisitos cambiaron
+        """
+        afectadas = AncestrosService.get_descendientes(db, asignatura_id)
+        afectadas.append(asignatura_id)
+        AncestrosService.recalcular(db, afectadas)
+
+    @staticmethod
+    def eliminar_asignatura(db: Session, asignatura: Asignatura) -> None:
+        """
+        Elimina una asignatura junto con sus filas de la tabla de cierre y
+        recalcula los ancestros de las que dependían de ella.
+
+        Args:
+            db: Sesión de base de datos
+            asignatura: Asignatura a eliminar
+        """
+        descendientes = AncestrosService.get_descendientes(db, asignatura.id)
+
+        db.execute(
+            asignatura_ancestro.delete().where(
+                (asignatura_ancestro.c.asignatura_id == asignatura.id)
+                | (asignatura_ancestro.c.ancestro_id == asignatura.id)
+            )
+        )
+        db.delete(asignatura)
+        db.flush()
+
+        AncestrosService.recalcular(
+            db, [d for d in descendientes if d != asignatura.id]
+        )
+
+    @staticmethod
+    def reconstruir(db: Session) -> int:
+        """
+        Reconstruye la tabla de cierre completa a partir de los prerrequisitos.
+
+        Args:
+            db: Sesión de base de datos
+
+        Returns:
+            Número de filas de la tabla
+        """
+        ids = [fila[0] for fila in db.query(Asignatura.id)]
+        db.execute(asignatura_ancestro.delete())
+        return AncestrosService.recalcular(db, ids)
+
+    @staticmethod
+    def recalcular(db: Session, asignatura_ids: List[int]) -> int:
+        """
+        Reemplaza las filas de la tabla de cierre de un conjunto de
+        asignaturas, que debe incluir a todos sus descendientes.
+
+        Para cada asignatura se hace un BFS por sus prerrequisitos directos
+        dentro del conjunto; al llegar a una asignatura fuera de él, cuyas
+        filas siguen siendo válidas, se reutilizan sus ancestros de la tabla
+        en lugar de seguir recorriendo. Si los datos tienen ciclos, las
+        asignaturas del ciclo quedan como ancestros de sí mismas.
+
+        Args:
+            db: Sesión de base de datos
+            asignatura_ids: IDs de las asignaturas a recalcular
+
+        Returns:
+            Número de filas insertadas
+        """
+        afectadas = set(asignatura_ids)
+        if not afectadas:
+            return 0
+
+        predecesores: Dict[int, List[int]] = {a: [] for a in afectadas}
+        for asignatura_id, prerequisito_id in db.query(
+            prerequisito.c.asignatura_id, prerequisito.c.prerequisito_id
+        ).filter(prerequisito.c.asignatura_id.in_(afectadas)):
+            predecesores[asignatura_id].append(prerequisito_id)
+
+        frontera = {
+            pre_id
+            for pres in predecesores.values()
+            for pre_id in pres
+            if pre_id not in afectadas
+        }
+        ancestros_frontera: Dict[int, List] = {pre_id: [] for pre_id in frontera}
+        if frontera:
+            for asignatura_id, ancestro_id, profundidad in db.query(
+                asignatura_ancestro.c.asignatura_id,
+                asignatura_ancestro.c.ancestro_id,
+                asignatura_ancestro.c.profundidad,
+            ).filter(asignatura_ancestro.c.asignatura_id.in_(frontera)):
+                ancestros_frontera[asignatura_id].append((ancestro_id, profundidad))
+
+        filas = []
+        for asignatura_id in afectadas:
+            distancia: Dict[int, int] = {}
+            visitadas = set()
+            cola = deque((pre_id, 1) for pre_id in predecesores[asignatura_id])
+
+            while cola:
+                actual, profundidad = cola.popleft()
+                if actual in visitadas:
+                    continue
+                visitadas.add(actual)
+                if distancia.get(actual, profundidad) >= profundidad:
+                    distancia[actual] = profundidad
+
+                if actual in afectadas:
+                    cola.extend(
+                        (pre_id, profundidad + 1) for pre_id in predecesores[actual]
+                    )
+                    continue
+
+                for ancestro_id, extra in ancestros_frontera[actual]:
+                    total = profundidad + extra
+                    if distancia.get(ancestro_id, total) >= total:
+                        distancia[ancestro_id] = total
+
+            filas.extend(
+                {
+                    "asignatura_id": asignatura_id,
+                    "ancestro_id": ancestro_id,
+                    "profundidad": profundidad,
+                }
+                for ancestro_id, profundidad in distancia.items()
+            )
+
+        db.execute(
+            asignatura_ancestro.delete().where(
+                asignatura_ancestro.c.asignatura_id.in_(afectadas)
+            )
+        )
+        if filas:
+            db.execute(asignatura_ancestro.insert(), filas)
+
+        return len(filas)
@@ -1,97 +1,815 @@
-from typing import Dict, List, Optional, Tuple, Any
+import json
+import threading
+from collections import defaultdict
+from typing import Collection, Dict, List, Optional, Tuple, Any
+from sqlalchemy import Column, Table, event, func, select, union
 from sqlalchemy.orm import Session
-from collections import deque
 
-from app.models.asignatura import Asignatura
+from app.models.asignatura import Asignatura, corequisito, prerequisito
 from app.models.pensum import Pensum
 from app.models.trimestre import Trimestre
 from app.models.asignatura import AsignaturaTrimestre
 
-from app.core.graph import AsignaturaGrafo
+from app.core.cache import CacheLRU
+from app.core.condensacion import CondensacionCorequisitos
+from app.core.config import settings
+from app.core.graph import AsignaturaGrafo, AsignaturaGrafoBase
+from app.core.graph_csr import AsignaturaGrafoCSR
+from app.core.orden_topologico import OrdenTopologicoDinamico
+from app.services.ancestros_service import AncestrosService
+from app.services.version_service import VersionService
+
+
+GRAFO_BACKENDS = {
+    "networkx": AsignaturaGrafo,
+    "csr": AsignaturaGrafoCSR,
+}
+
+grafo_cache = CacheLRU(
+    max_entradas=settings.GRAFO_CACHE_MAX_ENTRADAS,
+    max_bytes=settings.GRAFO_CACHE_MAX_BYTES,
+    calcular_tamano=lambda grafo: grafo.estimate_memory(),
+)
+
+malla_cache = CacheLRU(
+    max_entradas=settings.MALLA_CACHE_MAX_ENTRADAS,
+    max_bytes=settings.MALLA_CACHE_MAX_BYTES,
+    calcular_tamano=lambda malla: len(json.dumps(malla, default=str)),
+)
+
+# Respuestas HTTP ya serializadas (ver RespuestaService), por clave de
+# endpoint, parámetros y versión de los datos
+respuestas_cache = CacheLRU(
+    max_entradas=settings.RESPUESTAS_CACHE_MAX_ENTRADAS,
+    max_bytes=settings.RESPUESTAS_CACHE_MAX_BYTES,
+    calcular_tamano=lambda respuesta: respuesta.tamano(),
+)
+
+# Pensum se incluye por los datos del pensum que trae la malla
+_MODELOS_DEL_GRAFO = (Asignatura, AsignaturaTrimestre, Trimestre, Pensum)
+
+# Orden topológico en línea del catálogo completo, usado para validar los
+# prerrequisitos nuevos antes de guardarlos, sobre los grupos de
+# corequisitos condensados (como los ciclos del grafo), y la versión del
+# catálogo (pensum_versiones) con la que está al día
+_orden_prerequisitos: Optional[OrdenTopologicoDinamico] = None
+_grupos_orden: Optional[CondensacionCorequisitos] = None
+_version_orden: Optional[int] = None
+_lock_orden = threading.Lock()
+
+# Validaciones de un prerrequisito nuevo antes de desistir cuando otros
+# procesos modifican el catálogo al mismo tiempo
+_INTENTOS_VALIDACION = 3
+
+
+@event.listens_for(Session, "after_flush")
+def _marcar_cambios_del_grafo(session: Session, flush_context) -> None:
+    """
+    Marca la sesión si el flush modificó asignaturas, sus prerrequisitos,
+    corequisitos o su asignación a trimestres.
+    """
+    for obj in (*session.new, *session.dirty, *session.deleted):
+        if isinstance(obj, _MODELOS_DEL_GRAFO):
+            session.info["grafo_modificado"] = True
+            return
+
+
+@event.listens_for(Session, "after_commit")
+def _invalidar_grafos_tras_commit(session: Session) -> None:
+    """
+    Invalida las cachés de grafos y mallas cuando se confirma una
+    transacción que modificó los datos del grafo.
+    """
+    global _orden_prerequisitos
+
+    orden_al_dia = session.info.pop("orden_prerequisitos_al_dia", False)
+    if session.info.pop("grafo_modificado", False):
+        GrafoService.invalidar_cache()
+        if not orden_al_dia:
+            _orden_prerequisitos = None
+
+
+@event.listens_for(Session, "after_rollback")
+def _descartar_cambios_del_grafo(session: Session) -> None:
+    session.info.pop("grafo_modificado", None)
+    session.info.pop("orden_prerequisitos_al_dia", None)
 
 
 class GrafoService:
+    @staticmethod
+    def get_grafo(
+        db: Session, pensum_id: Optional[int] = None, version: Optional[int] = None
+    ) -> AsignaturaGrafoBase:
+        """
+        Obtiene el grafo de asignaturas de un pensum desde la caché,
+        construyéndolo si no está disponible o si se construyó con otra
+        versión de los datos del pensum (pensum_versiones), por ejemplo tras
+        escrituras de otro proceso o de un script.
+
+        El grafo devuelto es compartido entre peticiones y no debe modificarse.
+
+        Args:
+            db: Sesión de base de datos
+            pensum_id: ID del pensum (opcional, None para el catálogo completo)
+            version: Versión de los datos del pensum, si ya se consultó
+                (opcional; por ejemplo, la del ETag de la respuesta)
+
+        Returns:
+            AsignaturaGrafoBase: Instancia del grafo de asignaturas
+        """
+        pensum_id = pensum_id or None
+        if version is None:
+            version, _ = VersionService.get_version(db, pensum_id)
+
+        return grafo_cache.get_or_set(
+            pensum_id,
+            lambda: GrafoService.build_asignaturas_graph(db, pensum_id),
+            version,
+        )
+
+    @staticmethod
+    def get_grafo_ruta(
+        db: Session,
+        asignatura_ids: List[int],
+        pensum_id: Optional[int] = None,
+        version: Optional[int] = None,
+    ) -> AsignaturaGrafoBase:
+        """
+        Obtiene un grafo sobre el que calcular las rutas de las asignaturas
+        objetivo, según settings.GRAFO_MOTOR:
+
+        - "memoria": el grafo completo del pensum desde la caché.
+        - "tabla": un grafo reducido con solo las asignaturas que pueden
+          intervenir en la ruta, obtenidas de la tabla de cierre
+          asignatura_ancestros, sin cargar el pensum completo.
+        - "cte": el mismo grafo reducido, obtenido con una consulta
+          recursiva sobre prerequisitos, corequisitos y trimestres.
+        - "auto": "memoria" si el grafo del pensum ya está en caché o el
+          pensum tiene hasta settings.GRAFO_AUTO_MAX_ASIGNATURAS
+          asignaturas, "cte" si es más grande.
+
+        Con el grafo reducido, solo los ciclos que afectan a los objetivos
+        impiden calcular su ruta.
+
+        Todos los endpoints que calculan rutas (/ruta, /ruta-por-codigo y
+        /rutas) obtienen su grafo aquí. Los que abarcan el pensum completo
+        (niveles, ciclos, elegibilidad, planificación) usan get_grafo: con
+        ellos el grafo reducido sería el del pensum entero.
+
+        Args:
+            db: Sesión de base de datos
+            asignatura_ids: IDs de las asignaturas objetivo
+            pensum_id: ID del pensum (opcional)
+            version: Versión de los datos del pensum, si ya se consultó (opcional)
+
+        Returns:
+            AsignaturaGrafoBase: Grafo con, al menos, las asignaturas de las rutas
+        """
+        if version is None:
+            version, _ = VersionService.get_version(db, pensum_id)
+
+        motor = GrafoService.get_motor(db, pensum_id, version)
+
+        if motor == "tabla":
+            alcance = GrafoService._get_alcance_tabla(db, asignatura_ids)
+        elif motor == "cte":
+            alcance = GrafoService.get_alcance_cte(db, asignatura_ids, pensum_id)
+        else:
+            return GrafoService.get_grafo(db, pensum_id, version)
+
+        return GrafoService.build_asignaturas_graph(
+            db, pensum_id, asignatura_ids=alcance
+        )
+
+    @staticmethod
+    def get_motor(
+        db: Session, pensum_id: Optional[int] = None, version: Optional[int] = None
+    ) -> str:
+        """
+        Resuelve el motor de rutas configurado en settings.GRAFO_MOTOR,
+        eligiendo entre "memoria" y "cte" según el tamaño del pensum
+        cuando es "auto".
+
+        Args:
+            db: Sesión de base de datos
+            pensum_id: ID del pensum (opcional)
+            version: Versión de los datos del pensum; con "auto", solo un
+                grafo en caché de esa versión cuenta como disponible (opcional)
+
+        Returns:
+            "memoria", "tabla" o "cte"
+        """
+        motor = settings.GRAFO_MOTOR
+        if motor != "auto":
+            return motor
+
+        pensum_id = pensum_id or None
+        if grafo_cache.contiene(pensum_id, version):
+            return "memoria"
+
+        if pensum_id:
+            total = (
+                db.query(func.count(func.distinct(AsignaturaTrimestre.asignatura_id)))
+                .join(Trimestre, AsignaturaTrimestre.trimestre_id == Trimestre.id)
+                .filter(Trimestre.pensum_id == pensum_id)
+                .scalar()
+            )
+        else:
+            total = db.query(func.count(Asignatura.id)).scalar()
+
+        return "cte" if total > settings.GRAFO_AUTO_MAX_ASIGNATURAS else "memoria"
+
+    @staticmethod
+    def get_alcance_cte(
+        db: Session, asignatura_ids: List[int], pensum_id: Optional[int] = None
+    ) -> List[int]:
+        """
+        Calcula con una sola consulta recursiva (WITH RECURSIVE) las
+        asignaturas que pueden intervenir en las rutas de los objetivos:
+        sus prerrequisitos directos e indirectos y, en ambos sentidos, los
+        corequisitos de todas ellas, recorriendo solo asignaturas del pensum.
+
+        La recursión combina los pasos con UNION sobre el ID de la
+        asignatura, que descarta las ya visitadas: cada asignatura se visita
+        una sola vez y la consulta termina aunque los datos tengan ciclos.
+
+        Args:
+            db: Sesión de base de datos
+            asignatura_ids: IDs de las asignaturas objetivo
+            pensum_id: ID del pensum para limitar el recorrido (opcional)
+
+        Returns:
+            IDs de las asignaturas alcanzadas, incluidos los objetivos
+        """
+        relaciones = union(
+            select(
+                prerequisito.c.asignatura_id.label("origen"),
+                prerequisito.c.prerequisito_id.label("destino"),
+            ),
+            select(corequisito.c.asignatura_id, corequisito.c.corequisito_id),
+            select(corequisito.c.corequisito_id, corequisito.c.asignatura_id),
+        ).subquery("relaciones")
+
+        alcance = select(Asignatura.id.label("asignatura_id")).where(
+            Asignatura.id.in_(asignatura_ids)
+        )
+        alcance = alcance.cte("alcance", recursive=True)
+
+        paso = select(relaciones.c.destino).select_from(
+            alcance.join(relaciones, relaciones.c.origen == alcance.c.asignatura_id)
+        )
+        if pensum_id:
+            paso = paso.where(
+                relaciones.c.destino.in_(
+                    select(AsignaturaTrimestre.asignatura_id)
+                    .join(Trimestre, AsignaturaTrimestre.trimestre_id == Trimestre.id)
+                    .where(Trimestre.pensum_id == pensum_id)
+                )
+            )
+        alcance = alcance.union(paso)
+
+        return list(db.scalars(select(alcance.c.asignatura_id)))
+
+    @staticmethod
+    def _get_alcance_tabla(db: Session, asignatura_ids: List[int]) -> List[int]:
+        """
+        Calcula con la tabla de cierre el conjunto de asignaturas que pueden
+        intervenir en las rutas de los objetivos: sus ancestros y los grupos
+        de corequisitos de todas ellas, con los ancestros de esos grupos,
+        hasta que el conjunto no crece. Cada paso es una consulta indexada.
+
+        Con pensum, el conjunto puede incluir asignaturas alcanzables solo a
+        través de otras fuera del pensum; el grafo del pensum las deja
+        desconectadas y no aparecen en la ruta.
+        """
+        alcance = dict.fromkeys(asignatura_ids)
+        nuevas = list(alcance)
+
+        while nuevas:
+            # Corequisitos de las nuevas (en ambos sentidos) hasta cerrar sus
+            # grupos, y luego los ancestros de todo lo agregado
+            grupo = nuevas
+            while grupo:
+                siguientes = []
+                for co_a, co_b in db.query(
+                    corequisito.c.asignatura_id, corequisito.c.corequisito_id
+                ).filter(
+                    corequisito.c.asignatura_id.in_(grupo)
+                    | corequisito.c.corequisito_id.in_(grupo)
+                ):
+                    for co_id in (co_a, co_b):
+                        if co_id not in alcance:
+                            alcance[co_id] = None
+                            siguientes.append(co_id)
+                nuevas.extend(siguientes)
+                grupo = siguientes
+
+            ancestros = AncestrosService.get_ancestros(db, nuevas)
+            nuevas = [a for a in ancestros if a not in alcance]
+            alcance.update(dict.fromkeys(nuevas))
+
+        return list(alcance)
+
+    @staticmethod
+    def invalidar_cache(pensum_id: Optional[int] = None) -> None:
+        """
+        Invalida las cachés de grafos y de mallas. La caché de respuestas
+        se vacía siempre: sus claves incluyen la versión de los datos, pero
+        así no se guardan respuestas calculadas con un grafo anterior.
+
+        Args:
+            pensum_id: ID del pensum a invalidar (opcional, None invalida todos)
+        """
+        if pensum_id:
+            grafo_cache.invalidate(pensum_id)
+            malla_cache.invalidate(pensum_id)
+        else:
+            grafo_cache.clear()
+            malla_cache.clear()
+        respuestas_cache.clear()
+
+    @staticmethod
+    def get_malla(
+        db: Session, pensum: Pensum, version: Optional[int] = None
+    ) -> Dict:
+        """
+        Obtiene la malla del pensum desde la caché, construyéndola si no
+        está disponible o si se construyó con otra versión de los datos del
+        pensum.
+
+        La malla devuelta es compartida entre peticiones y no debe modificarse.
+
+        Args:
+            db: Sesión de base de datos
+            pensum: Pensum
+            version: Versión de los datos del pensum, si ya se consultó (opcional)
+
+        Returns:
+            Diccionario con el pensum y sus trimestres con sus asignaturas
+        """
+        if version is None:
+            version, _ = VersionService.get_version(db, pensum.id)
+
+        return malla_cache.get_or_set(
+            pensum.id, lambda: GrafoService.build_malla(db, pensum), version
+        )
+
+    @staticmethod
+    def build_malla(db: Session, pensum: Pensum) -> Dict:
+        """
+        Construye la malla de un pensum: todos sus trimestres con sus
+        asignaturas y los IDs de sus prerrequisitos y corequisitos.
+
+        Usa un número fijo de consultas: trimestres, asignaturas por
+        trimestre y una por cada tabla de asociación.
+
+        Args:
+            db: Sesión de base de datos
+            pensum: Pensum
+
+        Returns:
+            Diccionario con el pensum y sus trimestres con sus asignaturas
+        """
+        trimestres = {
+            trimestre_id: {"id": trimestre_id, "numero": numero, "asignaturas": []}
+            for trimestre_id, numero in db.query(Trimestre.id, Trimestre.numero)
+            .filter(Trimestre.pensum_id == pensum.id)
+            .order_by(Trimestre.numero, Trimestre.id)
+        }
+
+        filas = (
+            db.query(
+                AsignaturaTrimestre.trimestre_id,
+                Asignatura.id,
+                Asignatura.codigo,
+                Asignatura.nombre,
+                Asignatura.creditos,
+                Asignatura.req_creditos,
+            )
+            .join(Asignatura, AsignaturaTrimestre.asignatura_id == Asignatura.id)
+            .join(Trimestre, AsignaturaTrimestre.trimestre_id == Trimestre.id)
+            .filter(Trimestre.pensum_id == pensum.id)
+            .order_by(AsignaturaTrimestre.trimestre_id, Asignatura.id)
+            .all()
+        )
+
+        creditos = {fila.id: fila.creditos or 0 for fila in filas}
+        ids = list(creditos)
+        prerequisitos_ids = GrafoService.get_relacionadas(
+            db, prerequisito, prerequisito.c.prerequisito_id, ids
+        )
+        corequisitos_ids = GrafoService.get_relacionadas(
+            db, corequisito, corequisito.c.corequisito_id, ids
+        )
+
+        for trimestre_id, asignatura_id, codigo, nombre, creditos_asig, req in filas:
+            trimestres[trimestre_id]["asignaturas"].append(
+                {
+                    "id": asignatura_id,
+                    "codigo": codigo,
+                    "nombre": nombre,
+                    "creditos": creditos_asig,
+                    "req_creditos": req,
+                    "prerequisitos_ids": prerequisitos_ids[asignatura_id],
+                    "corequisitos_ids": corequisitos_ids[asignatura_id],
+                }
+            )
+
+        return {
+            "pensum": {
+                "id": pensum.id,
+                "codigo": pensum.codigo,
+                "fecha_aprobacion": pensum.fecha_aprobacion,
+                "resolucion": pensum.resolucion,
+                "carrera_id": pensum.carrera_id,
+            },
+            "trimestres": list(trimestres.values()),
+            "total_trimestres": len(trimestres),
+            "total_asignaturas": len(ids),
+            "creditos_total": sum(creditos.values()),
+        }
+
+    @staticmethod
+    def get_relacionadas(
+        db: Session, tabla: Table, columna_relacionada: Column, ids: List[int]
+    ) -> Dict[int, List[int]]:
+        """
+        Obtiene en una sola consulta los IDs relacionados de varias
+        asignaturas en una tabla de asociación (prerequisitos o corequisitos).
+
+        Args:
+            db: Sesión de base de datos
+            tabla: Tabla de asociación
+            columna_relacionada: Columna con el ID de la asignatura relacionada
+            ids: IDs de las asignaturas
+
+        Returns:
+            Diccionario asignatura_id -> IDs relacionados en orden ascendente
+        """
+        relacionadas = {asignatura_id: [] for asignatura_id in ids}
+        if not ids:
+            return relacionadas
+
+        for asignatura_id, relacionada_id in (
+            db.query(tabla.c.asignatura_id, columna_relacionada)
+            .filter(tabla.c.asignatura_id.in_(ids))
+            .order_by(tabla.c.asignatura_id, columna_relacionada)
+        ):
+            relacionadas[asignatura_id].append(relacionada_id)
+
+        return relacionadas
+
+    @staticmethod
+    def _get_orden_prerequisitos(
+        db: Session, asignatura_ids: Collection[int]
+    ) -> Tuple[OrdenTopologicoDinamico, CondensacionCorequisitos, int]:
+        """
+        Obtiene el orden topológico en línea del catálogo, los grupos de
+        corequisitos sobre cuyos representantes está definido y la versión
+        del catálogo con la que está al día. Se reconstruye con tres
+        consultas si no está disponible, si la versión cambió desde que se
+        construyó (por ejemplo, por escrituras de otro proceso o de un
+        script) o si no contiene alguna de las asignaturas indicadas. Debe
+        llamarse con _lock_orden.
+        """
+        global _orden_prerequisitos, _grupos_orden, _version_orden
+
+        version, _ = VersionService.get_version(db)
+        if (
+            _orden_prerequisitos is None
+            or _version_orden != version
+            or any(a not in _grupos_orden.representante for a in asignatura_ids)
+        ):
+            ids = [fila[0] for fila in db.query(Asignatura.id).order_by(Asignatura.id)]
+            aristas = GrafoService._query_relaciones(
+                db, prerequisito, prerequisito.c.prerequisito_id, None
+            )
+            corequisitos = GrafoService._query_relaciones(
+                db, corequisito, corequisito.c.corequisito_id, None
+            )
+
+            predecesores, sucesores, vecinos = (defaultdict(list) for _ in range(3))
+            for asignatura_id, prerequisito_id in aristas:
+                predecesores[asignatura_id].append(prerequisito_id)
+                sucesores[prerequisito_id].append(asignatura_id)
+            for asignatura_id, corequisito_id in corequisitos:
+                vecinos[asignatura_id].append(corequisito_id)
+                vecinos[corequisito_id].append(asignatura_id)
+
+            grupos = CondensacionCorequisitos(
+                ids,
+                lambda a: predecesores.get(a, ()),
+                lambda a: sucesores.get(a, ()),
+                lambda a: vecinos.get(a, ()),
+            )
+            representante = grupos.representante
+            _orden_prerequisitos = OrdenTopologicoDinamico(
+                grupos.representantes,
+                ((representante[a], representante[p]) for a, p in aristas),
+            )
+            _grupos_orden = grupos
+            _version_orden = version
+
+        return _orden_prerequisitos, _grupos_orden, version
+
+    @staticmethod
+    def _sin_escrituras_concurrentes(db: Session, version: int) -> bool:
+        """
+        Indica, después del flush de un cambio de prerrequisitos, si la
+        versión del catálogo es la siguiente a la leída antes del cambio. Si
+        no, otra transacción modificó el catálogo entre medio y el orden en
+        línea puede no estar al día. El flush ya tomó el bloqueo de escritura
+        (o el de la fila de versión), por lo que la lectura es consistente
+        hasta el commit.
+        """
+        return VersionService.get_version(db)[0] == version + 1
+
+    @staticmethod
+    def agregar_prerequisito(
+        db: Session, asignatura: Asignatura, prerequisito_obj: Asignatura
+    ) -> Optional[List[int]]:
+        """
+        Agrega un prerrequisito a una asignatura solo si no crea un ciclo.
+
+        La validación usa un orden topológico en línea (Pearce–Kelly) que se
+        actualiza con cada prerrequisito agregado, por lo que no hace falta
+        revisar el grafo completo en cada escritura. Como al detectar ciclos
+        en las rutas, el orden es sobre los grupos de corequisitos
+        condensados: ambas asignaturas se reemplazan por su grupo, y se
+        rechaza un prerrequisito entre miembros del mismo grupo.
+
+        El orden se usa solo si está al día con la versión del catálogo; si
+        otra transacción modifica el catálogo entre la validación y el
+        guardado, se deshace el cambio y se valida de nuevo con el orden
+        reconstruido.
+
+        Args:
+            db: Sesión de base de datos
+            asignatura: Asignatura a la que se agrega el prerrequisito
+            prerequisito_obj: Asignatura prerrequisito
+
+        Returns:
+            La lista de IDs del ciclo que se formaría (empieza y termina en la
+            asignatura; los grupos de corequisitos intermedios se indican con
+            su representante), en cuyo caso no se guarda nada, o None si se
+            agregó
+
+        Raises:
+            RuntimeError: Si el catálogo cambió durante cada intento de validación
+        """
+        global _orden_prerequisitos, _version_orden
+
+        asignatura_id, prerequisito_id = asignatura.id, prerequisito_obj.id
+
+        with _lock_orden:
+            for _ in range(_INTENTOS_VALIDACION):
+                orden, grupos, version = GrafoService._get_orden_prerequisitos(
+                    db, (asignatura_id, prerequisito_id)
+                )
+                grupo = grupos.representante[asignatura_id]
+                grupo_prerequisito = grupos.representante[prerequisito_id]
+
+                ciclo = orden.buscar_ciclo(grupo, grupo_prerequisito)
+                if ciclo:
+                    if asignatura_id == prerequisito_id:
+                        return [asignatura_id, asignatura_id]
+                    # El ciclo va del grupo de la asignatura al del
+                    # prerrequisito y se cierra con la arista nueva
+                    return [
+                        asignatura_id, *ciclo[1:-2], prerequisito_id, asignatura_id
+                    ]
+
+                if prerequisito_obj in asignatura.prerequisitos:
+                    return None
+
+                asignatura.prerequisitos.append(prerequisito_obj)
+                db.flush()
+                if not GrafoService._sin_escrituras_concurrentes(db, version):
+                    db.rollback()
+                    _orden_prerequisitos = None
+                    continue
+
+                AncestrosService.actualizar_asignatura(db, asignatura_id)
+                db.info["orden_prerequisitos_al_dia"] = True
+                db.commit()
+                orden.agregar_prerequisito(grupo, grupo_prerequisito)
+                _version_orden = version + 1
+                return None
+
+        raise RuntimeError(
+            f"El catálogo cambió mientras se validaba el prerrequisito "
+            f"{prerequisito_id} de la asignatura {asignatura_id}"
+        )
+
+    @staticmethod
+    def eliminar_prerequisito(
+        db: Session, asignatura: Asignatura, prerequisito_obj: Asignatura
+    ) -> bool:
+        """
+        Elimina un prerrequisito de una asignatura, actualizando la tabla de
+        cierre y, si está al día con la versión del catálogo, el orden
+        topológico en línea (si no, se descarta y se reconstruye en la
+        próxima validación).
+
+        Args:
+            db: Sesión de base de datos
+            asignatura: Asignatura de la que se elimina el prerrequisito
+            prerequisito_obj: Asignatura prerrequisito
+
+        Returns:
+            True si se eliminó, False si no era prerrequisito de la asignatura
+        """
+        global _version_orden
+
+        if prerequisito_obj not in asignatura.prerequisitos:
+            return False
+
+        with _lock_orden:
+            version, _ = VersionService.get_version(db)
+            asignatura.prerequisitos.remove(prerequisito_obj)
+            db.flush()
+            al_dia = (
+                _orden_prerequisitos is not None
+                and _version_orden == version
+                and GrafoService._sin_escrituras_concurrentes(db, version)
+            )
+            AncestrosService.actualizar_asignatura(db, asignatura.id)
+            # Sin la marca, el commit descarta el orden
+            db.info["orden_prerequisitos_al_dia"] = al_dia
+            db.commit()
+            if al_dia:
+                representante = _grupos_orden.representante
+                _orden_prerequisitos.eliminar_prerequisito(
+                    representante[asignatura.id], representante[prerequisito_obj.id]
+                )
+                _version_orden = version + 1
+
+        return True
+
+    @staticmethod
+    def eliminar_asignatura(db: Session, asignatura: Asignatura) -> None:
+        """
+        Elimina una asignatura, actualizando la tabla de cierre.
+
+        Args:
+            db: Sesión de base de datos
+            asignatura: Asignatura a eliminar
+        """
+        AncestrosService.eliminar_asignatura(db, asignatura)
+        db.commit()
+
     @staticmethod
     def build_asignaturas_graph(
-        db: Session, pensum_id: Optional[int] = None
-    ) -> AsignaturaGrafo:
+        db: Session,
+        pensum_id: Optional[int] = None,
+        backend: Optional[str] = None,
+        asignatura_ids: Optional[Collection[int]] = None,
+    ) -> AsignaturaGrafoBase:
         """
         Construye el grafo de asignaturas con sus prerrequisitos y corequisitos.
 
+        Usa un número fijo de consultas: una para las asignaturas con su
+        trimestre y una por cada tabla de asociación (prerequisitos y
+        corequisitos), sin importar el tamaño del pensum.
+
         Args:
             db: Sesión de base de datos
             pensum_id: ID del pensum para filtrar asignaturas (opcional)
+            backend: Motor del grafo, "networkx" o "csr" (por defecto settings.GRAFO_BACKEND)
+            asignatura_ids: Limita el grafo a estas asignaturas (opcional)
 
         Returns:
-            AsignaturaGrafo: Instancia del grafo de asignaturas
+            AsignaturaGrafoBase: Instancia del grafo de asignaturas
         """
-        grafo = AsignaturaGrafo()
+        grafo_cls = GRAFO_BACKENDS[backend or settings.GRAFO_BACKEND]
 
-        if pensum_id:
-            from app.models.trimestre import Trimestre
-            from app.models.asignatura import AsignaturaTrimestre
+        columnas = (
+            Asignatura.id,
+            Asignatura.codigo,
+            Asignatura.nombre,
+            Asignatura.creditos,
+            Asignatura.req_creditos,
+        )
 
-            asignaturas = (
-                db.query(Asignatura)
+        if pensum_id:
+            query = (
+                db.query(*columnas, Trimestre.numero, Trimestre.pensum_id)
                 .join(
                     AsignaturaTrimestre,
                     Asignatura.id == AsignaturaTrimestre.asignatura_id,
                 )
                 .join(Trimestre, AsignaturaTrimestre.trimestre_id == Trimestre.id)
                 .filter(Trimestre.pensum_id == pensum_id)
-                .distinct()
-                .all()
             )
+            if asignatura_ids is not None:
+                query = query.filter(Asignatura.id.in_(asignatura_ids))
+            filas = query.order_by(Asignatura.id, Trimestre.numero).all()
         else:
-            asignaturas = db.query(Asignatura).all()
+            query = db.query(*columnas)
+            if asignatura_ids is not None:
+                query = query.filter(Asignatura.id.in_(asignatura_ids))
+            filas = [(*fila, None, None) for fila in query.order_by(Asignatura.id).all()]
+
+        asignaturas = []
+        vistas = set()
+
+        for (
+            asignatura_id,
+            codigo,
+            nombre,
+            creditos,
+            req_creditos,
+            trimestre,
+            trimestre_pensum_id,
+        ) in filas:
+            # Una asignatura ubicada en varios trimestres del mismo pensum
+            # conserva el primero.
+            if asignatura_id in vistas:
+                continue
+            vistas.add(asignatura_id)
+
+            asignatura_data = {
+                "codigo": codigo,
+                "nombre": nombre,
+                "creditos": creditos,
+                "req_creditos": req_creditos,
+            }
+
+            if trimestre is not None:
+                asignatura_data["trimestre"] = trimestre
+                asignatura_data["pensum_id"] = trimestre_pensum_id
+
+            asignaturas.append((asignatura_id, asignatura_data))
 
         print(f"Total de asignaturas para el grafo: {len(asignaturas)}")
 
-        for asignatura in asignaturas:
-            trimestre_info = None
-            if pensum_id:
-                from app.models.trimestre import Trimestre
-
-                trimestre_info = (
-                    db.query(Trimestre.numero, Trimestre.pensum_id)
-                    .join(
-                        AsignaturaTrimestre,
-                        AsignaturaTrimestre.trimestre_id == Trimestre.id,
-                    )
-                    .filter(AsignaturaTrimestre.asignatura_id == asignatura.id)
-                    .filter(Trimestre.pensum_id == pensum_id)
-                    .first()
-                )
+        # Las aristas se limitan a las asignaturas ya cargadas
+        filtro = vistas if pensum_id or asignatura_ids is not None else None
+        prerequisitos = GrafoService._query_relaciones(
+            db, prerequisito, prerequisito.c.prerequisito_id, pensum_id, filtro
+        )
+        corequisitos = GrafoService._query_relaciones(
+            db, corequisito, corequisito.c.corequisito_id, pensum_id, filtro
+        )
 
-            asignatura_data = {
-                "codigo": asignatura.codigo,
-                "nombre": asignatura.nombre,
-                "creditos": asignatura.creditos,
-                "req_creditos": asignatura.req_creditos,
-            }
+        return grafo_cls.from_data(asignaturas, prerequisitos, corequisitos)
 
-            if trimestre_info:
-                asignatura_data["trimestre"] = trimestre_info[0]
-                asignatura_data["pensum_id"] = trimestre_info[1]
+    @staticmethod
+    def _query_relaciones(
+        db: Session,
+        tabla: Table,
+        columna_relacionada: Column,
+        pensum_id: Optional[int],
+        asignatura_ids: Optional[Collection[int]] = None,
+    ) -> List[Tuple[int, int]]:
+        """
+        Obtiene en una sola consulta las aristas de una tabla de asociación
+        (prerequisitos o corequisitos), limitadas a las asignaturas del pensum.
 
-            grafo.add_asignatura(asignatura.id, asignatura_data)
+        Args:
+            db: Sesión de base de datos
+            tabla: Tabla de asociación
+            columna_relacionada: Columna con el ID de la asignatura relacionada
+            pensum_id: ID del pensum para filtrar las aristas (opcional)
+            asignatura_ids: Limita las aristas a las que unen estas asignaturas
+                (opcional; con pensum, por defecto las del pensum)
 
-        asignatura_ids = [a.id for a in asignaturas]
+        Returns:
+            Lista de tuplas (asignatura_id, id_relacionado)
+        """
+        query = db.query(tabla.c.asignatura_id, columna_relacionada)
+        asignaturas_pensum = (
+            select(AsignaturaTrimestre.asignatura_id)
+            .join(Trimestre, AsignaturaTrimestre.trimestre_id == Trimestre.id)
+            .where(Trimestre.pensum_id == pensum_id)
+        )
+
+        # Solo se filtra en SQL la primera columna: con IN en las dos columnas
+        # de la clave primaria, SQLite prueba todas las combinaciones de ambas
+        # listas. La columna relacionada se filtra al leer las filas.
+        if pensum_id:
+            query = query.filter(tabla.c.asignatura_id.in_(asignaturas_pensum))
+        elif asignatura_ids is not None:
+            query = query.filter(tabla.c.asignatura_id.in_(asignatura_ids))
 
-        for asignatura in asignaturas:
-            for prerequisito in asignatura.prerequisitos:
-                if prerequisito.id in asignatura_ids:
-                    grafo.add_prerequisito(asignatura.id, prerequisito.id)
+        filas = query.order_by(tabla.c.asignatura_id, columna_relacionada).all()
 
-            for corequisito in asignatura.corequisitos:
-                if corequisito.id in asignatura_ids:
-                    grafo.add_corequisito(asignatura.id, corequisito.id)
+        if asignatura_ids is None and pensum_id:
+            asignatura_ids = [fila[0] for fila in db.execute(asignaturas_pensum)]
+        if asignatura_ids is None:
+            return filas
 
-        return grafo
+        permitidas = set(asignatura_ids)
+        return [
+            fila for fila in filas if fila[0] in permitidas and fila[1] in permitidas
+        ]
 
     @staticmethod
     def get_prerequisitos(
-        db: Session, asignatura_id: int, pensum_id: Optional[int] = None
+        db: Session,
+        asignatura_id: int,
+        pensum_id: Optional[int] = None,
+        grafo: Optional[AsignaturaGrafoBase] = None,
     ) -> Dict:
         """
         Obtiene todos los prerrequisitos de una asignatura, tanto directos como indirectos,
@@ -101,6 +819,7 @@ class GrafoService:
             db: Sesión de base de datos
             asignatura_id: ID de la asignatura
             pensum_id: ID del pensum (opcional)
+            grafo: Grafo ya construido para el pensum (opcional, se obtiene con get_grafo_ruta si no se indica)
 
         Returns:
             Diccionario con la asignatura, prerrequisitos directos, todos los prerrequisitos y corequisitos
@@ -109,20 +828,28 @@ class GrafoService:
         if not asignatura:
             return {"error": f"No se encontró asignatura con ID {asignatura_id}"}
 
-        grafo = GrafoService.build_asignaturas_graph(db, pensum_id)
+        if grafo is None:
+            grafo = GrafoService.get_grafo_ruta(db, [asignatura_id], pensum_id)
 
-        trimestre_info = None
-        if pensum_id:
-            trimestre_info = (
-                db.query(Trimestre.numero, Trimestre.pensum_id)
-                .join(
-                    AsignaturaTrimestre,
-                    AsignaturaTrimestre.trimestre_id == Trimestre.id,
-                )
-                .filter(AsignaturaTrimestre.asignatura_id == asignatura_id)
-                .filter(Trimestre.pensum_id == pensum_id)
-                .first()
-            )
+        return GrafoService.get_prerequisitos_de_grafo(grafo, asignatura)
+
+    @staticmethod
+    def get_prerequisitos_de_grafo(
+        grafo: AsignaturaGrafoBase, asignatura: Asignatura
+    ) -> Dict:
+        """
+        Obtiene los prerrequisitos directos, todos los prerrequisitos y los
+        corequisitos de una asignatura a partir de un grafo ya construido,
+        sin consultar la base de datos.
+
+        Args:
+            grafo: Grafo de asignaturas del pensum
+            asignatura: Asignatura objetivo
+
+        Returns:
+            Diccionario con la asignatura, prerrequisitos directos, todos los prerrequisitos y corequisitos
+        """
+        asignatura_id = asignatura.id
 
         asignatura_data = {
             "id": asignatura.id,
@@ -132,9 +859,11 @@ class GrafoService:
             "req_creditos": asignatura.req_creditos,
         }
 
-        if trimestre_info:
-            asignatura_data["trimestre"] = trimestre_info[0]
-            asignatura_data["pensum_id"] = trimestre_info[1]
+        if asignatura_id in grafo:
+            nodo_data = grafo.get_asignatura(asignatura_id)
+            if "trimestre" in nodo_data:
+                asignatura_data["trimestre"] = nodo_data["trimestre"]
+                asignatura_data["pensum_id"] = nodo_data["pensum_id"]
 
         prerrequisitos_directos = []
         for pre_id, pre_data in grafo.get_direct_prerequisitos(asignatura_id):
@@ -187,68 +916,57 @@ class GrafoService:
 
     @staticmethod
     def get_niveles_topologicos(
-        grafo: AsignaturaGrafo, asignatura_id: int
+        grafo: AsignaturaGrafoBase, asignatura_id: int
     ) -> Dict[int, List[Dict]]:
         """
         Organiza los prerrequisitos de una asignatura en niveles topológicos.
 
         Args:
-            grafo: Instancia de AsignaturaGrafo
+            grafo: Instancia del grafo de asignaturas
             asignatura_id: ID de la asignatura objetivo
 
         Returns:
             Diccionario con niveles topológicos de las asignaturas prerrequisito
         """
-        prerrequisitos = [
-            pre_id for pre_id, _ in grafo.get_all_prerequisitos_bfs(asignatura_id)
-        ]
+        return GrafoService.get_niveles_topologicos_multiples(grafo, [asignatura_id])
 
-        nodos = prerrequisitos + [asignatura_id]
+    @staticmethod
+    def get_niveles_topologicos_multiples(
+        grafo: AsignaturaGrafoBase, asignatura_ids: List[int]
+    ) -> Dict[int, List[Dict]]:
+        """
+        Organiza en niveles topológicos combinados los prerrequisitos de
+        varias asignaturas objetivo, junto con las propias asignaturas.
+        Cada asignatura aparece una sola vez aunque sea requerida por
+        varios objetivos.
 
-        subgrafo = AsignaturaGrafo()
+        Args:
+            grafo: Instancia del grafo de asignaturas
+            asignatura_ids: IDs de las asignaturas objetivo
 
-        for nodo_id in nodos:
-            if nodo_id in grafo.prerrequisitos_graph.nodes:
-                data = grafo.prerrequisitos_graph.nodes[nodo_id]
-                subgrafo.add_asignatura(nodo_id, data)
+        Returns:
+            Diccionario con niveles topológicos de las asignaturas
+        """
+        nodos = []
+        for asignatura_id in asignatura_ids:
+            nodos.extend(grafo.get_all_prerequisitos_ids(asignatura_id))
+            nodos.append(asignatura_id)
 
-        for nodo_id in nodos:
-            if nodo_id in grafo.prerrequisitos_graph.nodes:
-                for succ_id in grafo.prerrequisitos_graph.successors(nodo_id):
-                    if (
-                        succ_id in nodos
-                        and succ_id in subgrafo.prerrequisitos_graph.nodes
-                    ):
-                        subgrafo.add_prerequisito(succ_id, nodo_id)
+        nodos = [nodo_id for nodo_id in nodos if nodo_id in grafo]
 
-        if not subgrafo.prerrequisitos_graph.nodes:
+        if not nodos:
             return {}
 
-        in_degree = {node: 0 for node in subgrafo.prerrequisitos_graph.nodes()}
-
-        for node in subgrafo.prerrequisitos_graph.nodes():
-            if node in subgrafo.prerrequisitos_graph:
-                for successor in subgrafo.prerrequisitos_graph.successors(node):
-                    if successor in in_degree:
-                        in_degree[successor] += 1
+        # Kahn sobre los grupos de corequisitos condensados, restringido al
+        # subgrafo de la ruta
+        niveles_ids, _ = grafo.get_niveles_kahn(nodos)
 
         niveles = {}
-        nivel_actual = 0
-
-        queue = deque([node for node, degree in in_degree.items() if degree == 0])
-
-        while queue:
-            nivel_nodos = []
-            nivel_size = len(queue)
-
-            for _ in range(nivel_size):
-                nodo_id = queue.popleft()
-
-                if nodo_id not in subgrafo.prerrequisitos_graph.nodes:
-                    continue
-
-                nodo_data = subgrafo.prerrequisitos_graph.nodes[nodo_id]
-                nivel_nodos.append(
+        for nivel_actual, nivel in enumerate(niveles_ids):
+            niveles[nivel_actual] = []
+            for nodo_id in nivel:
+                nodo_data = grafo.get_asignatura(nodo_id)
+                niveles[nivel_actual].append(
                     {
                         "id": nodo_id,
                         "codigo": nodo_data["codigo"],
@@ -258,15 +976,4 @@ class GrafoService:
                     }
                 )
 
-                if nodo_id in subgrafo.prerrequisitos_graph:
-                    for succ_id in subgrafo.prerrequisitos_graph.successors(nodo_id):
-                        if succ_id in in_degree:
-                            in_degree[succ_id] -= 1
-                            if in_degree[succ_id] == 0:
-                                queue.append(succ_id)
-
-            if nivel_nodos:
-                niveles[nivel_actual] = nivel_nodos
-                nivel_actual += 1
-
         return niveles
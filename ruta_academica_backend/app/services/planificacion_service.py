@@ -0,0 +1,328 @@
+import numpy as np
+from typing import Dict, List, Optional, Tuple
+
+from app.core.graph import AsignaturaGrafoBase
+from app.core.planificador import planificar
+
+
+class PlanificacionService:
+    @staticmethod
+    def _asignatura_resumen(grafo: AsignaturaGrafoBase, asignatura_id: int) -> Dict:
+        data = grafo.get_asignatura(asignatura_id)
+        return {
+            "id": asignatura_id,
+            "codigo": data["codigo"],
+            "nombre": data["nombre"],
+            "creditos": data["creditos"],
+            "trimestre": data.get("trimestre", None),
+        }
+
+    @staticmethod
+    def get_elegibles(
+        grafo: AsignaturaGrafoBase,
+        asignatura_ids: List[int],
+        codigos: List[str],
+        creditos_acumulados: Optional[int] = None,
+    ) -> Dict:
+        """
+        Calcula las asignaturas que un estudiante puede inscribir a partir de
+        las que ya aprobó, usando el índice de elegibilidad del grafo.
+
+        Args:
+            grafo: Grafo de asignaturas del pensum
+            asignatura_ids: IDs de las asignaturas aprobadas
+            codigos: Códigos de las asignaturas aprobadas
+            creditos_acumulados: Créditos acumulados (por defecto, la suma de
+                los créditos de las aprobadas)
+
+        Returns:
+            Diccionario con los créditos acumulados, las asignaturas elegibles
+            (con su grupo de corequisitos) y las aprobadas que no pertenecen al pensum
+        """
+        indice = grafo.elegibilidad
+        aprobadas, no_encontradas = indice.resolver(asignatura_ids, codigos)
+
+        if creditos_acumulados is None:
+            creditos_acumulados = indice.creditos_de(aprobadas)
+
+        elegibles = []
+        for asignatura_id in indice.ids(indice.elegibles(aprobadas, creditos_acumulados)):
+            asignatura = PlanificacionService._asignatura_resumen(grafo, asignatura_id)
+            grupo = indice.grupos[indice.bits[asignatura_id]] & ~aprobadas
+            asignatura["corequisitos"] = [
+                co_id for co_id in indice.ids(grupo) if co_id != asignatura_id
+            ]
+            elegibles.append(asignatura)
+
+        return {
+            "creditos_acumulados": creditos_acumulados,
+            "total_aprobadas": len(indice.ids(aprobadas)),
+            "elegibles": elegibles,
+            "total_elegibles": len(elegibles),
+            "no_encontradas": no_encontradas,
+        }
+
+    @staticmethod
+    def elegibles_cohorte(
+        grafo: AsignaturaGrafoBase,
+        aprobadas: np.ndarray,
+        columnas: List[int],
+        creditos_acumulados: Optional[np.ndarray] = None,
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Calcula la elegibilidad de una cohorte de estudiantes con operaciones
+        matriciales sobre las matrices de elegibilidad del grafo.
+
+        Las asignaturas del pensum que no aparecen en las columnas se
+        consideran no aprobadas.
+
+        Args:
+            grafo: Grafo de asignaturas del pensum
+            aprobadas: Matriz booleana estudiantes x columnas
+            columnas: IDs de las asignaturas de cada columna
+            creditos_acumulados: Vector de créditos acumulados por estudiante
+                (por defecto, la suma de los créditos de las aprobadas)
+
+        Returns:
+            Tupla (elegibles, creditos_restantes): matriz booleana estudiantes x
+            columnas y vector de créditos que faltan para completar el pensum
+
+        Raises:
+            ValueError: Si las columnas están vacías o repetidas, alguna no
+                pertenece al grafo o las dimensiones no coinciden
+        """
+        if not columnas or len(set(columnas)) != len(columnas):
+            raise ValueError("Las columnas deben ser no vacías y sin repetir")
+
+        matrices = grafo.matrices_elegibilidad
+        aprobadas = np.asarray(aprobadas, dtype=bool)
+        if aprobadas.size == 0:
+            aprobadas = aprobadas.reshape(0, len(columnas))
+        if aprobadas.ndim != 2 or aprobadas.shape[1] != len(columnas):
+            raise ValueError(
+                "Cada fila de aprobadas debe tener una entrada por columna"
+            )
+
+        no_encontradas = [c for c in columnas if c not in matrices.columnas]
+        if no_encontradas:
+            raise ValueError(
+                f"Las asignaturas {no_encontradas} no pertenecen al grafo"
+            )
+
+        if creditos_acumulados is not None:
+            creditos_acumulados = np.asarray(creditos_acumulados, dtype=np.int64)
+            if creditos_acumulados.shape != (aprobadas.shape[0],):
+                raise ValueError(
+                    "Debe indicar los créditos acumulados de cada estudiante"
+                )
+
+        indices = np.array(
+            [matrices.columnas[c] for c in columnas], dtype=np.intp
+        )
+        completa = np.zeros((aprobadas.shape[0], len(matrices.orden)), dtype=bool)
+        completa[:, indices] = aprobadas
+
+        elegibles, creditos_restantes = matrices.elegibles(
+            completa, creditos_acumulados
+        )
+        return elegibles[:, indices], creditos_restantes
+
+    @staticmethod
+    def get_plan(
+        grafo: AsignaturaGrafoBase,
+        asignatura_ids: List[int],
+        codigos: List[str],
+        max_creditos: int,
+        objetivo_id: Optional[int] = None,
+        creditos_acumulados: Optional[int] = None,
+    ) -> Dict:
+        """
+        Planifica trimestre a trimestre las asignaturas pendientes de un
+        estudiante (o solo las necesarias para una asignatura objetivo) con un
+        tope de créditos por trimestre.
+
+        Args:
+            grafo: Grafo de asignaturas del pensum, sin ciclos
+            asignatura_ids: IDs de las asignaturas aprobadas
+            codigos: Códigos de las asignaturas aprobadas
+            max_creditos: Tope de créditos por trimestre
+            objetivo_id: ID de la asignatura objetivo (opcional)
+            creditos_acumulados: Créditos acumulados (por defecto, la suma de
+                los créditos de las aprobadas)
+
+        Returns:
+            Diccionario con el plan por trimestre, la cota inferior de
+            trimestres y las asignaturas que no se pudieron planificar
+        """
+        indice = grafo.elegibilidad
+        aprobadas, no_encontradas = indice.resolver(asignatura_ids, codigos)
+
+        objetivo = None
+        if objetivo_id is not None:
+            objetivo, _ = indice.resolver([objetivo_id])
+
+        plan = planificar(
+            indice, aprobadas, max_creditos, objetivo, creditos_acumulados
+        )
+
+        trimestres = []
+        creditos_planificados = 0
+        for numero, trimestre in enumerate(plan["trimestres"], start=1):
+            creditos = indice.creditos_de(trimestre)
+            creditos_planificados += creditos
+            trimestres.append(
+                {
+                    "numero": numero,
+                    "creditos": creditos,
+                    "asignaturas": [
+                        PlanificacionService._asignatura_resumen(grafo, asignatura_id)
+                        for asignatura_id in indice.ids(trimestre)
+                    ],
+                }
+            )
+
+        no_planificadas = plan["no_planificadas"]
+        creditos_pendientes = creditos_planificados + indice.creditos_de(no_planificadas)
+
+        return {
+            "max_creditos": max_creditos,
+            "trimestres": trimestres,
+            "total_trimestres": len(trimestres),
+            "creditos_planificados": creditos_planificados,
+            "cota_inferior_trimestres": max(
+                plan["camino_critico"], -(-creditos_pendientes // max_creditos)
+            ),
+            "no_planificadas": [
+                PlanificacionService._asignatura_resumen(grafo, asignatura_id)
+                for asignatura_id in indice.ids(no_planificadas)
+            ],
+            "no_encontradas": no_encontradas,
+        }
+
+    @staticmethod
+    def get_camino_critico(grafo: AsignaturaGrafoBase) -> Dict:
+        """
+        Obtiene el análisis de camino crítico de todas las asignaturas del
+        pensum y lo compara con el trimestre en que están ubicadas.
+
+        Args:
+            grafo: Grafo de asignaturas del pensum, sin ciclos
+
+        Returns:
+            Diccionario con la duración mínima, la cadena crítica y, por
+            asignatura, su inicio temprano, inicio tardío, holgura y si su
+            trimestre en el pensum está entre el inicio temprano y el inicio
+            tardío (con el número de trimestres del pensum como horizonte)
+        """
+        cpm = grafo.cpm
+
+        trimestres_pensum = max(
+            (
+                grafo.get_asignatura(asignatura_id).get("trimestre") or 0
+                for asignatura_id in grafo.get_asignatura_ids()
+            ),
+            default=0,
+        ) or None
+
+        # El inicio tardío según el pensum usa como horizonte su número de
+        # trimestres, si es mayor que la duración mínima
+        margen = max((trimestres_pensum or 0) - cpm.duracion, 0)
+
+        asignaturas = []
+        fuera_de_holgura = 0
+        for asignatura_id in grafo.elegibilidad.orden:
+            asignatura = PlanificacionService._asignatura_resumen(grafo, asignatura_id)
+            temprano = cpm.inicio_temprano[asignatura_id]
+            tardio_pensum = cpm.inicio_tardio[asignatura_id] + margen
+            trimestre = asignatura["trimestre"]
+
+            asignatura.update(
+                {
+                    "inicio_temprano": temprano,
+                    "inicio_tardio": cpm.inicio_tardio[asignatura_id],
+                    "holgura": cpm.holgura[asignatura_id],
+                    "critica": cpm.holgura[asignatura_id] == 0,
+                    "inicio_tardio_pensum": tardio_pensum,
+                    "dentro_de_holgura": (
+                        trimestre is None or temprano <= trimestre <= tardio_pensum
+                    ),
+                }
+            )
+            if not asignatura["dentro_de_holgura"]:
+                fuera_de_holgura += 1
+            asignaturas.append(asignatura)
+
+        return {
+            "duracion_minima": cpm.duracion,
+            "trimestres_pensum": trimestres_pensum,
+            "cadena_critica": [
+                PlanificacionService._asignatura_resumen(grafo, asignatura_id)
+                for asignatura_id in cpm.cadena_critica
+            ],
+            "total_criticas": sum(1 for a in asignaturas if a["critica"]),
+            "total_fuera_de_holgura": fuera_de_holgura,
+            "asignaturas": asignaturas,
+        }
+
+    @staticmethod
+    def get_impacto(grafo: AsignaturaGrafoBase, asignatura_id: int) -> Dict:
+        """
+        Obtiene todas las asignaturas que quedan bloqueadas si no se puede
+        cursar una asignatura: sus dependientes directos e indirectos y los
+        grupos de corequisitos involucrados.
+
+        Args:
+            grafo: Grafo de asignaturas del pensum
+            asignatura_id: ID de la asignatura
+
+        Returns:
+            Diccionario con la asignatura, las bloqueadas y los créditos bloqueados
+        """
+        indice = grafo.elegibilidad
+        impacto = grafo.impacto
+        bit = indice.bits[asignatura_id]
+
+        return {
+            "asignatura": PlanificacionService._asignatura_resumen(grafo, asignatura_id),
+            "dependientes_directos": [
+                PlanificacionService._asignatura_resumen(grafo, indice.orden[sucesor])
+                for sucesor in sorted(indice.sucesores[bit])
+            ],
+            "bloqueadas": [
+                PlanificacionService._asignatura_resumen(grafo, bloqueada_id)
+                for bloqueada_id in indice.ids(impacto.bloqueadas[bit])
+            ],
+            "total_bloqueadas": impacto.total_bloqueadas[bit],
+            "creditos_bloqueados": impacto.creditos_bloqueados[bit],
+        }
+
+    @staticmethod
+    def get_ranking_impacto(
+        grafo: AsignaturaGrafoBase, limite: Optional[int] = None
+    ) -> List[Dict]:
+        """
+        Ordena las asignaturas del pensum por el número de asignaturas que
+        bloquean (y, a igualdad, por los créditos bloqueados).
+
+        Args:
+            grafo: Grafo de asignaturas del pensum
+            limite: Número máximo de asignaturas a devolver (opcional)
+
+        Returns:
+            Lista de asignaturas con su total de bloqueadas y créditos bloqueados
+        """
+        indice = grafo.elegibilidad
+        impacto = grafo.impacto
+        ranking = impacto.ranking if limite is None else impacto.ranking[:limite]
+
+        resultado = []
+        for posicion, bit in enumerate(ranking, start=1):
+            asignatura = PlanificacionService._asignatura_resumen(
+                grafo, indice.orden[bit]
+            )
+            asignatura["posicion"] = posicion
+            asignatura["total_bloqueadas"] = impacto.total_bloqueadas[bit]
+            asignatura["creditos_bloqueados"] = impacto.creditos_bloqueados[bit]
+            resultado.append(asignatura)
+
+        return resultado
@@ -0,0 +1,109 @@
+import gzip
+from typing import Any, Callable, Dict, Hashable, Optional
+
+from fastapi import Request, Response
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
+from pydantic import BaseModel
+
+from app.core.config import settings
+from app.services.grafo_service import respuestas_cache
+
+
+# Las respuestas más pequeñas no se comprimen: el ahorro no compensa
+_GZIP_MIN_BYTES = 1024
+
+
+class RespuestaCodificada:
+    """
+    Cuerpo JSON de una respuesta ya serializado y, si corresponde, su
+    versión comprimida con gzip.
+    """
+
+    __slots__ = ("contenido", "comprimido")
+
+    def __init__(self, contenido: bytes, comprimido: Optional[bytes] = None):
+        self.contenido = contenido
+        self.comprimido = comprimido
+
+    def tamano(self) -> int:
+        return len(self.contenido) + len(self.comprimido or b"")
+
+
+class RespuestaService:
+    @staticmethod
+    def responder(
+        request: Request,
+        response: Response,
+        clave: Hashable,
+        construir: Callable[[], Any],
+    ) -> Response:
+        """
+        Devuelve la respuesta JSON de un endpoint desde la caché de
+        respuestas serializadas, construyéndola y serializándola si no está.
+
+        La clave debe incluir el endpoint, sus parámetros y la versión de
+        los datos (el ETag de verificar_version), de modo que una escritura
+        nunca sirva una respuesta anterior. La construcción debe leer el
+        grafo con esa misma versión (GrafoService.get_grafo(..., version));
+        si no, una escritura de otro proceso guardaría bajo el ETag nuevo un
+        cuerpo calculado con el grafo anterior. Los errores HTTP que lance
+        la construcción no se almacenan.
+
+        Args:
+            request: Petición, para elegir la versión comprimida
+            response: Respuesta de la petición, de la que se copian los
+                encabezados ya agregados (ETag, Last-Modified, ...)
+            clave: Clave de la respuesta en la caché
+            construir: Función que calcula el contenido de la respuesta
+
+        Returns:
+            Respuesta con el cuerpo JSON, comprimido si el cliente acepta gzip
+        """
+        codificada = respuestas_cache.get_or_set(
+            clave, lambda: RespuestaService.codificar(construir())
+        )
+
+        headers: Dict[str, str] = dict(response.headers)
+        contenido = codificada.contenido
+        if codificada.comprimido is not None:
+            headers["Vary"] = "Accept-Encoding"
+            if _acepta_gzip(request.headers.get("accept-encoding", "")):
+                headers["Content-Encoding"] = "gzip"
+                contenido = codificada.comprimido
+
+        return Response(content=contenido, media_type="application/json", headers=headers)
+
+    @staticmethod
+    def codificar(contenido: Any) -> RespuestaCodificada:
+        """
+        Serializa el contenido igual que una respuesta JSON de FastAPI y lo
+        comprime con gzip si está habilitado y es suficientemente grande.
+
+        Los modelos de Pydantic se serializan directamente con su serializador
+        compilado (pydantic-core), omitiendo los campos no asignados, sin
+        pasar por jsonable_encoder; el resultado es el mismo JSON compacto.
+        """
+        if isinstance(contenido, BaseModel):
+            cuerpo = contenido.model_dump_json(exclude_unset=True).encode("utf-8")
+        else:
+            cuerpo = JSONResponse(content=jsonable_encoder(contenido)).body
+        comprimido = None
+        if settings.RESPUESTAS_GZIP and len(cuerpo) >= _GZIP_MIN_BYTES:
+            comprimido = gzip.compress(cuerpo, compresslevel=6)
+        return RespuestaCodificada(cuerpo, comprimido)
+
+
+def _acepta_gzip(accept_encoding: str) -> bool:
+    for codificacion in accept_encoding.split(","):
+        nombre, _, parametros = codificacion.strip().partition(";")
+        if nombre.strip() not in ("gzip", "*"):
+            continue
+        calidad = parametros.strip()
+        if calidad.startswith("q="):
+            try:
+                return float(calidad[2:]) > 0
+            except ValueError:
+                return False
+        return True
+    return False
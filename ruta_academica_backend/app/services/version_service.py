@@ -0,0 +1,175 @@
+from datetime import datetime, timezone
+from typing import Iterable, Optional, Set, Tuple
+
+from sqlalchemy import Select, event, inspect, select
+from sqlalchemy.engine import Connection, Row
+from sqlalchemy.orm import Session
+
+from app.models.asignatura import Asignatura, AsignaturaTrimestre
+from app.models.pensum import Pensum, pensum_version
+from app.models.trimestre import Trimestre
+
+
+# pensum_id de la versión del catálogo completo (consultas sin pensum)
+VERSION_CATALOGO = 0
+
+
+@event.listens_for(Session, "after_flush")
+def _incrementar_versiones_tras_flush(session: Session, flush_context) -> None:
+    """
+    Incrementa, dentro de la misma transacción, la versión de los pensums
+    afectados por el flush y la del catálogo completo.
+    """
+    pensum_ids = VersionService.get_pensums_afectados(session)
+    if pensum_ids is not None:
+        VersionService.incrementar(session.connection(), pensum_ids)
+
+
+class VersionService:
+    """
+    Versiones de los datos de cada pensum, usadas como validadores HTTP
+    (ETag / Last-Modified) de las respuestas derivadas del grafo.
+    """
+
+    @staticmethod
+    def get_version(
+        db: Session, pensum_id: Optional[int] = None
+    ) -> Tuple[int, Optional[datetime]]:
+        """
+        Obtiene la versión de los datos de un pensum, o del catálogo completo
+        si no se indica pensum.
+
+        Args:
+            db: Sesión de base de datos
+            pensum_id: ID del pensum (opcional)
+
+        Returns:
+            Tupla (versión, fecha de la última modificación en UTC); (0, None)
+            si los datos no se han modificado desde que existe la tabla
+        """
+        return VersionService.de_fila(
+            db.execute(VersionService.consulta_version(pensum_id)).first()
+        )
+
+    @staticmethod
+    def consulta_version(pensum_id: Optional[int] = None) -> Select:
+        """
+        Consulta de la versión de un pensum (o del catálogo completo), para
+        ejecutarla también desde una sesión asíncrona.
+        """
+        return select(pensum_version.c.version, pensum_version.c.actualizado).where(
+            pensum_version.c.pensum_id == (pensum_id or VERSION_CATALOGO)
+        )
+
+    @staticmethod
+    def de_fila(fila: Optional[Row]) -> Tuple[int, Optional[datetime]]:
+        """
+        Convierte el resultado de consulta_version en (versión, fecha en UTC).
+        """
+        if fila is None:
+            return 0, None
+
+        return fila.version, fila.actualizado.replace(tzinfo=timezone.utc)
+
+    @staticmethod
+    def get_pensums_afectados(session: Session) -> Optional[Set[int]]:
+        """
+        Determina los pensums cuyos datos cambian con el flush en curso: los
+        que contienen a las asignaturas creadas, modificadas o eliminadas
+        (incluidos sus prerrequisitos y corequisitos), los de los trimestres
+        y asignaciones a trimestres modificados y los pensums modificados.
+        Debe llamarse desde after_flush, cuando los objetos ya tienen ID.
+
+        Returns:
+            IDs de los pensums afectados, o None si el flush no modificó
+            datos del grafo
+        """
+        asignatura_ids: Set[int] = set()
+        trimestre_ids: Set[int] = set()
+        pensum_ids: Set[int] = set()
+        modificado = False
+
+        for obj in (*session.new, *session.dirty, *session.deleted):
+            if isinstance(obj, Asignatura):
+                asignatura_ids.add(obj.id)
+            elif isinstance(obj, AsignaturaTrimestre):
+                asignatura_ids.update(_valores(obj, "asignatura_id"))
+                trimestre_ids.update(_valores(obj, "trimestre_id"))
+            elif isinstance(obj, Trimestre):
+                pensum_ids.update(_valores(obj, "pensum_id"))
+            elif isinstance(obj, Pensum):
+                pensum_ids.add(obj.id)
+            else:
+                continue
+            modificado = True
+
+        if not modificado:
+            return None
+
+        if asignatura_ids or trimestre_ids:
+            trimestres_de_asignaturas = select(AsignaturaTrimestre.trimestre_id).where(
+                AsignaturaTrimestre.asignatura_id.in_(asignatura_ids)
+            )
+            pensum_ids.update(
+                fila[0]
+                for fila in session.connection().execute(
+                    select(Trimestre.pensum_id)
+                    .where(
+                        Trimestre.id.in_(trimestre_ids)
+                        | Trimestre.id.in_(trimestres_de_asignaturas)
+                    )
+                    .distinct()
+                )
+                if fila[0] is not None
+            )
+
+        return pensum_ids
+
+    @staticmethod
+    def incrementar(conexion: Connection, pensum_ids: Iterable[int]) -> None:
+        """
+        Incrementa la versión de los pensums indicados y la del catálogo
+        completo, creando las filas que falten.
+
+        Args:
+            conexion: Conexión de la transacción en curso
+            pensum_ids: IDs de los pensums modificados
+        """
+        ids = set(pensum_ids) | {VERSION_CATALOGO}
+        ahora = datetime.now(timezone.utc).replace(tzinfo=None)
+
+        existentes = {
+            fila[0]
+            for fila in conexion.execute(
+                select(pensum_version.c.pensum_id).where(
+                    pensum_version.c.pensum_id.in_(ids)
+                )
+            )
+        }
+        if existentes:
+            conexion.execute(
+                pensum_version.update()
+                .where(pensum_version.c.pensum_id.in_(existentes))
+                .values(version=pensum_version.c.version + 1, actualizado=ahora)
+            )
+        if ids - existentes:
+            conexion.execute(
+                pensum_version.insert(),
+                [
+                    {"pensum_id": pensum_id, "version": 1, "actualizado": ahora}
+                    for pensum_id in ids - existentes
+                ],
+            )
+
+
+def _valores(obj, atributo: str) -> Set[int]:
+    """
+    Valores actual y anterior de un atributo de un objeto en el flush, para
+    contar tanto el pensum o trimestre de origen como el de destino.
+    """
+    historial = inspect(obj).attrs[atributo].history
+    return {
+        valor
+        for valor in (*historial.added, *historial.unchanged, *historial.deleted)
+        if valor is not None
+    }
@@ -0,0 +1,148 @@
+import sys
+import os
+import argparse
+import asyncio
+import random
+import socket
+import subprocess
+import tempfile
+import time
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+import httpx
+
+from scripts.benchmark_grafo import generar_pensum
+from scripts.benchmark_motores import crear_base
+
+
+def puerto_libre() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+async def medir(url_base, rutas, clientes, peticiones):
+    """
+    Lanza las peticiones con el número indicado de clientes concurrentes y
+    devuelve (peticiones por segundo, latencia p50 ms, latencia p99 ms, errores).
+    """
+    latencias = []
+    errores = 0
+    pendientes = iter(range(peticiones))
+    limites = httpx.Limits(max_connections=clientes, max_keepalive_connections=clientes)
+
+    async with httpx.AsyncClient(base_url=url_base, limits=limites, timeout=60) as http:
+
+        async def cliente(rng):
+            nonlocal errores
+            for _ in pendientes:
+                inicio = time.perf_counter()
+                try:
+                    respuesta = await http.get(rng.choice(rutas))
+                except httpx.TransportError:
+                    errores += 1
+                    continue
+                latencias.append(time.perf_counter() - inicio)
+                if respuesta.status_code != 200:
+                    errores += 1
+
+        inicio = time.perf_counter()
+        await asyncio.gather(*(cliente(random.Random(i)) for i in range(clientes)))
+        total = time.perf_counter() - inicio
+
+    latencias.sort()
+    return (
+        len(latencias) / total,
+        latencias[len(latencias) // 2] * 1000,
+        latencias[min(len(latencias) - 1, int(len(latencias) * 0.99))] * 1000,
+        errores,
+    )
+
+
+def iniciar_servidor(ruta_db, asincronas):
+    """
+    Inicia la API en un proceso aparte con RUTAS_ASINCRONAS activado o no y
+    devuelve (proceso, URL base) cuando responde.
+    """
+    puerto = puerto_libre()
+    entorno = dict(
+        os.environ,
+        DATABASE_URL=f"sqlite:///{ruta_db}",
+        RUTAS_ASINCRONAS=str(asincronas).lower(),
+    )
+    servidor = subprocess.Popen(
+        [
+            sys.executable, "-m", "uvicorn", "app.main:app",
+            "--port", str(puerto), "--log-level", "warning", "--no-access-log",
+            "--timeout-keep-alive", "60",
+        ],
+        cwd=os.path.abspath(os.path.join(os.path.dirname(__file__), "..")),
+        env=entorno,
+        stdout=subprocess.DEVNULL,
+    )
+
+    url_base = f"http://127.0.0.1:{puerto}"
+    for _ in range(100):
+        try:
+            httpx.get(url_base + "/", timeout=1)
+            break
+        except httpx.TransportError:
+            time.sleep(0.1)
+    return servidor, url_base
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Compara los listados y detalles con y sin RUTAS_ASINCRONAS bajo carga concurrente"
+    )
+    parser.add_argument("--asignaturas", type=int, default=600)
+    parser.add_argument("--clientes", type=int, default=200)
+    parser.add_argument("--peticiones", type=int, default=4000)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directorio:
+        ruta_db = os.path.join(directorio, "benchmark.db")
+        engine, pensum_id = crear_base(ruta_db, generar_pensum(args.asignaturas))
+        engine.dispose()
+
+        ids = range(1, args.asignaturas + 1)
+        # Las rutas y el listado de asignaturas son síncronas con ambos
+        # valores: sirven de control
+        escenarios = {
+            "ruta": [f"/api/v1/prerrequisitos/ruta/{i}?pensum_id={pensum_id}" for i in ids],
+            "asignaturas": [
+                f"/api/v1/asignaturas/?cursor={i}&limit=50"
+                for i in range(0, args.asignaturas, 50)
+            ],
+            "detalle": [f"/api/v1/asignaturas/{i}" for i in ids],
+            "pensum": [f"/api/v1/pensums/{pensum_id}", "/api/v1/pensums/"],
+        }
+
+        print(
+            f"{'escenario':<12} {'rutas':<6} {'req/s':>8} {'p50 ms':>8} {'p99 ms':>8} {'errores':>8}"
+        )
+        resultados = {}
+        for nombre, asincronas in (("sync", False), ("async", True)):
+            servidor, url_base = iniciar_servidor(ruta_db, asincronas)
+            try:
+                for escenario, rutas in escenarios.items():
+                    # Calentamiento: grafo y respuestas en caché
+                    asyncio.run(medir(url_base, rutas, 10, len(rutas)))
+                    resultados[escenario, nombre] = asyncio.run(
+                        medir(url_base, rutas, args.clientes, args.peticiones)
+                    )
+            finally:
+                servidor.terminate()
+                servidor.wait()
+
+        for escenario in escenarios:
+            for nombre in ("sync", "async"):
+                rps, p50, p99, errores = resultados[escenario, nombre]
+                print(
+                    f"{escenario:<12} {nombre:<6} {rps:>8.0f} {p50:>8.1f} {p99:>8.1f} {errores:>8}"
+                )
+
+
+if __name__ == "__main__":
+    main()
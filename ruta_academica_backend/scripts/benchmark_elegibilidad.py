@@ -0,0 +1,79 @@
+import sys
+import os
+import argparse
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from app.core.graph_csr import AsignaturaGrafoCSR
+from scripts.benchmark_grafo import generar_pensum
+
+
+def generar_cohorte(grafo, num_estudiantes, semilla=7):
+    """
+    Genera una cohorte sintética: cada estudiante aprobó todas las
+    asignaturas de los trimestres anteriores al suyo y una fracción al azar
+    de las de su trimestre actual.
+    """
+    rng = np.random.default_rng(semilla)
+    matrices = grafo.matrices_elegibilidad
+    trimestres = np.array(
+        [grafo.get_asignatura(a)["trimestre"] for a in matrices.orden]
+    )
+
+    actuales = rng.integers(1, trimestres.max() + 1, size=num_estudiantes)
+    aprobadas = trimestres[None, :] < actuales[:, None]
+    aprobadas |= (trimestres[None, :] == actuales[:, None]) & (
+        rng.random((num_estudiantes, len(trimestres))) < 0.5
+    )
+    return aprobadas
+
+
+def a_mascara(fila):
+    """
+    Convierte una fila booleana (columnas en orden de bits) en un bitset.
+    """
+    mascara = 0
+    for bit in np.flatnonzero(fila).tolist():
+        mascara |= 1 << bit
+    return mascara
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Compara la elegibilidad por estudiante con la vectorizada por cohorte"
+    )
+    parser.add_argument("--asignaturas", type=int, default=110)
+    parser.add_argument("--estudiantes", type=int, default=10_000)
+    args = parser.parse_args()
+
+    grafo = AsignaturaGrafoCSR.from_data(*generar_pensum(args.asignaturas))
+    indice = grafo.elegibilidad
+    matrices = grafo.matrices_elegibilidad
+    aprobadas = generar_cohorte(grafo, args.estudiantes)
+
+    inicio = time.perf_counter()
+    por_estudiante = []
+    for fila in aprobadas:
+        mascara = a_mascara(fila)
+        por_estudiante.append(indice.elegibles(mascara))
+    lazo = time.perf_counter() - inicio
+
+    inicio = time.perf_counter()
+    elegibles, creditos_restantes = matrices.elegibles(aprobadas)
+    vectorizado = time.perf_counter() - inicio
+
+    for fila, mascara in zip(elegibles, por_estudiante):
+        assert a_mascara(fila) == mascara
+
+    print(f"{args.estudiantes} estudiantes x {len(matrices.orden)} asignaturas")
+    print(f"  por estudiante (bitsets): {lazo * 1000:>9.1f} ms")
+    print(f"  cohorte (numpy):          {vectorizado * 1000:>9.1f} ms")
+    print(f"  elegibles promedio:       {elegibles.sum(axis=1).mean():>9.1f}")
+    print(f"  créditos restantes prom.: {creditos_restantes.mean():>9.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,135 @@
+import sys
+import os
+import argparse
+import random
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from app.core.graph import AsignaturaGrafo
+from app.core.graph_csr import AsignaturaGrafoCSR
+
+
+BACKENDS = {
+    "networkx": AsignaturaGrafo,
+    "csr": AsignaturaGrafoCSR,
+}
+
+
+def generar_pensum(num_asignaturas, trimestres=14, max_prerrequisitos=3, semilla=42):
+    """
+    Genera un pensum sintético acíclico: cada asignatura solo puede tener
+    prerrequisitos en trimestres anteriores, y algunas tienen un laboratorio
+    como corequisito en el mismo trimestre.
+    """
+    rng = random.Random(semilla)
+    asignaturas = []
+    por_trimestre = {t: [] for t in range(1, trimestres + 1)}
+
+    for asignatura_id in range(1, num_asignaturas + 1):
+        trimestre = 1 + (asignatura_id - 1) * trimestres // num_asignaturas
+        por_trimestre[trimestre].append(asignatura_id)
+        asignaturas.append(
+            (
+                asignatura_id,
+                {
+                    "codigo": f"ASG{asignatura_id:04d}",
+                    "nombre": f"ASIGNATURA SINTETICA {asignatura_id}",
+                    "creditos": rng.randint(0, 5),
+                    "req_creditos": None,
+                    "trimestre": trimestre,
+                    "pensum_id": 1,
+                },
+            )
+        )
+
+    prerequisitos = []
+    corequisitos = []
+    for trimestre in range(2, trimestres + 1):
+        anteriores = [
+            a for t in range(max(1, trimestre - 3), trimestre) for a in por_trimestre[t]
+        ]
+        actuales = por_trimestre[trimestre]
+        for asignatura_id in actuales:
+            cantidad = rng.randint(0, min(max_prerrequisitos, len(anteriores)))
+            for pre_id in rng.sample(anteriores, cantidad):
+                prerequisitos.append((asignatura_id, pre_id))
+        for a, b in zip(actuales[::5], actuales[1::5]):
+            corequisitos.append((a, b))
+
+    return asignaturas, prerequisitos, corequisitos
+
+
+def medir(backend, datos, repeticiones):
+    grafo_cls = BACKENDS[backend]
+
+    tracemalloc.start()
+    inicio = time.perf_counter()
+    grafo = grafo_cls.from_data(*datos)
+    construccion = time.perf_counter() - inicio
+    memoria_trazada, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    ids = grafo.get_asignatura_ids()
+
+    inicio = time.perf_counter()
+    grafo.cierre
+    cierre = time.perf_counter() - inicio
+
+    inicio = time.perf_counter()
+    for _ in range(repeticiones):
+        for asignatura_id in ids:
+            grafo.get_all_prerequisitos_bfs(asignatura_id)
+    bfs = (time.perf_counter() - inicio) / (repeticiones * len(ids))
+
+    inicio = time.perf_counter()
+    for _ in range(repeticiones):
+        for asignatura_id in ids:
+            grafo.get_all_prerequisitos_ids(asignatura_id)
+    bfs_ids = (time.perf_counter() - inicio) / (repeticiones * len(ids))
+
+    inicio = time.perf_counter()
+    for _ in range(repeticiones):
+        grafo.has_cycle()
+    ciclos = (time.perf_counter() - inicio) / repeticiones
+
+    return {
+        "construccion_ms": construccion * 1000,
+        "cierre_ms": cierre * 1000,
+        "memoria_kb": memoria_trazada / 1024,
+        "memoria_estimada_kb": grafo.estimate_memory() / 1024,
+        "bfs_us": bfs * 1_000_000,
+        "bfs_ids_us": bfs_ids * 1_000_000,
+        "has_cycle_us": ciclos * 1_000_000,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Compara memoria y latencia de los motores del grafo de asignaturas"
+    )
+    parser.add_argument(
+        "--tamanos", type=int, nargs="+", default=[60, 600, 6000],
+        help="Número de asignaturas de los pensums sintéticos",
+    )
+    parser.add_argument("--repeticiones", type=int, default=3)
+    args = parser.parse_args()
+
+    print(
+        f"{'asignaturas':>11} {'motor':>9} {'constr. ms':>11} {'cierre ms':>10} {'mem. KB':>9} "
+        f"{'mem. est. KB':>13} {'bfs us':>9} {'bfs ids us':>11} {'ciclo us':>10}"
+    )
+    for tamano in args.tamanos:
+        datos = generar_pensum(tamano)
+        for backend in BACKENDS:
+            r = medir(backend, datos, args.repeticiones)
+            print(
+                f"{tamano:>11} {backend:>9} {r['construccion_ms']:>11.2f} {r['cierre_ms']:>10.2f} "
+                f"{r['memoria_kb']:>9.1f} {r['memoria_estimada_kb']:>13.1f} "
+                f"{r['bfs_us']:>9.1f} {r['bfs_ids_us']:>11.1f} {r['has_cycle_us']:>10.1f}"
+            )
+
+
+if __name__ == "__main__":
+    main()
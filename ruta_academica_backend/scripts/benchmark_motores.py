@@ -0,0 +1,159 @@
+import sys
+import os
+import argparse
+import random
+import tempfile
+import time
+from datetime import date
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.db.base import Base
+from app.models.asignatura import (
+    Asignatura,
+    AsignaturaTrimestre,
+    corequisito,
+    prerequisito,
+)
+from app.models.carrera import Carrera
+from app.models.pensum import Pensum
+from app.models.trimestre import Trimestre
+from app.services.ancestros_service import AncestrosService
+from app.services.grafo_service import GrafoService
+from scripts.benchmark_grafo import generar_pensum
+
+
+MOTORES = ["memoria (frío)", "memoria (caché)", "tabla", "cte"]
+
+
+def crear_base(ruta, datos):
+    """
+    Crea una base SQLite con un pensum sintético y su tabla de cierre.
+    """
+    asignaturas, prerequisitos, corequisitos = datos
+    engine = create_engine(f"sqlite:///{ruta}")
+    Base.metadata.create_all(bind=engine)
+
+    with Session(engine) as db:
+        carrera = Carrera(nombre="CARRERA SINTETICA")
+        db.add(carrera)
+        db.flush()
+        pensum = Pensum(
+            codigo="SINT", fecha_aprobacion=date(2024, 1, 1), carrera_id=carrera.id
+        )
+        db.add(pensum)
+        db.flush()
+
+        trimestres = {}
+        for asignatura_id, data in asignaturas:
+            if data["trimestre"] not in trimestres:
+                trimestre = Trimestre(numero=data["trimestre"], pensum_id=pensum.id)
+                db.add(trimestre)
+                db.flush()
+                trimestres[data["trimestre"]] = trimestre.id
+
+        db.execute(
+            Asignatura.__table__.insert(),
+            [
+                {
+                    "id": asignatura_id,
+                    "codigo": data["codigo"],
+                    "nombre": data["nombre"],
+                    "creditos": data["creditos"],
+                }
+                for asignatura_id, data in asignaturas
+            ],
+        )
+        db.execute(
+            AsignaturaTrimestre.__table__.insert(),
+            [
+                {"asignatura_id": asignatura_id, "trimestre_id": trimestres[data["trimestre"]]}
+                for asignatura_id, data in asignaturas
+            ],
+        )
+        db.execute(
+            prerequisito.insert(),
+            [{"asignatura_id": a, "prerequisito_id": p} for a, p in prerequisitos],
+        )
+        db.execute(
+            corequisito.insert(),
+            [{"asignatura_id": a, "corequisito_id": c} for a, c in corequisitos],
+        )
+        AncestrosService.reconstruir(db)
+        db.commit()
+
+        return engine, pensum.id
+
+
+def medir(engine, pensum_id, motor, objetivos):
+    """
+    Mide la latencia media de obtener el grafo de la ruta y calcular sus
+    prerrequisitos y niveles topológicos, en milisegundos por objetivo.
+    """
+    settings.GRAFO_MOTOR = motor.split()[0]
+    GrafoService.invalidar_cache()
+
+    with Session(engine) as db:
+        if motor == "memoria (caché)":
+            GrafoService.get_grafo(db, pensum_id)
+
+        inicio = time.perf_counter()
+        for asignatura_id in objetivos:
+            if motor == "memoria (frío)":
+                GrafoService.invalidar_cache()
+            grafo = GrafoService.get_grafo_ruta(db, [asignatura_id], pensum_id)
+            asignatura = db.get(Asignatura, asignatura_id)
+            GrafoService.get_prerequisitos_de_grafo(grafo, asignatura)
+            GrafoService.get_niveles_topologicos(grafo, asignatura_id)
+        return (time.perf_counter() - inicio) * 1000 / len(objetivos)
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Compara los motores de rutas: grafo en memoria, tabla de cierre y consulta recursiva"
+    )
+    parser.add_argument(
+        "--tamanos", type=int, nargs="+", default=[60, 600, 6000],
+        help="Número de asignaturas de los pensums sintéticos",
+    )
+    parser.add_argument(
+        "--objetivos", type=int, default=30,
+        help="Asignaturas objetivo por medición, tomadas de la mitad final del pensum",
+    )
+    args = parser.parse_args()
+
+    # Silencia el mensaje que imprime cada construcción del grafo
+    stdout = sys.stdout
+
+    print(f"{'asignaturas':>11} " + " ".join(f"{m + ' ms':>18}" for m in MOTORES))
+    for tamano in args.tamanos:
+        with tempfile.TemporaryDirectory() as directorio:
+            engine, pensum_id = crear_base(
+                os.path.join(directorio, "benchmark.db"), generar_pensum(tamano)
+            )
+            rng = random.Random(tamano)
+            objetivos = [
+                rng.randint(tamano // 2 + 1, tamano) for _ in range(args.objetivos)
+            ]
+
+            resultados = []
+            for motor in MOTORES:
+                sys.stdout = open(os.devnull, "w")
+                try:
+                    resultados.append(medir(engine, pensum_id, motor, objetivos))
+                finally:
+                    sys.stdout.close()
+                    sys.stdout = stdout
+            engine.dispose()
+
+        print(f"{tamano:>11} " + " ".join(f"{r:>18.2f}" for r in resultados))
+
+    GrafoService.invalidar_cache()
+
+
+if __name__ == "__main__":
+    main()
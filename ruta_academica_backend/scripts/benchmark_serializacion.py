@@ -0,0 +1,108 @@
+import sys
+import os
+import argparse
+import tempfile
+import time
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
+from sqlalchemy.orm import Session
+
+import app.main  # noqa: F401  (registra todos los modelos)
+from app.api.routes.prerrequisitos import _get_asignaturas_por_nivel, _get_ruta_academica
+from app.core.config import settings
+from app.services.grafo_service import GrafoService
+from app.services.respuesta_service import RespuestaService
+from scripts.benchmark_grafo import generar_pensum
+from scripts.benchmark_motores import crear_base
+
+
+def medir(funcion, repeticiones):
+    """
+    Devuelve el mejor tiempo de cinco rondas, en milisegundos por llamada.
+    """
+    mejor = float("inf")
+    for _ in range(5):
+        inicio = time.perf_counter()
+        for _ in range(repeticiones):
+            funcion()
+        mejor = min(mejor, (time.perf_counter() - inicio) * 1000 / repeticiones)
+    return mejor
+
+
+def comparar(modelo, repeticiones):
+    """
+    Compara la serialización genérica (jsonable_encoder + JSONResponse) del
+    contenido como diccionario con la validación en el esquema de respuesta
+    y su serialización compilada. Ambas deben producir el mismo JSON.
+    """
+    contenido = modelo.model_dump(exclude_unset=True)
+    esquema = type(modelo)
+
+    def generico():
+        return JSONResponse(content=jsonable_encoder(contenido)).body
+
+    def compilado():
+        return RespuestaService.codificar(esquema.model_validate(contenido)).contenido
+
+    assert generico() == compilado()
+    return len(generico()), medir(generico, repeticiones), medir(compilado, repeticiones)
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Compara la serialización genérica y la de los esquemas de respuesta de rutas y niveles"
+    )
+    parser.add_argument(
+        "--tamanos", type=int, nargs="+", default=[60, 600, 2000],
+        help="Número de asignaturas de los pensums sintéticos",
+    )
+    parser.add_argument("--repeticiones", type=int, default=20)
+    args = parser.parse_args()
+
+    # Sin gzip: solo se mide la serialización
+    settings.RESPUESTAS_GZIP = False
+    stdout = sys.stdout
+
+    print(
+        f"{'asignaturas':>11} {'endpoint':<10} {'bytes':>9} {'genérico ms':>12} "
+        f"{'esquema ms':>11} {'mejora':>7}"
+    )
+    for tamano in args.tamanos:
+        with tempfile.TemporaryDirectory() as directorio:
+            engine, pensum_id = crear_base(
+                os.path.join(directorio, "benchmark.db"), generar_pensum(tamano)
+            )
+
+            with Session(engine) as db:
+                sys.stdout = open(os.devnull, "w")
+                try:
+                    # La asignatura con más prerrequisitos tiene la ruta más grande
+                    grafo = GrafoService.get_grafo(db, pensum_id)
+                    objetivo = max(
+                        grafo.get_asignatura_ids(),
+                        key=lambda nodo: len(grafo.get_all_prerequisitos_ids(nodo)),
+                    )
+                    modelos = {
+                        "ruta": _get_ruta_academica(db, objetivo, pensum_id),
+                        "niveles": _get_asignaturas_por_nivel(db, pensum_id),
+                    }
+                finally:
+                    sys.stdout.close()
+                    sys.stdout = stdout
+
+            engine.dispose()
+            GrafoService.invalidar_cache()
+
+        for endpoint, modelo in modelos.items():
+            tamano_json, generico, compilado = comparar(modelo, args.repeticiones)
+            print(
+                f"{tamano:>11} {endpoint:<10} {tamano_json:>9} {generico:>12.2f} "
+                f"{compilado:>11.2f} {generico / compilado:>6.1f}x"
+            )
+
+
+if __name__ == "__main__":
+    main()
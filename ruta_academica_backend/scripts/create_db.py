@@ -4,15 +4,23 @@ import os
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
 
 from sqlalchemy import create_engine
+from sqlalchemy.orm import Session
 from app.core.config import settings
 from app.db.base import Base
 from app.models import asignatura, carrera, pensum, trimestre
+from app.services.ancestros_service import AncestrosService
 
 
 def init_db():
     engine = create_engine(settings.DATABASE_URL)
     Base.metadata.create_all(bind=engine)
-    print("Base de datos inicializada correctamente")
+
+    # En bases de datos existentes, llena la tabla de cierre de prerrequisitos
+    with Session(engine) as db:
+        filas = AncestrosService.reconstruir(db)
+        db.commit()
+
+    print(f"Base de datos inicializada correctamente ({filas} filas en asignatura_ancestros)")
 
 
 if __name__ == "__main__":
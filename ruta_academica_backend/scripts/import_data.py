@@ -11,6 +11,9 @@ from app.models.carrera import Carrera
 from app.models.pensum import Pensum
 from app.models.trimestre import Trimestre
 from app.models.asignatura import Asignatura, AsignaturaTrimestre, prerequisito, corequisito
+from app.services.ancestros_service import AncestrosService
+# Registra el incremento de las versiones de los pensums en cada flush
+from app.services import version_service  # noqa: F401
 
 
 def import_sistemas():
@@ -701,6 +704,19 @@ def import_ciberseguridad():
     finally:
         db.close()
 
+def reconstruir_ancestros():
+    db = SessionLocal()
+    try:
+        filas = AncestrosService.reconstruir(db)
+        db.commit()
+        print(f"Tabla de cierre de prerrequisitos reconstruida: {filas} filas")
+    except Exception as e:
+        db.rollback()
+        print(f"Error al reconstruir la tabla de cierre de prerrequisitos: {e}")
+        raise
+    finally:
+        db.close()
+
 def import_all_pensums():
     try:
         print("Iniciando importación de todos los pensums...")
@@ -711,6 +727,8 @@ def import_all_pensums():
         
         import_ciberseguridad()
         
+        reconstruir_ancestros()
+        
         print("Todos los pensums importados con éxito.")
     except Exception as e:
         print(f"Error durante la importación de pensums: {e}")
@@ -0,0 +1,99 @@
+import sys
+import os
+
+import pytest
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from app.api.dependencies import get_db
+from app.db.base import Base
+from app.main import app
+from app.models import asignatura, carrera, pensum, trimestre
+from app.services import grafo_service
+from app.services.grafo_service import GRAFO_BACKENDS
+
+
+@pytest.fixture(autouse=True)
+def estado_del_proceso(monkeypatch):
+    """
+    Las cachés de grafos y el orden de prerrequisitos en línea son globales
+    del proceso: se vacían en cada prueba, porque las bases de las pruebas
+    repiten IDs y versiones.
+    """
+    grafo_service.GrafoService.invalidar_cache()
+    monkeypatch.setattr(grafo_service, "_orden_prerequisitos", None)
+    monkeypatch.setattr(grafo_service, "_grupos_orden", None)
+    monkeypatch.setattr(grafo_service, "_version_orden", None)
+
+
+@pytest.fixture
+def engine():
+    """
+    Motor SQLite en memoria con todas las tablas creadas.
+    """
+    engine = create_engine(
+        "sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool
+    )
+    Base.metadata.create_all(bind=engine)
+    yield engine
+    engine.dispose()
+
+
+@pytest.fixture
+def cliente(engine):
+    """
+    Cliente de la API con las sesiones síncronas sobre el motor en memoria.
+    """
+    sesiones = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+
+    def get_db_prueba():
+        db = sesiones()
+        try:
+            yield db
+        finally:
+            db.close()
+
+    app.dependency_overrides[get_db] = get_db_prueba
+    with TestClient(app) as cliente:
+        yield cliente
+    app.dependency_overrides.clear()
+
+
+@pytest.fixture(params=["networkx", "csr"])
+def crear_grafo(request):
+    """
+    Construye grafos con cada motor a partir de sus aristas, sin base de
+    datos. Cada asignatura tiene código A<id> y 3 créditos salvo que se
+    indique otra cosa.
+    """
+    grafo_cls = GRAFO_BACKENDS[request.param]
+
+    def crear(ids, prerequisitos=(), corequisitos=(), creditos=None, req_creditos=None):
+        """
+        Args:
+            ids: IDs de las asignaturas, en orden de inserción
+            prerequisitos: Tuplas (asignatura_id, prerequisito_id)
+            corequisitos: Tuplas (asignatura_id, corequisito_id)
+            creditos: Créditos por ID (opcional)
+            req_creditos: Requisito de créditos por ID (opcional)
+        """
+        asignaturas = [
+            (
+                asignatura_id,
+                {
+                    "codigo": f"A{asignatura_id}",
+                    "nombre": f"ASIGNATURA {asignatura_id}",
+                    "creditos": (creditos or {}).get(asignatura_id, 3),
+                    "req_creditos": (req_creditos or {}).get(asignatura_id, 0),
+                },
+            )
+            for asignatura_id in ids
+        ]
+        return grafo_cls.from_data(asignaturas, list(prerequisitos), list(corequisitos))
+
+    return crear
@@ -0,0 +1,75 @@
+import pytest
+from sqlalchemy.orm import Session
+
+from app.models.asignatura import Asignatura, asignatura_ancestro
+from app.services.ancestros_service import AncestrosService
+from app.services.grafo_service import GrafoService
+
+
+@pytest.fixture
+def db(engine):
+    """
+    Base SQLite en memoria con las asignaturas A a E sin relaciones.
+    """
+    with Session(engine) as sesion:
+        asignaturas = [
+            Asignatura(codigo=codigo, nombre=codigo, creditos=3) for codigo in "ABCDE"
+        ]
+        sesion.add_all(asignaturas)
+        sesion.commit()
+
+        yield sesion, {asignatura.codigo: asignatura for asignatura in asignaturas}
+
+
+def tabla_de_cierre(sesion):
+    return sorted(sesion.query(asignatura_ancestro).all())
+
+
+def comprobar_contra_reconstruccion(sesion):
+    """
+    La tabla mantenida de forma incremental debe ser igual a la reconstruida
+    desde cero.
+    """
+    incremental = tabla_de_cierre(sesion)
+    AncestrosService.reconstruir(sesion)
+    sesion.flush()
+    assert tabla_de_cierre(sesion) == incremental
+    sesion.rollback()
+
+
+def ancestros(sesion, asig, codigo):
+    nombres = {a.id: c for c, a in asig.items()}
+    return {
+        nombres[ancestro_id]: profundidad
+        for ancestro_id, profundidad in AncestrosService.get_ancestros(
+            sesion, [asig[codigo].id]
+        ).items()
+    }
+
+
+def test_tabla_de_cierre_tras_agregar_y_eliminar(db):
+    sesion, asig = db
+
+    # A -> B -> C -> D -> E y el atajo A -> D
+    for asignatura, prerequisito in ("BA", "CB", "DC", "ED", "DA"):
+        assert GrafoService.agregar_prerequisito(
+            sesion, asig[asignatura], asig[prerequisito]
+        ) is None
+
+    assert ancestros(sesion, asig, "E") == {"D": 1, "A": 2, "C": 2, "B": 3}
+    assert sorted(AncestrosService.get_descendientes(sesion, asig["B"].id)) == sorted(
+        asig[c].id for c in "CDE"
+    )
+    comprobar_contra_reconstruccion(sesion)
+
+    assert GrafoService.eliminar_prerequisito(sesion, asig["C"], asig["B"])
+
+    assert ancestros(sesion, asig, "E") == {"D": 1, "A": 2, "C": 2}
+    assert ancestros(sesion, asig, "C") == {}
+    comprobar_contra_reconstruccion(sesion)
+
+    GrafoService.eliminar_asignatura(sesion, asig["D"])
+
+    assert ancestros(sesion, asig, "E") == {}
+    assert ancestros(sesion, asig, "B") == {"A": 1}
+    comprobar_contra_reconstruccion(sesion)
@@ -0,0 +1,96 @@
+from datetime import date
+
+import pytest
+from sqlalchemy.orm import Session
+
+from app.core.cache import CacheLRU
+from app.models.asignatura import Asignatura, AsignaturaTrimestre, prerequisito
+from app.models.carrera import Carrera
+from app.models.pensum import Pensum
+from app.models.trimestre import Trimestre
+from app.services.grafo_service import GrafoService
+from app.services.version_service import VersionService
+
+
+@pytest.fixture
+def db(engine):
+    """
+    Base SQLite en memoria con un pensum de dos asignaturas sin relaciones.
+    """
+    with Session(engine) as sesion:
+        carrera = Carrera(nombre="CARRERA DE PRUEBA")
+        sesion.add(carrera)
+        sesion.flush()
+        pensum = Pensum(
+            codigo="PRUEBA", fecha_aprobacion=date(2024, 1, 1), carrera_id=carrera.id
+        )
+        sesion.add(pensum)
+        sesion.flush()
+        trimestre = Trimestre(numero=1, pensum_id=pensum.id)
+        asignaturas = [
+            Asignatura(codigo=f"MAT10{i}", nombre=f"MATEMATICA {i}", creditos=4)
+            for i in range(2)
+        ]
+        sesion.add_all([trimestre, *asignaturas])
+        sesion.flush()
+        for asignatura in asignaturas:
+            sesion.add(
+                AsignaturaTrimestre(
+                    asignatura_id=asignatura.id, trimestre_id=trimestre.id
+                )
+            )
+        sesion.commit()
+
+        yield sesion, pensum, [asignatura.id for asignatura in asignaturas]
+
+
+def escritura_externa(engine, pensum_id, asignatura_id, prerequisito_id):
+    """
+    Agrega un prerrequisito desde otra conexión, como otro proceso: sin
+    pasar por la sesión, la caché del proceso no se invalida.
+    """
+    with engine.begin() as conexion:
+        conexion.execute(
+            prerequisito.insert().values(
+                asignatura_id=asignatura_id, prerequisito_id=prerequisito_id
+            )
+        )
+        VersionService.incrementar(conexion, [pensum_id])
+
+
+def test_cache_descarta_entradas_de_otra_version():
+    cache = CacheLRU(max_entradas=10, max_bytes=1000)
+
+    cache.set("grafo", "v1", version=1)
+
+    assert cache.get("grafo", version=1) == "v1"
+    assert cache.get("grafo", version=2) is None
+    assert cache.get_or_set("grafo", lambda: "v2", version=2) == "v2"
+    assert cache.get("grafo", version=2) == "v2"
+    assert len(cache) == 1
+
+
+def test_grafo_se_reconstruye_si_otro_proceso_cambia_la_version(engine, db):
+    sesion, pensum, (mat0, mat1) = db
+
+    grafo = GrafoService.get_grafo(sesion, pensum.id)
+    assert GrafoService.get_grafo(sesion, pensum.id) is grafo
+    sesion.rollback()
+
+    escritura_externa(engine, pensum.id, mat1, mat0)
+
+    grafo = GrafoService.get_grafo(sesion, pensum.id)
+    assert grafo.get_ancestros(mat1) == [mat0]
+
+
+def test_malla_se_reconstruye_si_otro_proceso_cambia_la_version(engine, db):
+    sesion, pensum, (mat0, mat1) = db
+
+    malla = GrafoService.get_malla(sesion, pensum)
+    assert malla["trimestres"][0]["asignaturas"][1]["prerequisitos_ids"] == []
+    sesion.rollback()
+
+    escritura_externa(engine, pensum.id, mat1, mat0)
+
+    malla = GrafoService.get_malla(sesion, pensum)
+    assert malla["trimestres"][0]["asignaturas"][1]["prerequisitos_ids"] == [mat0]
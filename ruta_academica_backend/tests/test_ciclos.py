@@ -0,0 +1,77 @@
+import time
+
+from app.core.ciclos import componentes_fuertes, enumerar_ciclos
+
+
+def completo(n):
+    """
+    Sucesores del grafo dirigido completo de n nodos (sin lazos).
+    """
+    return {a: [b for b in range(n) if b != a] for a in range(n)}
+
+
+def test_tarjan_separa_las_componentes_fuertes():
+    sucesores = {1: [2], 2: [3], 3: [1, 4], 4: [5], 5: [4], 6: [6], 7: []}
+
+    componentes = componentes_fuertes(list(sucesores), sucesores.__getitem__)
+
+    assert sorted(sorted(c) for c in componentes) == [[1, 2, 3], [4, 5], [6], [7]]
+    # Tarjan devuelve las componentes en orden topológico inverso
+    assert sorted(componentes[0]) == [4, 5]
+
+
+def test_johnson_enumera_todos_los_ciclos_elementales():
+    sucesores = completo(4)
+
+    ciclos, truncado = enumerar_ciclos(list(sucesores), sucesores.__getitem__)
+
+    # C(4,2)·1! + C(4,3)·2! + C(4,4)·3!
+    assert len(ciclos) == 6 + 8 + 6
+    assert not truncado
+    assert len({tuple(c) for c in ciclos}) == len(ciclos)
+    for ciclo in ciclos:
+        assert ciclo[0] == ciclo[-1]
+        assert len(set(ciclo[:-1])) == len(ciclo) - 1
+        assert all(b in sucesores[a] for a, b in zip(ciclo, ciclo[1:]))
+
+    assert sum(1 for c in ciclos if len(c) == 4) == 8
+
+
+def test_johnson_se_trunca_por_cantidad():
+    sucesores = completo(4)
+
+    ciclos, truncado = enumerar_ciclos(list(sucesores), sucesores.__getitem__, 5)
+
+    assert len(ciclos) == 5
+    assert truncado
+
+
+def test_johnson_se_trunca_por_tiempo():
+    sucesores = completo(6)
+
+    ciclos, truncado = enumerar_ciclos(
+        list(sucesores), sucesores.__getitem__, limite=time.perf_counter() - 1
+    )
+
+    assert truncado
+    assert len(ciclos) < 409
+
+
+def test_reporte_incluye_ciclos_que_se_cierran_por_corequisitos(crear_grafo):
+    # 2 requiere a 1, que es su corequisito; 3 y 4 se requieren entre sí
+    grafo = crear_grafo(
+        [1, 2, 3, 4, 5],
+        prerequisitos=[(2, 1), (3, 4), (4, 3), (5, 3)],
+        corequisitos=[(1, 2)],
+    )
+
+    reporte = grafo.get_reporte_ciclos()
+
+    assert sorted(sorted(c) for c in reporte["componentes"]) == [[1, 2], [3, 4]]
+    # El ciclo de 1 y 2 solo existe por el corequisito: se reporta el grupo
+    assert [1, 2, 1] in reporte["ciclos"]
+    assert sorted(sorted(set(c)) for c in reporte["ciclos"]) == [[1, 2], [3, 4]]
+    assert not reporte["truncado"]
+
+    de_ruta = grafo.get_reporte_ciclos_de_ruta([5])
+    assert [sorted(c) for c in de_ruta["componentes"]] == [[3, 4]]
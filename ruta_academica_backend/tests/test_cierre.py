@@ -0,0 +1,76 @@
+import random
+from collections import deque
+
+from app.core.cierre import CierreTransitivo
+
+# 1 -> 2 -> 3 -> 4 <- 1, un ciclo 5 -> 6 -> 7 -> 5 y 8, que requiere a 4 y a 7
+IDS = list(range(1, 9))
+PREREQUISITOS = [(2, 1), (3, 2), (4, 1), (4, 3), (6, 5), (7, 6), (5, 7), (8, 7), (8, 4)]
+
+
+def adyacencias(ids, aristas):
+    predecesores = {a: [] for a in ids}
+    sucesores = {a: [] for a in ids}
+    for asignatura_id, prerequisito_id in aristas:
+        predecesores[asignatura_id].append(prerequisito_id)
+        sucesores[prerequisito_id].append(asignatura_id)
+    return predecesores, sucesores
+
+
+def ancestros_bfs(predecesores, asignatura_id):
+    ancestros = set()
+    cola = deque([asignatura_id])
+    while cola:
+        for pre_id in predecesores[cola.popleft()]:
+            if pre_id not in ancestros:
+                ancestros.add(pre_id)
+                cola.append(pre_id)
+    return ancestros
+
+
+def test_ancestros_coinciden_con_bfs_incluidos_los_ciclos():
+    predecesores, sucesores = adyacencias(IDS, PREREQUISITOS)
+
+    cierre = CierreTransitivo(IDS, predecesores.__getitem__, sucesores.__getitem__)
+
+    for asignatura_id in IDS:
+        assert set(cierre.ids(cierre.ancestros[asignatura_id])) == ancestros_bfs(
+            predecesores, asignatura_id
+        )
+    assert cierre.en_orden == {1, 2, 3, 4}
+    assert set(cierre.ids(cierre.ancestros[5])) == {5, 6, 7}
+
+
+def test_ids_del_bitset_en_orden_topologico():
+    predecesores, sucesores = adyacencias(IDS, PREREQUISITOS)
+
+    cierre = CierreTransitivo(IDS, predecesores.__getitem__, sucesores.__getitem__)
+
+    assert cierre.ids(cierre.ancestros[4]) == [1, 2, 3]
+    assert cierre.ids(cierre.mascara([3, 1])) == [1, 3]
+
+
+def test_ancestros_de_grafo_aleatorio_con_ciclos():
+    rng = random.Random(7)
+    ids = list(range(1, 61))
+    aristas = {(rng.choice(ids), rng.choice(ids)) for _ in range(120)}
+    predecesores, sucesores = adyacencias(ids, aristas)
+
+    cierre = CierreTransitivo(ids, predecesores.__getitem__, sucesores.__getitem__)
+
+    assert cierre.num_ordenados < len(ids)
+    for asignatura_id in ids:
+        assert set(cierre.ids(cierre.ancestros[asignatura_id])) == ancestros_bfs(
+            predecesores, asignatura_id
+        )
+
+
+def test_grafo_consulta_el_cierre_por_grupos(crear_grafo):
+    grafo = crear_grafo(IDS, PREREQUISITOS)
+
+    assert grafo.get_ancestros(4) == [1, 2, 3]
+    assert grafo.es_prerequisito_de(1, 8)
+    assert not grafo.es_prerequisito_de(8, 1)
+    assert grafo.contar_prerequisitos(8) == 7
+    assert grafo.tiene_ciclo_en_ruta(8)
+    assert not grafo.tiene_ciclo_en_ruta(4)
@@ -0,0 +1,96 @@
+import random
+
+import numpy as np
+import pytest
+
+from app.core.config import settings
+from app.services.planificacion_service import PlanificacionService
+
+
+def grafo_aleatorio(crear_grafo, semilla=11, pares=20):
+    """
+    Pensum acíclico con pares (2k, 2k + 1) que a veces son corequisitos: cada
+    asignatura solo requiere asignaturas de pares anteriores.
+    """
+    rng = random.Random(semilla)
+    ids = list(range(2, 2 * pares + 2))
+    prerequisitos = {
+        (a, rng.randrange(2, a - a % 2))
+        for a in ids[2:]
+        for _ in range(rng.randrange(3))
+    }
+    corequisitos = [(2 * k + 1, 2 * k) for k in range(1, pares + 1) if rng.random() < 0.4]
+    creditos = {a: rng.randrange(1, 5) for a in ids}
+    req_creditos = {a: rng.choice([0, 0, 0, 10, 20]) for a in ids}
+    return (
+        crear_grafo(ids, prerequisitos, corequisitos, creditos, req_creditos),
+        ids,
+        rng,
+    )
+
+
+def test_matrices_coinciden_con_el_indice_por_estudiante(crear_grafo):
+    grafo, ids, rng = grafo_aleatorio(crear_grafo)
+    indice = grafo.elegibilidad
+    matrices = grafo.matrices_elegibilidad
+
+    estudiantes = [rng.sample(ids, rng.randrange(len(ids))) for _ in range(50)]
+    creditos = np.array([rng.randrange(30) for _ in estudiantes])
+
+    sin_creditos, restantes = matrices.elegibles(matrices.matriz_aprobadas(estudiantes))
+    con_creditos, _ = matrices.elegibles(
+        matrices.matriz_aprobadas(estudiantes), creditos
+    )
+
+    for fila, aprobadas in enumerate(estudiantes):
+        mascara, _ = indice.resolver(aprobadas)
+        for elegibles, acumulados in (
+            (sin_creditos, None),
+            (con_creditos, int(creditos[fila])),
+        ):
+            esperadas = indice.ids(indice.elegibles(mascara, acumulados))
+            obtenidas = [matrices.orden[c] for c in np.flatnonzero(elegibles[fila])]
+            assert sorted(obtenidas) == sorted(esperadas)
+        assert restantes[fila] == matrices.creditos_totales - indice.creditos_de(mascara)
+
+
+def test_servicio_respeta_el_orden_de_las_columnas(crear_grafo):
+    # 3 es corequisito de 2, 4 requiere a 2
+    grafo = crear_grafo([2, 3, 4], [(4, 2)], [(3, 2)])
+
+    elegibles, restantes = PlanificacionService.elegibles_cohorte(
+        grafo, [[False, False, False], [False, True, True]], [4, 3, 2]
+    )
+
+    assert elegibles.tolist() == [[False, True, True], [True, False, False]]
+    assert restantes.tolist() == [9, 3]
+
+
+def test_servicio_acepta_una_cohorte_vacia(crear_grafo):
+    grafo = crear_grafo([2, 3], [(3, 2)])
+
+    elegibles, restantes = PlanificacionService.elegibles_cohorte(grafo, [], [3, 2])
+
+    assert elegibles.shape == (0, 2)
+    assert restantes.tolist() == []
+
+
+@pytest.mark.parametrize(
+    "cohorte, detalle",
+    [
+        ({"columnas": [], "aprobadas": [[]]}, "al menos una columna"),
+        ({"columnas": [1, 2, 1], "aprobadas": [[True, False, True]]}, "[1] están repetidas"),
+        ({"columnas": [1, 2], "aprobadas": [[True], [True, False]]}, "una entrada por columna"),
+        (
+            {"columnas": [1], "aprobadas": [[True], [False]], "creditos_acumulados": [3]},
+            "de cada estudiante",
+        ),
+    ],
+)
+def test_forma_invalida_de_la_cohorte_es_un_400(cliente, cohorte, detalle):
+    respuesta = cliente.post(
+        f"{settings.API_PREFIX}/planificacion/1/elegibles/cohorte", json=cohorte
+    )
+
+    assert respuesta.status_code == 400
+    assert detalle in respuesta.json()["detail"]
@@ -0,0 +1,47 @@
+from app.core.condensacion import CondensacionCorequisitos
+
+# 4 - 3 - 2 es una cadena de corequisitos y 6 - 7 un par; 2 y 4 requieren a 1,
+# 5 requiere a 3 y 7 requiere a su corequisito 6
+IDS = [1, 4, 3, 2, 5, 6, 7]
+PREREQUISITOS = [(2, 1), (4, 1), (5, 3), (7, 6)]
+COREQUISITOS = [(3, 2), (4, 3), (7, 6)]
+
+
+def condensar(ids, prerequisitos, corequisitos):
+    predecesores = {a: [] for a in ids}
+    sucesores = {a: [] for a in ids}
+    vecinos = {a: [] for a in ids}
+    for asignatura_id, prerequisito_id in prerequisitos:
+        predecesores[asignatura_id].append(prerequisito_id)
+        sucesores[prerequisito_id].append(asignatura_id)
+    for asignatura_id, corequisito_id in corequisitos:
+        vecinos[asignatura_id].append(corequisito_id)
+        vecinos[corequisito_id].append(asignatura_id)
+    return CondensacionCorequisitos(
+        ids, predecesores.__getitem__, sucesores.__getitem__, vecinos.__getitem__
+    )
+
+
+def test_grupos_transitivos_con_el_primer_insertado_como_representante():
+    condensacion = condensar(IDS, PREREQUISITOS, COREQUISITOS)
+
+    assert condensacion.representantes == [1, 4, 5, 6]
+    assert condensacion.miembros == {1: [1], 4: [4, 3, 2], 5: [5], 6: [6, 7]}
+    assert {a: condensacion.representante[a] for a in (2, 3, 7)} == {2: 4, 3: 4, 7: 6}
+
+
+def test_adyacencias_condensadas_sin_repetidos():
+    condensacion = condensar(IDS, PREREQUISITOS, COREQUISITOS)
+
+    assert condensacion.predecesores(4) == [1]
+    assert condensacion.sucesores(1) == [4]
+    assert condensacion.sucesores(4) == [5]
+    assert condensacion.predecesores(5) == [4]
+    assert condensacion.expandir([5, 4, 1]) == [5, 4, 3, 2, 1]
+
+
+def test_prerrequisito_dentro_del_grupo_deja_un_lazo():
+    condensacion = condensar(IDS, PREREQUISITOS, COREQUISITOS)
+
+    assert condensacion.predecesores(6) == [6]
+    assert condensacion.sucesores(6) == [6]
@@ -0,0 +1,26 @@
+from app.core.planificador import profundidades
+
+# Cadena 1 -> 2 -> 3, 4 suelta, 5 requiere a 1 y 6 es corequisito de 2
+IDS = [1, 2, 3, 4, 5, 6]
+PREREQUISITOS = [(2, 1), (3, 2), (5, 1)]
+COREQUISITOS = [(6, 2)]
+
+
+def test_holguras_y_cadena_critica(crear_grafo):
+    cpm = crear_grafo(IDS, PREREQUISITOS, COREQUISITOS).cpm
+
+    assert cpm.duracion == 3
+    assert cpm.inicio_temprano == {1: 1, 2: 2, 3: 3, 4: 1, 5: 2, 6: 2}
+    assert cpm.inicio_tardio == {1: 1, 2: 2, 3: 3, 4: 3, 5: 3, 6: 2}
+    assert cpm.holgura == {1: 0, 2: 0, 3: 0, 4: 2, 5: 1, 6: 0}
+    assert cpm.cadena_critica == [1, 2, 3]
+
+
+def test_profundidades_de_un_subconjunto(crear_grafo):
+    indice = crear_grafo(IDS, PREREQUISITOS, COREQUISITOS).elegibilidad
+    subconjunto, _ = indice.resolver([2, 3, 6])
+
+    profundidad = profundidades(indice, subconjunto)
+
+    # Sin 1 en el conjunto, el grupo {2, 6} no tiene prerrequisitos
+    assert {indice.orden[b]: p for b, p in profundidad.items()} == {2: 1, 3: 2, 6: 1}
@@ -0,0 +1,46 @@
+from app.services.planificacion_service import PlanificacionService
+
+# 2 requiere a 1 y es corequisito de 3; 4 requiere a 1 y 6 créditos; 6
+# requiere a 4 y es corequisito de 5
+IDS = [1, 2, 3, 4, 5, 6]
+PREREQUISITOS = [(2, 1), (4, 1), (6, 4)]
+COREQUISITOS = [(3, 2), (5, 6)]
+
+
+def elegibles(indice, aprobadas, creditos=None):
+    mascara, _ = indice.resolver(aprobadas)
+    return set(indice.ids(indice.elegibles(mascara, creditos)))
+
+
+def test_grupo_de_corequisitos_se_inscribe_completo(crear_grafo):
+    grafo = crear_grafo(IDS, PREREQUISITOS, COREQUISITOS, req_creditos={4: 6})
+    indice = grafo.elegibilidad
+
+    # 3 no tiene prerrequisitos, pero su corequisito 2 aún no es elegible
+    assert elegibles(indice, []) == {1}
+    assert elegibles(indice, [1]) == {2, 3}
+    assert elegibles(indice, [1], creditos=6) == {2, 3, 4}
+    assert elegibles(indice, [1, 4]) == {2, 3, 5, 6}
+    # Con el grupo aprobado en parte, el miembro pendiente se inscribe solo
+    assert elegibles(indice, [1, 2]) == {3, 4}
+
+
+def test_resolver_ids_y_codigos(crear_grafo):
+    grafo = crear_grafo(IDS, PREREQUISITOS, COREQUISITOS)
+    indice = grafo.elegibilidad
+
+    mascara, no_encontradas = indice.resolver([1, 99], ["a4", "X1"])
+
+    assert indice.ids(mascara) == [1, 4]
+    assert no_encontradas == [99, "X1"]
+    assert indice.creditos_de(mascara) == 6
+
+
+def test_servicio_informa_los_corequisitos_pendientes(crear_grafo):
+    grafo = crear_grafo(IDS, PREREQUISITOS, COREQUISITOS)
+
+    resultado = PlanificacionService.get_elegibles(grafo, [1], [])
+
+    corequisitos = {a["id"]: a["corequisitos"] for a in resultado["elegibles"]}
+    assert corequisitos == {2: [3], 3: [2], 4: []}
+    assert resultado["creditos_acumulados"] == 3
@@ -0,0 +1,114 @@
+from datetime import date
+
+import pytest
+from sqlalchemy.orm import Session
+
+from app.api.routes.prerrequisitos import _construir_estructura_dependencias
+from app.core.config import settings
+from app.models.asignatura import Asignatura, AsignaturaTrimestre
+from app.models.carrera import Carrera
+from app.models.pensum import Pensum
+from app.models.trimestre import Trimestre
+
+
+@pytest.fixture
+def pensums(engine):
+    """
+    Dos pensums: en el primero (creado antes) A está en el trimestre 1, C en
+    el 2 y D en el 3; en el segundo A está en el trimestre 4, B en el 5 y D
+    en el 6. D requiere a A, B y C. Devuelve los IDs de los pensums y de las
+    asignaturas.
+    """
+    with Session(engine) as sesion:
+        carrera = Carrera(nombre="CARRERA DE PRUEBA")
+        sesion.add(carrera)
+        sesion.flush()
+        viejo, nuevo = [
+            Pensum(codigo=codigo, fecha_aprobacion=date(2024, 1, 1), carrera_id=carrera.id)
+            for codigo in ("VIEJO", "NUEVO")
+        ]
+        sesion.add_all([viejo, nuevo])
+        sesion.flush()
+        a, b, c, d = asignaturas = [
+            Asignatura(codigo=codigo, nombre=codigo, creditos=3) for codigo in "ABCD"
+        ]
+        sesion.add_all(asignaturas)
+        sesion.flush()
+        d.prerequisitos.extend([a, b, c])
+
+        for pensum, ubicacion in (
+            (viejo, {1: a, 2: c, 3: d}),
+            (nuevo, {4: a, 5: b, 6: d}),
+        ):
+            for numero, asignatura in ubicacion.items():
+                trimestre = Trimestre(numero=numero, pensum_id=pensum.id)
+                sesion.add(trimestre)
+                sesion.flush()
+                sesion.add(
+                    AsignaturaTrimestre(
+                        asignatura_id=asignatura.id, trimestre_id=trimestre.id
+                    )
+                )
+        sesion.commit()
+
+        return viejo.id, nuevo.id, {a.codigo: a.id for a in asignaturas}
+
+
+def trimestres_de_la_estructura(cliente, asignatura_id, pensum_id):
+    respuesta = cliente.get(
+        f"{settings.API_PREFIX}/prerrequisitos/ruta/{asignatura_id}",
+        params={} if pensum_id is None else {"pensum_id": pensum_id},
+    )
+    assert respuesta.status_code == 200
+    return {
+        datos["codigo"]: (datos["trimestre"], datos["pensum_id"])
+        for datos in respuesta.json()["estructura_dependencias"].values()
+    }
+
+
+def test_trimestre_del_pensum_consultado(cliente, pensums):
+    viejo, nuevo, ids = pensums
+
+    assert trimestres_de_la_estructura(cliente, ids["D"], nuevo) == {
+        "A": (4, nuevo),
+        "B": (5, nuevo),
+    }
+    assert trimestres_de_la_estructura(cliente, ids["D"], viejo) == {
+        "A": (1, viejo),
+        "C": (2, viejo),
+    }
+    # Sin pensum, el primer trimestre registrado
+    assert trimestres_de_la_estructura(cliente, ids["D"], None) == {
+        "A": (1, viejo),
+        "B": (5, nuevo),
+        "C": (2, viejo),
+    }
+
+
+def test_asignatura_fuera_del_pensum_usa_otro(engine, pensums):
+    viejo, nuevo, ids = pensums
+    prerrequisitos = [
+        {"id": ids[codigo], "codigo": codigo, "nombre": codigo} for codigo in "AC"
+    ]
+
+    with Session(engine) as sesion:
+        estructura = _construir_estructura_dependencias(sesion, prerrequisitos, nuevo)
+
+    assert estructura[ids["A"]]["trimestre"] == 4
+    assert (estructura[ids["C"]]["trimestre"], estructura[ids["C"]]["pensum_id"]) == (
+        2,
+        viejo,
+    )
+
+
+def test_rutas_multiples_usan_el_pensum_consultado(cliente, pensums):
+    viejo, nuevo, ids = pensums
+
+    respuesta = cliente.post(
+        f"{settings.API_PREFIX}/prerrequisitos/rutas",
+        json={"asignatura_ids": [ids["D"]], "pensum_id": nuevo},
+    )
+
+    assert respuesta.status_code == 200
+    estructura = respuesta.json()["resultados"][0]["estructura_dependencias"]
+    assert estructura[str(ids["A"])]["trimestre"] == 4
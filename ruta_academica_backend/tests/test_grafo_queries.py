@@ -0,0 +1,106 @@
+from datetime import date
+
+import pytest
+from sqlalchemy import create_engine, event
+from sqlalchemy.orm import Session
+from sqlalchemy.pool import StaticPool
+
+from app.db.base import Base
+from app.models.asignatura import Asignatura, AsignaturaTrimestre
+from app.models.carrera import Carrera
+from app.models.pensum import Pensum
+from app.models.trimestre import Trimestre
+from app.services.grafo_service import GrafoService
+
+
+@pytest.fixture
+def db():
+    """
+    Base SQLite en memoria con un pensum de cuatro asignaturas en dos
+    trimestres y una asignatura fuera del pensum.
+    """
+    engine = create_engine(
+        "sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool
+    )
+    Base.metadata.create_all(bind=engine)
+
+    with Session(engine) as sesion:
+        carrera = Carrera(nombre="CARRERA DE PRUEBA")
+        sesion.add(carrera)
+        sesion.flush()
+        pensum = Pensum(
+            codigo="PRUEBA", fecha_aprobacion=date(2024, 1, 1), carrera_id=carrera.id
+        )
+        sesion.add(pensum)
+        sesion.flush()
+        trimestres = [Trimestre(numero=numero, pensum_id=pensum.id) for numero in (1, 2)]
+        sesion.add_all(trimestres)
+
+        asignaturas = [
+            Asignatura(codigo=f"MAT10{i}", nombre=f"MATEMATICA {i}", creditos=4)
+            for i in range(5)
+        ]
+        sesion.add_all(asignaturas)
+        sesion.flush()
+
+        mat0, mat1, mat2, mat3, externa = asignaturas
+        mat2.prerequisitos.append(mat0)
+        mat3.prerequisitos.extend([mat1, mat2])
+        mat3.prerequisitos.append(externa)
+        mat2.corequisitos.append(mat1)
+        for asignatura, trimestre in (
+            (mat0, trimestres[0]),
+            (mat1, trimestres[0]),
+            (mat2, trimestres[1]),
+            (mat3, trimestres[1]),
+        ):
+            sesion.add(
+                AsignaturaTrimestre(
+                    asignatura_id=asignatura.id, trimestre_id=trimestre.id
+                )
+            )
+        sesion.commit()
+
+        yield sesion, pensum.id
+
+    engine.dispose()
+
+
+def contar_consultas(sesion, funcion):
+    consultas = []
+
+    def contar(conn, cursor, statement, parameters, context, executemany):
+        consultas.append(statement)
+
+    engine = sesion.get_bind()
+    event.listen(engine, "before_cursor_execute", contar)
+    try:
+        resultado = funcion()
+    finally:
+        event.remove(engine, "before_cursor_execute", contar)
+    return resultado, len(consultas)
+
+
+@pytest.mark.parametrize("backend", ["networkx", "csr"])
+def test_grafo_del_pensum_usa_tres_consultas(db, backend):
+    sesion, pensum_id = db
+
+    grafo, consultas = contar_consultas(
+        sesion,
+        lambda: GrafoService.build_asignaturas_graph(sesion, pensum_id, backend),
+    )
+
+    assert consultas == 3
+    assert len(grafo) == 4
+
+
+@pytest.mark.parametrize("backend", ["networkx", "csr"])
+def test_grafo_del_catalogo_usa_tres_consultas(db, backend):
+    sesion, _ = db
+
+    grafo, consultas = contar_consultas(
+        sesion, lambda: GrafoService.build_asignaturas_graph(sesion, None, backend)
+    )
+
+    assert consultas == 3
+    assert len(grafo) == 5
@@ -0,0 +1,40 @@
+from app.services.planificacion_service import PlanificacionService
+
+# Cadena 1 -> 2 -> 3, 4 corequisito de 2 y requerida por 5; 6 <-> 7 forman un
+# ciclo de prerrequisitos y 8 requiere a 7
+IDS = list(range(1, 9))
+PREREQUISITOS = [(2, 1), (3, 2), (5, 4), (6, 7), (7, 6), (8, 7)]
+COREQUISITOS = [(4, 2)]
+
+
+def test_bloqueadas_incluyen_grupos_y_ciclos(crear_grafo):
+    grafo = crear_grafo(IDS, PREREQUISITOS, COREQUISITOS)
+    indice = grafo.elegibilidad
+    impacto = grafo.impacto
+
+    bloqueadas = {
+        a: sorted(indice.ids(impacto.bloqueadas[indice.bits[a]])) for a in IDS
+    }
+
+    assert bloqueadas == {
+        1: [2, 3, 4, 5],
+        2: [3, 4, 5],
+        3: [],
+        4: [2, 3, 5],
+        5: [],
+        6: [7, 8],
+        7: [6, 8],
+        8: [],
+    }
+    assert impacto.total_bloqueadas[indice.bits[1]] == 4
+    assert impacto.creditos_bloqueados[indice.bits[2]] == 9
+
+
+def test_ranking_por_bloqueadas(crear_grafo):
+    grafo = crear_grafo(IDS, PREREQUISITOS, COREQUISITOS, creditos={5: 6})
+
+    ranking = PlanificacionService.get_ranking_impacto(grafo, limite=3)
+
+    # 2 y 4 bloquean las mismas asignaturas y créditos: desempata el orden topológico
+    assert [(a["id"], a["total_bloqueadas"]) for a in ranking] == [(1, 4), (2, 3), (4, 3)]
+    assert [a["posicion"] for a in ranking] == [1, 2, 3]
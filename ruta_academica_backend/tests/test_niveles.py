@@ -0,0 +1,24 @@
+# 1 -> 2 -> 4, 3 corequisito de 2 y requerido por 5; 7 requiere a su
+# corequisito 6 (un lazo en el grupo)
+IDS = [1, 2, 3, 4, 5, 6, 7]
+PREREQUISITOS = [(2, 1), (4, 2), (5, 3), (7, 6)]
+COREQUISITOS = [(3, 2), (7, 6)]
+
+
+def test_niveles_con_grupos_de_corequisitos(crear_grafo):
+    grafo = crear_grafo(IDS, PREREQUISITOS, COREQUISITOS)
+
+    niveles, pendientes = grafo.get_niveles_kahn()
+
+    assert niveles == [[1], [2, 3], [4, 5]]
+    assert pendientes == [6, 7]
+
+
+def test_subconjunto_solo_usa_sus_propias_aristas(crear_grafo):
+    grafo = crear_grafo(IDS, PREREQUISITOS, COREQUISITOS)
+
+    # Sin 3 en el subconjunto, 2 no es prerrequisito de 5 aunque sean del
+    # mismo grupo; sin 6, el lazo del grupo desaparece
+    assert grafo.get_niveles_kahn([2, 5, 7]) == ([[2, 5, 7]], [])
+    assert grafo.get_niveles_kahn([1, 3, 5]) == ([[1, 3], [5]], [])
+    assert grafo.get_niveles_kahn([2, 4, 99]) == ([[2], [4]], [])
@@ -0,0 +1,159 @@
+import random
+
+import pytest
+from sqlalchemy.orm import Session
+
+from app.core.orden_topologico import OrdenTopologicoDinamico
+from app.models.asignatura import Asignatura
+from app.services.grafo_service import GrafoService
+
+
+@pytest.fixture
+def db(engine):
+    """
+    Base SQLite en memoria con A y B corequisitos, X que requiere a B e Y
+    sin relaciones.
+    """
+    with Session(engine) as sesion:
+        a, b, x, y = asignaturas = [
+            Asignatura(codigo=codigo, nombre=codigo, creditos=3)
+            for codigo in ("A", "B", "X", "Y")
+        ]
+        sesion.add_all(asignaturas)
+        sesion.flush()
+        a.corequisitos.append(b)
+        x.prerequisitos.append(b)
+        sesion.commit()
+
+        yield sesion, {asignatura.codigo: asignatura for asignatura in asignaturas}
+
+
+def test_rechaza_ciclo_que_se_cierra_por_un_corequisito(db):
+    sesion, asig = db
+
+    ciclo = GrafoService.agregar_prerequisito(sesion, asig["A"], asig["X"])
+
+    assert ciclo == [asig["A"].id, asig["X"].id, asig["A"].id]
+    assert asig["A"].prerequisitos == []
+    grafo = GrafoService.build_asignaturas_graph(sesion)
+    assert not grafo.has_cycle()
+    assert not grafo.tiene_ciclo_en_ruta(asig["X"].id)
+
+
+def test_rechaza_prerrequisito_entre_miembros_del_mismo_grupo(db):
+    sesion, asig = db
+
+    ciclo = GrafoService.agregar_prerequisito(sesion, asig["B"], asig["A"])
+
+    assert ciclo == [asig["B"].id, asig["A"].id, asig["B"].id]
+    assert asig["B"].prerequisitos == []
+
+
+def test_orden_actualizado_en_linea_sigue_los_grupos(db):
+    sesion, asig = db
+
+    # Y -> A une a Y con el grupo {A, B} y, a través de él, con X
+    assert GrafoService.agregar_prerequisito(sesion, asig["A"], asig["Y"]) is None
+    assert GrafoService.agregar_prerequisito(sesion, asig["Y"], asig["X"]) == [
+        asig["Y"].id,
+        asig["A"].id,
+        asig["X"].id,
+        asig["Y"].id,
+    ]
+
+    # Sin Y -> A, X -> Y ya no cierra ningún ciclo
+    assert GrafoService.eliminar_prerequisito(sesion, asig["A"], asig["Y"])
+    assert GrafoService.agregar_prerequisito(sesion, asig["Y"], asig["X"]) is None
+    assert not GrafoService.build_asignaturas_graph(sesion).has_cycle()
+
+
+def test_grupo_conserva_la_arista_mientras_otro_miembro_la_tenga(db):
+    sesion, asig = db
+
+    assert GrafoService.agregar_prerequisito(sesion, asig["A"], asig["Y"]) is None
+    assert GrafoService.agregar_prerequisito(sesion, asig["B"], asig["Y"]) is None
+    assert GrafoService.eliminar_prerequisito(sesion, asig["A"], asig["Y"])
+
+    assert GrafoService.agregar_prerequisito(sesion, asig["Y"], asig["X"]) is not None
+    assert asig["Y"].prerequisitos == []
+
+
+def respeta_el_orden(orden, aristas):
+    return all(
+        orden.posicion[prerequisito_id] < orden.posicion[asignatura_id]
+        for asignatura_id, prerequisito_id in aristas
+    )
+
+
+def alcanza(aristas, origen, destino):
+    """
+    Indica si hay un camino de prerrequisito a dependiente de origen a destino.
+    """
+    sucesores = {}
+    for asignatura_id, prerequisito_id in aristas:
+        sucesores.setdefault(prerequisito_id, set()).add(asignatura_id)
+    visitados, pila = {origen}, [origen]
+    while pila:
+        for sucesor in sucesores.get(pila.pop(), ()):
+            if sucesor not in visitados:
+                visitados.add(sucesor)
+                pila.append(sucesor)
+    return destino in visitados
+
+
+def test_agregar_reordena_la_ventana_o_devuelve_el_ciclo():
+    # 1 -> 2 -> 3 y 4 suelta
+    orden = OrdenTopologicoDinamico([1, 2, 3, 4], [(2, 1), (3, 2)])
+    assert orden.valido
+
+    # 4 queda después de 3: hay que mover 4 antes de 1
+    assert orden.agregar_prerequisito(1, 4) is None
+    assert respeta_el_orden(orden, [(2, 1), (3, 2), (1, 4)])
+
+    assert orden.agregar_prerequisito(4, 3) == [4, 1, 2, 3, 4]
+    assert orden.agregar_prerequisito(2, 2) == [2, 2]
+    assert orden.buscar_ciclo(4, 3) == [4, 1, 2, 3, 4]
+    assert respeta_el_orden(orden, [(2, 1), (3, 2), (1, 4)])
+
+
+def test_secuencia_aleatoria_coincide_con_la_busqueda_completa():
+    rng = random.Random(3)
+    ids = list(range(1, 31))
+    orden = OrdenTopologicoDinamico(ids, [])
+    aristas = []
+
+    for _ in range(300):
+        asignatura_id, prerequisito_id = rng.sample(ids, 2)
+        ciclo = orden.agregar_prerequisito(asignatura_id, prerequisito_id)
+        if alcanza(aristas, asignatura_id, prerequisito_id):
+            assert ciclo[0] == ciclo[-1] == asignatura_id
+            assert ciclo[-2] == prerequisito_id
+        else:
+            assert ciclo is None
+            aristas.append((asignatura_id, prerequisito_id))
+        assert respeta_el_orden(orden, aristas)
+
+    for asignatura_id, prerequisito_id in rng.sample(aristas, len(aristas) // 2):
+        orden.eliminar_prerequisito(asignatura_id, prerequisito_id)
+        aristas.remove((asignatura_id, prerequisito_id))
+    assert respeta_el_orden(orden, aristas)
+
+
+def test_datos_iniciales_con_ciclo_dejan_el_orden_invalido():
+    orden = OrdenTopologicoDinamico([1, 2, 3, 4], [(2, 1), (1, 2), (4, 3)])
+
+    assert not orden.valido
+    # Sin orden, la validación recorre el grafo completo
+    assert orden.agregar_prerequisito(3, 4) == [3, 4, 3]
+    assert orden.agregar_prerequisito(3, 1) is None
+    assert orden.agregar_prerequisito(1, 4) == [1, 3, 4, 1]
+
+
+def test_arista_repetida_se_elimina_con_la_ultima_ocurrencia():
+    orden = OrdenTopologicoDinamico([1, 2], [(2, 1), (2, 1)])
+
+    orden.eliminar_prerequisito(2, 1)
+    assert orden.buscar_ciclo(1, 2) == [1, 2, 1]
+
+    orden.eliminar_prerequisito(2, 1)
+    assert orden.agregar_prerequisito(1, 2) is None
@@ -0,0 +1,66 @@
+from app.core.cierre import posiciones_bits
+from app.core.planificador import alturas, planificar, requeridas_para
+
+# Cadena 1 -> 2 -> 6 con 3 corequisito de 2, 4 y 5 sueltas y 9, que requiere
+# el grupo 7 <-> 8 de 8 créditos
+IDS = list(range(1, 10))
+PREREQUISITOS = [(2, 1), (6, 2), (9, 7)]
+COREQUISITOS = [(3, 2), (8, 7)]
+CREDITOS = {7: 4, 8: 4}
+
+
+def comprobar_plan(indice, plan, max_creditos, aprobadas=0):
+    vistas = aprobadas
+    for trimestre in plan["trimestres"]:
+        assert indice.creditos_de(trimestre) <= max_creditos
+        for bit in posiciones_bits(trimestre):
+            # Prerrequisitos en trimestres anteriores y grupo completo
+            assert not indice.directos[bit] & ~vistas
+            assert indice.grupos[bit] & ~trimestre == 0
+        vistas |= trimestre
+    return vistas
+
+
+def test_plan_respeta_tope_prerrequisitos_y_corequisitos(crear_grafo):
+    grafo = crear_grafo(IDS, PREREQUISITOS, COREQUISITOS, creditos=CREDITOS)
+    indice = grafo.elegibilidad
+
+    plan = planificar(indice, 0, 6)
+
+    vistas = comprobar_plan(indice, plan, 6)
+    # El grupo 7 <-> 8 no cabe en el tope y bloquea a 9
+    assert indice.ids(plan["no_planificadas"]) == indice.ids(indice.resolver([7, 8, 9])[0])
+    assert sorted(indice.ids(vistas)) == [1, 2, 3, 4, 5, 6]
+    # La cadena crítica 1 -> {2, 3} -> 6 va primero
+    assert len(plan["trimestres"]) == 3
+    assert plan["camino_critico"] == 3
+
+
+def test_plan_con_tope_suficiente_y_objetivo(crear_grafo):
+    grafo = crear_grafo(IDS, PREREQUISITOS, COREQUISITOS, creditos=CREDITOS)
+    indice = grafo.elegibilidad
+    aprobadas, _ = indice.resolver([1])
+    objetivo, _ = indice.resolver([6])
+
+    assert sorted(indice.ids(requeridas_para(indice, objetivo))) == [1, 2, 3, 6]
+
+    plan = planificar(indice, aprobadas, 6, objetivo)
+
+    comprobar_plan(indice, plan, 6, aprobadas)
+    assert [sorted(indice.ids(t)) for t in plan["trimestres"]] == [[2, 3], [6]]
+    assert plan["no_planificadas"] == 0
+
+    plan = planificar(indice, 0, 12)
+    comprobar_plan(indice, plan, 12)
+    assert plan["no_planificadas"] == 0
+
+
+def test_alturas_compartidas_por_el_grupo(crear_grafo):
+    grafo = crear_grafo(IDS, PREREQUISITOS, COREQUISITOS)
+    indice = grafo.elegibilidad
+
+    altura = alturas(indice, (1 << len(IDS)) - 1)
+
+    assert {a: altura[indice.bits[a]] for a in IDS} == {
+        1: 3, 2: 2, 3: 2, 4: 1, 5: 1, 6: 1, 7: 2, 8: 2, 9: 1,
+    }
@@ -0,0 +1,130 @@
+from datetime import date
+
+import pytest
+from sqlalchemy import delete
+from sqlalchemy.orm import Session
+
+from app.models.asignatura import Asignatura, AsignaturaTrimestre, prerequisito
+from app.models.carrera import Carrera
+from app.models.pensum import Pensum
+from app.models.trimestre import Trimestre
+from app.services.version_service import VersionService
+
+
+@pytest.fixture
+def pensum(engine):
+    """
+    Pensum con A y B que se requieren entre sí (un ciclo) y C que requiere
+    a A. Devuelve el ID del pensum y los IDs de A, B y C.
+    """
+    with Session(engine) as sesion:
+        carrera = Carrera(nombre="CARRERA DE PRUEBA")
+        sesion.add(carrera)
+        sesion.flush()
+        pensum = Pensum(
+            codigo="PRUEBA", fecha_aprobacion=date(2024, 1, 1), carrera_id=carrera.id
+        )
+        sesion.add(pensum)
+        sesion.flush()
+        trimestre = Trimestre(numero=1, pensum_id=pensum.id)
+        a, b, c = asignaturas = [
+            Asignatura(codigo=codigo, nombre=codigo, creditos=3) for codigo in "ABC"
+        ]
+        sesion.add_all([trimestre, *asignaturas])
+        sesion.flush()
+        a.prerequisitos.append(b)
+        b.prerequisitos.append(a)
+        c.prerequisitos.append(a)
+        for asignatura in asignaturas:
+            sesion.add(
+                AsignaturaTrimestre(
+                    asignatura_id=asignatura.id, trimestre_id=trimestre.id
+                )
+            )
+        sesion.commit()
+
+        return pensum.id, a.id, b.id, c.id
+
+
+def romper_ciclo_desde_otro_proceso(engine, pensum_id, b_id, a_id):
+    """
+    Elimina el prerrequisito A de B e incrementa la versión desde otra
+    conexión, sin pasar por la sesión que invalida las cachés del proceso.
+    """
+    with engine.begin() as conexion:
+        conexion.execute(
+            delete(prerequisito).where(
+                (prerequisito.c.asignatura_id == b_id)
+                & (prerequisito.c.prerequisito_id == a_id)
+            )
+        )
+        VersionService.incrementar(conexion, [pensum_id])
+
+
+def test_ciclos_corresponden_al_etag_tras_escritura_externa(engine, cliente, pensum):
+    pensum_id, a_id, b_id, _ = pensum
+
+    antes = cliente.get(f"/api/v1/prerrequisitos/ciclos/{pensum_id}")
+    assert antes.json()["tiene_ciclos"]
+
+    romper_ciclo_desde_otro_proceso(engine, pensum_id, b_id, a_id)
+
+    despues = cliente.get(
+        f"/api/v1/prerrequisitos/ciclos/{pensum_id}",
+        headers={"If-None-Match": antes.headers["ETag"]},
+    )
+    assert despues.status_code == 200
+    assert despues.headers["ETag"] != antes.headers["ETag"]
+    assert not despues.json()["tiene_ciclos"]
+
+
+def test_malla_corresponde_al_etag_tras_escritura_externa(engine, cliente, pensum):
+    pensum_id, a_id, b_id, _ = pensum
+
+    def prerequisitos_de_b(respuesta):
+        asignaturas = respuesta.json()["trimestres"][0]["asignaturas"]
+        return next(a for a in asignaturas if a["id"] == b_id)["prerequisitos_ids"]
+
+    antes = cliente.get(f"/api/v1/pensums/{pensum_id}/malla")
+    assert prerequisitos_de_b(antes) == [a_id]
+
+    romper_ciclo_desde_otro_proceso(engine, pensum_id, b_id, a_id)
+
+    despues = cliente.get(f"/api/v1/pensums/{pensum_id}/malla")
+    assert despues.headers["ETag"] != antes.headers["ETag"]
+    assert prerequisitos_de_b(despues) == []
+
+
+def test_respuesta_serializada_cambia_con_la_version(engine, cliente, pensum):
+    pensum_id, a_id, b_id, c_id = pensum
+    url = f"/api/v1/prerrequisitos/ruta/{c_id}?pensum_id={pensum_id}"
+
+    antes = cliente.get(url)
+    assert antes.json()["error"] == "Se detectaron ciclos en los prerrequisitos"
+    assert cliente.get(url).content == antes.content
+
+    romper_ciclo_desde_otro_proceso(engine, pensum_id, b_id, a_id)
+
+    despues = cliente.get(url)
+    assert despues.headers["ETag"] != antes.headers["ETag"]
+    assert "error" not in despues.json()
+    assert [pre["id"] for pre in despues.json()["todos_prerrequisitos"]] == [
+        b_id,
+        a_id,
+    ]
+    assert cliente.get(url).content == despues.content
+
+
+def test_niveles_serializados_cambian_con_la_version(engine, cliente, pensum):
+    pensum_id, a_id, b_id, c_id = pensum
+    url = f"/api/v1/prerrequisitos/asignaturas-por-nivel/{pensum_id}"
+
+    antes = cliente.get(url)
+    assert antes.json()["asignaturas_no_asignadas"] == 3
+
+    romper_ciclo_desde_otro_proceso(engine, pensum_id, b_id, a_id)
+
+    despues = cliente.get(url)
+    assert despues.headers["ETag"] != antes.headers["ETag"]
+    assert despues.json()["asignaturas_no_asignadas"] == 0
+    assert despues.json()["total_niveles"] == 3